@@ -0,0 +1,96 @@
+"""
+Benchmark of BPMN XML import (time and peak memory versus size of the diagram section).
+
+Usage:
+    python benchmarks/bench_bpmn_import.py --shapes 10000 100000 300000
+
+Compares BpmnJsonGenerator.create_bpmn_json, which parses the whole document, with
+create_bpmn_json_from_file, which parses the process incrementally and stops before
+the diagram interchange section.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from bpmn_assistant.services import BpmnJsonGenerator
+
+_PROCESS = """<?xml version="1.0" encoding="UTF-8"?>
+<definitions xmlns="http://www.omg.org/spec/BPMN/20100524/MODEL"
+    xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI"
+    xmlns:dc="http://www.omg.org/spec/DD/20100524/DC">
+  <process id="Process_1">
+    <startEvent id="start" />
+    <sequenceFlow id="flow1" sourceRef="start" targetRef="task1" />
+    <task id="task1" name="Review order" />
+    <sequenceFlow id="flow2" sourceRef="task1" targetRef="end" />
+    <endEvent id="end" />
+  </process>
+  <bpmndi:BPMNDiagram id="diagram">
+    <bpmndi:BPMNPlane id="plane" bpmnElement="Process_1">
+"""
+
+_SHAPE = (
+    '      <bpmndi:BPMNShape id="shape{0}" bpmnElement="element{0}">'
+    '<dc:Bounds x="{0}" y="80" width="100" height="80" /></bpmndi:BPMNShape>\n'
+)
+
+_END = """    </bpmndi:BPMNPlane>
+  </bpmndi:BPMNDiagram>
+</definitions>
+"""
+
+
+def _write_export(path: str, shapes: int) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(_PROCESS)
+        for index in range(shapes):
+            file.write(_SHAPE.format(index))
+        file.write(_END)
+
+
+def _measure(convert) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    convert()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1_000_000
+
+
+def run(shape_counts: list[int]) -> None:
+    print(f"{'shapes':>8} {'file MB':>8} {'full s':>8} {'full MB':>8} {'stream s':>9} {'stream MB':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for shapes in shape_counts:
+            path = os.path.join(directory, f"export_{shapes}.bpmn")
+            _write_export(path, shapes)
+            size = os.path.getsize(path) / 1_000_000
+
+            def convert_full():
+                with open(path, "rb") as file:
+                    BpmnJsonGenerator().create_bpmn_json(file.read())
+
+            full_time, full_memory = _measure(convert_full)
+            stream_time, stream_memory = _measure(
+                lambda: BpmnJsonGenerator().create_bpmn_json_from_file(path)
+            )
+
+            print(
+                f"{shapes:>8} {size:>8.1f} {full_time:>8.3f} {full_memory:>8.1f} "
+                f"{stream_time:>9.4f} {stream_memory:>10.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shapes", type=int, nargs="+", default=[10000, 100000, 300000])
+    args = parser.parse_args()
+    run(args.shapes)
+
+
+if __name__ == "__main__":
+    main()
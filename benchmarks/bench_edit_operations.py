@@ -0,0 +1,127 @@
+"""
+Benchmark of the process editing functions (edit throughput versus process size).
+
+Usage:
+    python benchmarks/bench_edit_operations.py --sizes 100 1000 5000 --ops 200
+
+For every operation two numbers are reported:
+- "fresh": no index is passed, so every edit builds a ProcessIndex of the process
+- "indexed": edits are chained and share one incrementally maintained ProcessIndex,
+  as in BpmnEditingService
+
+The "deepcopy" column shows the cost of the full copy of the process that every edit
+used to perform, for comparison with the path-copying implementation.
+"""
+
+import argparse
+import random
+import time
+from copy import deepcopy
+
+from bpmn_assistant.services import SyntheticProcessGenerator
+from bpmn_assistant.services.process_editing import (
+    ProcessIndex,
+    add_element,
+    delete_element,
+    move_element,
+    update_element,
+)
+
+
+def _task_ids(process: list[dict]) -> list[str]:
+    ids = []
+    for element in process:
+        if element["type"].endswith("Task") or element["type"] == "task":
+            ids.append(element["id"])
+        if element["type"] in ["exclusiveGateway", "inclusiveGateway"]:
+            for branch in element["branches"]:
+                ids += _task_ids(branch["path"])
+        elif element["type"] == "parallelGateway":
+            for branch in element["branches"]:
+                ids += _task_ids(branch)
+    return ids
+
+
+def _ops_per_second(func, num_ops: int) -> float:
+    start = time.perf_counter()
+    for i in range(num_ops):
+        func(i)
+    elapsed = time.perf_counter() - start
+    return num_ops / elapsed
+
+
+def _bench_operation(process, operation, num_ops: int) -> tuple[float, float]:
+    """
+    Returns:
+        The throughput without and with a maintained index.
+    """
+    fresh = _ops_per_second(lambda i: operation(process, i, None), num_ops)
+
+    state = {"process": process, "index": ProcessIndex(process)}
+
+    def chained(i):
+        result = operation(state["process"], i, state["index"])
+        state["process"] = result["process"]
+
+    indexed = _ops_per_second(chained, num_ops)
+    return fresh, indexed
+
+
+def run(sizes: list[int], num_ops: int, seed: int) -> None:
+    operation_names = ["update", "add", "delete", "move"]
+    print(
+        f"{'size':>8} {'deepcopy':>10}"
+        + "".join(f" {name + ' fresh':>14} {name + ' indexed':>16}" for name in operation_names)
+    )
+    print("(ops/s)")
+
+    for size in sizes:
+        # Keep gateways shallow enough so that the tree is dominated by tasks
+        process = SyntheticProcessGenerator(
+            size=size, gateway_ratio=0.1, max_depth=3, seed=seed
+        ).generate()
+        task_ids = _task_ids(process)
+        rng = random.Random(seed)
+        size_ops = min(num_ops, len(task_ids) // 2)
+
+        # Distinct targets so that chained deletes never remove the same element twice
+        targets = rng.sample(task_ids, size_ops)
+        other_ids = [task_id for task_id in task_ids if task_id not in set(targets)]
+        anchors = [rng.choice(other_ids) for _ in range(size_ops)]
+
+        def do_update(current, i, index):
+            new_element = {"type": "task", "id": targets[i], "label": "Updated"}
+            return update_element(current, new_element, index=index)
+
+        def do_add(current, i, index):
+            new_element = {"type": "task", "id": f"bench_task_{i}", "label": "New"}
+            return add_element(current, new_element, after_id=anchors[i], index=index)
+
+        def do_delete(current, i, index):
+            return delete_element(current, targets[i], index=index)
+
+        def do_move(current, i, index):
+            return move_element(current, targets[i], before_id=anchors[i], index=index)
+
+        results = [_ops_per_second(lambda i: deepcopy(process), size_ops)]
+        for operation in [do_update, do_add, do_delete, do_move]:
+            results.extend(_bench_operation(process, operation, size_ops))
+
+        widths = [10] + [14, 16] * len(operation_names)
+        print(
+            f"{size:>8} "
+            + " ".join(f"{value:>{width}.0f}" for value, width in zip(results, widths))
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    run(args.sizes, args.ops, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark of the JSON encoding of the responses and the parsing of the request bodies
+(p50 time and peak memory versus process size and number of images).
+
+Usage:
+    python benchmarks/bench_json.py --sizes 100 1000 5000 --images 0 4 --repeat 20
+
+"encode" compares the stdlib JSONResponse with FastJSONResponse for a /modify response;
+"decode" compares FastAPI's default path (json.loads, then validation) with parse_model
+for a /modify request whose last message has the given number of 1 MB images. Without
+orjson, both columns use the standard library.
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from fastapi.responses import JSONResponse
+
+from bpmn_assistant.api import fast_json
+from bpmn_assistant.api.fast_json import FastJSONResponse, parse_model
+from bpmn_assistant.api.requests import ModifyBpmnRequest
+from bpmn_assistant.services import BpmnXmlGenerator, SyntheticProcessGenerator
+
+_IMAGE = "data:image/png;base64," + base64.b64encode(os.urandom(750_000)).decode()
+
+
+def _p50_ms(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def _peak_mb(func) -> float:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1_000_000
+
+
+def _measure(func, repeat: int) -> str:
+    return f"{_p50_ms(func, repeat):>9.2f} {_peak_mb(func):>8.1f}"
+
+
+def run(sizes: list[int], image_counts: list[int], repeat: int) -> None:
+    library = "orjson" if fast_json.orjson is not None else "stdlib"
+    print(f"fast path: {library}")
+    print(
+        f"{'size':>6} {'images':>6} {'body MB':>8} | {'op':>6} "
+        f"{'std ms':>9} {'std MB':>8} {'fast ms':>9} {'fast MB':>8}"
+    )
+
+    for size in sizes:
+        process = SyntheticProcessGenerator(size=size, seed=size).generate()
+        response = {"bpmn_xml": BpmnXmlGenerator().create_bpmn_xml(process), "bpmn_json": process}
+
+        for images in image_counts:
+            body = json.dumps(
+                {
+                    "message_history": [
+                        {"role": "user", "content": "Create the process"},
+                        {
+                            "role": "user",
+                            "content": "Update it according to the screenshots",
+                            "images": [
+                                {"preview": _IMAGE, "name": f"{index}.png"}
+                                for index in range(images)
+                            ],
+                        },
+                    ],
+                    "process": process,
+                    "model": "gpt-4o",
+                }
+            ).encode()
+            prefix = f"{size:>6} {images:>6} {len(body) / 1_000_000:>8.1f} |"
+
+            print(
+                f"{prefix} {'decode':>6} "
+                f"{_measure(lambda: ModifyBpmnRequest.model_validate(json.loads(body)), repeat)} "
+                f"{_measure(lambda: parse_model(ModifyBpmnRequest, body), repeat)}"
+            )
+            if images == image_counts[0]:
+                print(
+                    f"{prefix} {'encode':>6} "
+                    f"{_measure(lambda: JSONResponse(content=response), repeat)} "
+                    f"{_measure(lambda: FastJSONResponse(content=response), repeat)}"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--images", type=int, nargs="+", default=[0, 4])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.images, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark of process validation (validations per second versus process size).
+
+Usage:
+    python benchmarks/bench_validate_bpmn.py --sizes 100 1000 5000 --repeat 20
+
+Compares the single-pass validator in services/validate_bpmn.py with the previous
+per-element pydantic implementation (benchmarks/legacy_validate_bpmn.py).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from bpmn_assistant.services import SyntheticProcessGenerator
+from bpmn_assistant.services.validate_bpmn import validate_bpmn
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import legacy_validate_bpmn  # noqa: E402
+
+
+def _validations_per_second(validate, process: list[dict], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        validate(process)
+    elapsed = time.perf_counter() - start
+    return repeat / elapsed
+
+
+def run(sizes: list[int], repeat: int, seed: int) -> None:
+    print(f"{'size':>8} {'legacy':>12} {'single-pass':>12} {'speedup':>9}")
+    print("(validations/s)")
+
+    for size in sizes:
+        process = SyntheticProcessGenerator(
+            size=size, gateway_ratio=0.2, max_depth=4, seed=seed
+        ).generate()
+
+        legacy = _validations_per_second(legacy_validate_bpmn.validate_bpmn, process, repeat)
+        single_pass = _validations_per_second(validate_bpmn, process, repeat)
+
+        print(f"{size:>8} {legacy:>12.1f} {single_pass:>12.1f} {single_pass / legacy:>8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from typing import Optional
+
+
+def make_etag(digest: str) -> str:
+    """
+    Make a strong entity tag from a content hash.
+    """
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check whether an If-None-Match header matches an entity tag (weak comparison, as
+    required for If-None-Match), i.e. whether the client already has the representation.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag.removeprefix("W/"):
+            return True
+    return False
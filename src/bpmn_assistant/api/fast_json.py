@@ -0,0 +1,122 @@
+import json
+from typing import Any, Callable, TypeVar
+
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ValidationError
+
+try:
+    import orjson
+except ImportError:  # The standard library (and pydantic) are used instead
+    orjson = None
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON, with orjson if it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def parse_model(model: type[ModelT], body: bytes) -> ModelT:
+    """
+    Parse a JSON body into a request model. The body is decoded with orjson if it is
+    installed (and with the standard library otherwise), then validated as Python data,
+    which is faster than pydantic's own JSON parser for the large processes and base64
+    images of the requests.
+    Raises:
+        ValidationError: If the body is not valid JSON or does not match the model.
+    """
+    try:
+        data = orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError:  # both JSONDecodeErrors are ValueErrors
+        # Let pydantic report the JSON error in its usual format
+        return model.model_validate_json(body)
+    return model.model_validate(data)
+
+
+def json_body(model: type[ModelT]) -> Callable[[Request], Any]:
+    """
+    Create a FastAPI dependency that parses the request body with parse_model, for the
+    endpoints that receive large payloads. Invalid bodies are rejected with the same 422
+    response as the bodies that FastAPI validates itself. As FastAPI does not see these
+    bodies, document_json_bodies adds them to the OpenAPI schema.
+    """
+
+    async def dependency(request: Request) -> ModelT:
+        body = await request.body()
+        try:
+            return parse_model(model, body)
+        except ValidationError as e:
+            errors = [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ]
+            raise RequestValidationError(errors, body=body)
+
+    dependency.json_body_model = model  # type: ignore[attr-defined]
+    return dependency
+
+
+def document_json_bodies(app: FastAPI) -> None:
+    """
+    Describe the request bodies parsed with json_body in the OpenAPI schema of an app,
+    with the same component schemas as the bodies that FastAPI parses itself, so that
+    /docs and the generated clients keep working.
+    """
+    generate_openapi = app.openapi
+
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema is not None:
+            return app.openapi_schema
+        openapi_schema = generate_openapi()
+        component_schemas = openapi_schema.setdefault("components", {}).setdefault(
+            "schemas", {}
+        )
+        for route in app.routes:
+            if not isinstance(route, APIRoute) or not route.include_in_schema:
+                continue
+            models = [
+                dependency.call.json_body_model
+                for dependency in route.dependant.dependencies
+                if hasattr(dependency.call, "json_body_model")
+            ]
+            if not models:
+                continue
+            model = models[0]
+            model_schema = model.model_json_schema(
+                ref_template="#/components/schemas/{model}"
+            )
+            component_schemas.update(model_schema.pop("$defs", {}))
+            component_schemas[model.__name__] = model_schema
+            for method in route.methods:
+                operation = openapi_schema["paths"][route.path_format][method.lower()]
+                operation["requestBody"] = {
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": f"#/components/schemas/{model.__name__}"}
+                        }
+                    },
+                    "required": True,
+                }
+        return openapi_schema
+
+    app.openapi = openapi  # type: ignore[method-assign]
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson if it is installed, and with the standard library
+    (like JSONResponse) otherwise.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
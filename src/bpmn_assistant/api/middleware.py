@@ -0,0 +1,241 @@
+import gzip
+import re
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+
+from bpmn_assistant.config import logger, request_id_var
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.core.tracing import server_span
+
+try:
+    import brotli
+except ImportError:  # Responses are only compressed with gzip
+    brotli = None
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# Request IDs from clients are only reused if they cannot corrupt the logs
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,64}")
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware that assigns an ID to every HTTP request (or reuses a valid X-Request-ID
+    header), so that all the log lines of a request can be correlated. The ID is returned in
+    the X-Request-ID response header, and the duration of the request is logged.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not _VALID_REQUEST_ID.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+
+        token = request_id_var.set(request_id)
+        start = time.perf_counter()
+        status_code = None
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (REQUEST_ID_HEADER.encode(), request_id.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            logger.info(
+                f"{scope['method']} {scope['path']} {status_code}",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_seconds": round(time.perf_counter() - start, 6),
+                },
+            )
+            request_id_var.reset(token)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that traces every HTTP request in a server span, continuing the trace
+    of the client (e.g. the frontend) if the request has a traceparent header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {
+            name.decode("latin-1"): value.decode("latin-1") for name, value in scope["headers"]
+        }
+        with server_span(
+            f"{scope['method']} {scope['path']}",
+            headers,
+            **{
+                "http.request.method": scope["method"],
+                "url.path": scope["path"],
+                "bpmn.request_id": request_id_var.get(),
+            },
+        ) as current:
+
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    current.set_attribute("http.response.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+
+
+_COMPRESSIBLE_TYPES = ("application/json", "application/xml", "image/svg+xml")
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses the responses larger than a threshold with brotli (if it
+    is installed) or gzip, depending on the Accept-Encoding header of the request.
+    Only responses sent in one piece are compressed: streaming responses (server-sent
+    events, NDJSON, /talk) are passed through, so that their chunks are not delayed.
+    The ETags of compressed responses are weakened, since a strong ETag must change with
+    the bytes of the body.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ):
+        """
+        Args:
+            app: The ASGI application.
+            minimum_size: The size (in bytes) from which responses are compressed.
+            gzip_level: The gzip compression level (1-9).
+            brotli_quality: The brotli quality (0-11). The default favours speed, as the
+                responses are compressed on every request.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                encoding = _select_encoding(value.decode("latin-1"))
+                break
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Held back until the first body message shows whether the response streams
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start.setdefault("headers", []))
+            if start["status"] == 304:
+                # The 200 response would have been compressed (unless it is small), so the
+                # ETag must match the weakened one that the client has
+                _weaken_etag(headers)
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not _is_compressible(headers.get("content-type", ""))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = self._compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            _weaken_etag(headers)
+            compressed_bytes = metrics.counter(
+                "http_compressed_bytes_total", "Size of the compressed responses, before and after"
+            )
+            compressed_bytes.inc(len(body), encoding=encoding, stage="original")
+            compressed_bytes.inc(len(compressed), encoding=encoding, stage="compressed")
+            await send(start)
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+def _select_encoding(accept_encoding: str) -> str | None:
+    # Brotli compresses XML and JSON better than gzip, so it wins if both are accepted
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip())
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
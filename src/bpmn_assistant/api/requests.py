@@ -25,6 +25,7 @@ class ModifyBpmnRequest(BaseModel):
     process: list[dict[str, Any]] | None  # The process to be updated (if it exists)
     model: str  # The model to be used
     api_keys: dict[str, str] | None = None  # Optional API keys from user
+    fallback_models: list[str] | None = None  # Models to use if the model fails (in order)
 
 
 class ConversationalRequest(BaseModel):
@@ -1,7 +1,29 @@
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse, StreamingResponse
+import asyncio
+import hmac
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Annotated, Any
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
 
+from bpmn_assistant.api.fast_json import (
+    FastJSONResponse,
+    document_json_bodies,
+    dumps,
+    json_body,
+)
+from bpmn_assistant.api.etag import etag_matches, make_etag
+from bpmn_assistant.api.middleware import (
+    CompressionMiddleware,
+    RequestIdMiddleware,
+    TracingMiddleware,
+)
 from bpmn_assistant.api.requests import (
     AvailableProvidersRequest,
     BpmnToJsonRequest,
@@ -9,19 +31,29 @@ from bpmn_assistant.api.requests import (
     DetermineIntentRequest,
     ModifyBpmnRequest,
 )
+from bpmn_assistant.config import logger
 from bpmn_assistant.core import handle_exceptions
 from bpmn_assistant.core.enums import OutputMode
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.core.profiler import profile_process
+from bpmn_assistant.core.tracing import setup_tracing
+from bpmn_assistant.prompts import PromptTemplateProcessor, get_example_library
 from bpmn_assistant.services import (
     BpmnJsonGenerator,
     BpmnModelingService,
     BpmnXmlGenerator,
     ConversationalService,
     determine_intent,
+    process_hash,
 )
+from bpmn_assistant.services.batch_generation import BatchGenerator, read_jsonl
+from bpmn_assistant.services.conversion_cache import get_conversion_cache
+from bpmn_assistant.services.job_queue import JobQueue, JobStore, ProgressReporter
 from bpmn_assistant.utils import (
     extract_images_from_message_history,
     get_available_providers,
     get_llm_facade,
+    get_llm_router,
     replace_reasoning_model,
 )
 
@@ -36,7 +68,23 @@ ALLOWED_ORIGINS = [
 ]
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_tracing()
+    # Compile the prompt templates and index the examples before the first request
+    PromptTemplateProcessor().precompile()
+    get_example_library()
+    # Resume the jobs that were unfinished when the server stopped
+    get_job_queue()
+    yield
+    if _job_queue is not None:
+        _job_queue.shutdown(wait=False)
+    if _conversion_executor is not None:
+        _conversion_executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(lifespan=lifespan)
+document_json_bodies(app)
 
 app.add_middleware(
     CORSMiddleware,
@@ -44,10 +92,85 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "ETag"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("BPMN_COMPRESSION_MIN_SIZE", "1024")),
+)
+app.add_middleware(TracingMiddleware)
+# Outermost, so that the logs (and spans) of the other middlewares have the request ID too
+app.add_middleware(RequestIdMiddleware)
+
+# Streaming lets invalid processes be rejected before the whole response has been generated
+bpmn_modeling_service = BpmnModelingService(
+    stream_json=os.getenv("BPMN_STREAM_JSON", "false").lower() in ("1", "true", "yes")
+)
+# Processes seen before (e.g. unchanged by an edit) are not converted again
+bpmn_xml_generator = BpmnXmlGenerator(cache=get_conversion_cache("bpmn_xml"))
+
+_job_queue: JobQueue | None = None
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get the queue of background jobs, creating it (and resuming its unfinished jobs) on
+    first use. Configured with BPMN_JOBS_DB (the SQLite file) and BPMN_JOB_WORKERS.
+    """
+    global _job_queue
+    if _job_queue is None:
+        store = JobStore(os.getenv("BPMN_JOBS_DB", "bpmn_jobs.sqlite3"))
+        _job_queue = JobQueue(
+            store,
+            handlers={"modify": _run_modify_job},
+            max_workers=int(os.getenv("BPMN_JOB_WORKERS", "4")),
+        )
+        _job_queue.recover()
+    return _job_queue
+
+
+_conversion_executor: ProcessPoolExecutor | None = None
+_conversion_executor_lock = threading.Lock()
+
+
+def get_conversion_executor() -> ProcessPoolExecutor | None:
+    """
+    Get the pool of processes in which the processes of a collaboration are converted,
+    creating it on first use. Configured with BPMN_CONVERSION_WORKERS (0 for the number of
+    CPUs). Defaults to 1: the processes are converted in the request thread, since a
+    process usually converts faster than it is sent to a worker and back.
+    """
+    global _conversion_executor
+    workers = int(os.getenv("BPMN_CONVERSION_WORKERS", "1")) or os.cpu_count() or 1
+    if workers <= 1:
+        return None
+    with _conversion_executor_lock:
+        if _conversion_executor is None:
+            # Not forked from this process, which runs threads (logging, jobs, LLM calls)
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(["bpmn_assistant.services.bpmn_json_generator"])
+            _conversion_executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        return _conversion_executor
+
+
+def _discard_conversion_executor(executor: ProcessPoolExecutor) -> None:
+    # The next call of get_conversion_executor creates a new pool
+    global _conversion_executor
+    with _conversion_executor_lock:
+        if _conversion_executor is executor:
+            _conversion_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
 
-bpmn_modeling_service = BpmnModelingService()
-bpmn_xml_generator = BpmnXmlGenerator()
+
+def _create_collaboration_json(bpmn_xml: str) -> dict[str, Any]:
+    executor = get_conversion_executor()
+    try:
+        return BpmnJsonGenerator().create_collaboration_json(bpmn_xml, executor)
+    except BrokenExecutor as e:
+        # A worker died (e.g. out of memory): the pool cannot be used anymore
+        logger.warning(f"The conversion pool is broken, converting sequentially: {e}")
+        _discard_conversion_executor(executor)
+        return BpmnJsonGenerator().create_collaboration_json(bpmn_xml)
 
 
 @app.get("/")
@@ -55,15 +178,93 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def _metrics() -> JSONResponse:
+    """
+    Get the in-process metrics (e.g. the number of LLM attempts per created process)
+    """
+    return JSONResponse(content=metrics.snapshot())
+
+
+def _check_admin_token(authorization: str) -> None:
+    """
+    Restrict an endpoint to the holders of BPMN_ADMIN_TOKEN ("Authorization: Bearer <token>").
+    Raises:
+        HTTPException: 404 if BPMN_ADMIN_TOKEN is not set, 401 if the token is invalid.
+    """
+    admin_token = os.getenv("BPMN_ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(authorization.encode(), f"Bearer {admin_token}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@app.get("/admin/profile")
+async def _profile(
+    seconds: float = 10,
+    interval: float = 0.01,
+    format: str = "collapsed",
+    include_idle: bool = False,
+    authorization: str = Header(default=""),
+):
+    """
+    Profile this worker for a number of seconds by sampling the stacks of its threads, and
+    return the profile as collapsed stacks or as a speedscope profile, in which the frames
+    of bpmn_assistant are highlighted. Only available if BPMN_ADMIN_TOKEN is set, with an
+    "Authorization: Bearer <token>" header; BPMN_PROFILE_MAX_SECONDS limits the duration.
+    """
+    _check_admin_token(authorization)
+
+    max_seconds = float(os.getenv("BPMN_PROFILE_MAX_SECONDS", "60"))
+    if not 0 < seconds <= max_seconds:
+        raise HTTPException(
+            status_code=400, detail=f"seconds must be between 0 and {max_seconds}"
+        )
+    if not 0.001 <= interval <= 1:
+        raise HTTPException(status_code=400, detail="interval must be between 0.001 and 1")
+    if format not in ("collapsed", "speedscope"):
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+
+    # The sampling runs in a thread, so the worker keeps serving the traffic to profile
+    profile = await asyncio.to_thread(profile_process, seconds, interval, include_idle)
+    if profile is None:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    if format == "speedscope":
+        return FastJSONResponse(content=profile.to_speedscope())
+    return PlainTextResponse(profile.to_collapsed())
+
+
 @app.post("/bpmn_to_json")
 @handle_exceptions
-async def _bpmn_to_json(request: BpmnToJsonRequest) -> JSONResponse:
+async def _bpmn_to_json(
+    request: Annotated[BpmnToJsonRequest, Depends(json_body(BpmnToJsonRequest))],
+    if_none_match: str | None = Header(default=None),
+) -> Response:
     """
-    Convert the BPMN XML to its JSON representation
+    Convert the BPMN XML to its JSON representation. The ETag of the response is the hash
+    of the process, so clients that send it back in If-None-Match get a 304 (without a
+    body) if the diagram still has the same process.
     """
-    bpmn_json_generator = BpmnJsonGenerator()
+    bpmn_json_generator = BpmnJsonGenerator(cache=get_conversion_cache("bpmn_json"))
     result = bpmn_json_generator.create_bpmn_json(request.bpmn_xml)
-    return JSONResponse(content=result)
+    etag = make_etag(process_hash(result))
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return FastJSONResponse(content=result, headers={"ETag": etag})
+
+
+@app.post("/collaboration_to_json")
+@handle_exceptions
+async def _collaboration_to_json(
+    request: Annotated[BpmnToJsonRequest, Depends(json_body(BpmnToJsonRequest))],
+) -> JSONResponse:
+    """
+    Convert every process (pool) of the BPMN XML to its JSON representation, with the
+    message flows between the participants
+    """
+    result = await asyncio.to_thread(_create_collaboration_json, request.bpmn_xml)
+    return FastJSONResponse(content=result)
 
 
 @app.post("/available_providers")
@@ -78,7 +279,9 @@ async def _available_providers(request: AvailableProvidersRequest) -> JSONRespon
 
 @app.post("/determine_intent")
 @handle_exceptions
-async def _determine_intent(request: DetermineIntentRequest) -> JSONResponse:
+async def _determine_intent(
+    request: Annotated[DetermineIntentRequest, Depends(json_body(DetermineIntentRequest))],
+) -> JSONResponse:
     """
     Determine the intent of the user query
     """
@@ -91,17 +294,98 @@ async def _determine_intent(request: DetermineIntentRequest) -> JSONResponse:
 
 @app.post("/modify")
 @handle_exceptions
-async def _modify(request: ModifyBpmnRequest) -> JSONResponse:
+async def _modify(
+    request: Annotated[ModifyBpmnRequest, Depends(json_body(ModifyBpmnRequest))],
+) -> JSONResponse:
     """
     Modify the BPMN process based on the user query. If the request does not contain a BPMN JSON,
-    then create a new BPMN process. Otherwise, edit the existing BPMN process.
+    then create a new BPMN process. Otherwise, edit the existing BPMN process, and also return
+    the patch of the XML (elements and flows added, removed or changed by the edit).
+    """
+    return FastJSONResponse(content=_run_modify(request))
+
+
+@app.post("/jobs/modify")
+@handle_exceptions
+async def _submit_modify_job(
+    request: Annotated[ModifyBpmnRequest, Depends(json_body(ModifyBpmnRequest))],
+) -> JSONResponse:
+    """
+    Queue a /modify request as a background job and return its ID immediately.
+    The API keys of the request are only kept in memory, not in the job store.
     """
-    llm_facade = get_llm_facade(request.model, api_keys=request.api_keys)
-    text_llm_facade = get_llm_facade(
-        request.model, OutputMode.TEXT, api_keys=request.api_keys
+    job = get_job_queue().submit(
+        "modify",
+        request.model_dump(mode="json", exclude={"api_keys"}),
+        secrets={"api_keys": request.api_keys} if request.api_keys else None,
+    )
+    return JSONResponse(content=job.to_dict(), status_code=202)
+
+
+@app.get("/jobs/{job_id}")
+async def _get_job(job_id: str) -> JSONResponse:
+    """
+    Get the status and, once finished, the result of a background job
+    """
+    job = get_job_queue().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return FastJSONResponse(content=job.to_dict())
+
+
+@app.get("/jobs/{job_id}/events")
+async def _get_job_events(
+    job_id: str, last_event_id: int = Header(default=0)
+) -> StreamingResponse:
+    """
+    Stream the progress events of a background job as server-sent events, ending with the
+    finished job. Clients that reconnect with Last-Event-ID only receive the newer events.
+    """
+    store = get_job_queue().store
+    if store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    async def events():
+        last_seq = last_event_id
+        while True:
+            for seq, event in store.get_events(job_id, after=last_seq):
+                last_seq = seq
+                yield f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            job = store.get(job_id)
+            if job is None or job.is_finished:
+                if job is not None:
+                    yield f"event: result\ndata: {dumps(job.to_dict()).decode()}\n\n"
+                return
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def _run_modify_job(
+    request: dict[str, Any], secrets: dict[str, Any], report: ProgressReporter
+) -> dict[str, Any]:
+    return _run_modify(ModifyBpmnRequest(**request, **secrets), report)
+
+
+def _run_modify(
+    request: ModifyBpmnRequest, report: ProgressReporter | None = None
+) -> dict[str, Any]:
+    llm_facade = get_llm_router(
+        request.model,
+        api_keys=request.api_keys,
+        fallback_models=request.fallback_models,
+    )
+    text_llm_facade = get_llm_router(
+        request.model,
+        OutputMode.TEXT,
+        api_keys=request.api_keys,
+        fallback_models=request.fallback_models,
     )
     images = extract_images_from_message_history(request.message_history)
 
+    if report is not None:
+        report("editing" if request.process else "creating")
+
     if request.process:
         process = bpmn_modeling_service.edit_bpmn(
             llm_facade,
@@ -116,15 +400,68 @@ async def _modify(request: ModifyBpmnRequest) -> JSONResponse:
             request.message_history,
             images=images,
         )
-    print("TYPE: ", type(process))
-    print("CONTENT: ", process)
 
-    bpmn_xml_string = bpmn_xml_generator.create_bpmn_xml(process)
-    return JSONResponse(content={"bpmn_xml": bpmn_xml_string, "bpmn_json": process})
+    if report is not None:
+        report("generating_xml")
+    if not request.process:
+        bpmn_xml_string = bpmn_xml_generator.create_bpmn_xml(process)
+        return {"bpmn_xml": bpmn_xml_string, "bpmn_json": process}
+
+    # Only the elements and flows affected by the edit are serialized again, and the patch
+    # lets clients update their diagram without importing the whole XML
+    bpmn_xml_string, patch = bpmn_xml_generator.update_bpmn_xml(process, request.process)
+    return {"bpmn_xml": bpmn_xml_string, "bpmn_json": process, "bpmn_patch": patch}
+
+
+@app.post("/batch/create")
+@handle_exceptions
+async def _batch_create(
+    request: Request,
+    models: str,
+    concurrency: int = 4,
+    authorization: str = Header(default=""),
+) -> StreamingResponse:
+    """
+    Create a process for every line of a JSONL body ({"id": ..., "description": ...,
+    "model": ...}) and stream the results as JSONL, in order of completion.
+    Items without a model are distributed over the comma-separated models, which must
+    be usable with the API keys of the server. As the LLM calls are paid with these keys,
+    the endpoint is only available with BPMN_ADMIN_TOKEN (like /admin/profile), and
+    BPMN_BATCH_MAX_CONCURRENCY limits the concurrency.
+    """
+    _check_admin_token(authorization)
+
+    max_concurrency = int(os.getenv("BPMN_BATCH_MAX_CONCURRENCY", "16"))
+    if not 1 <= concurrency <= max_concurrency:
+        raise HTTPException(
+            status_code=400, detail=f"concurrency must be between 1 and {max_concurrency}"
+        )
+
+    body = (await request.body()).decode("utf-8")
+    try:
+        items = list(read_jsonl(body.splitlines()))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSONL: {e}")
+
+    batch_generator = BatchGenerator(
+        [model.strip() for model in models.split(",") if model.strip()],
+        facade_factory=get_llm_router,
+        max_concurrency=concurrency,
+        modeling_service=bpmn_modeling_service,
+        xml_generator=bpmn_xml_generator,
+    )
+
+    def results():
+        for result in batch_generator.run(items):
+            yield dumps(result.to_dict()) + b"\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
 
 
 @app.post("/talk")
-async def _talk(request: ConversationalRequest) -> StreamingResponse:
+async def _talk(
+    request: Annotated[ConversationalRequest, Depends(json_body(ConversationalRequest))],
+) -> StreamingResponse:
     model = replace_reasoning_model(request.model)
     conversational_service = ConversationalService(model, api_keys=request.api_keys)
     images = extract_images_from_message_history(request.message_history)
@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import sys
+from typing import Optional
+
+
+def _add_generate_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser(
+        "generate", help="Generate a synthetic BPMN process for scale testing"
+    )
+    parser.add_argument("--size", type=int, default=50, help="Total number of elements")
+    parser.add_argument("--max-depth", type=int, default=3, help="Maximum gateway nesting depth")
+    parser.add_argument("--max-branches", type=int, default=3, help="Maximum branches per gateway")
+    parser.add_argument("--gateway-ratio", type=float, default=0.15)
+    parser.add_argument("--loop-ratio", type=float, default=0.1)
+    parser.add_argument("--event-ratio", type=float, default=0.1)
+    parser.add_argument(
+        "--gateway-mix",
+        type=str,
+        default=None,
+        help='Gateway type weights as JSON, e.g. \'{"exclusiveGateway": 1, "parallelGateway": 1}\'',
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--format", choices=["json", "xml"], default="json")
+    parser.add_argument("--output", "-o", type=str, default=None, help="Output file (default: stdout)")
+    parser.set_defaults(handler=_run_generate)
+
+
+def _run_generate(args: argparse.Namespace) -> int:
+    from bpmn_assistant.services.synthetic_process_generator import (
+        SyntheticProcessGenerator,
+    )
+
+    generator = SyntheticProcessGenerator(
+        size=args.size,
+        max_depth=args.max_depth,
+        max_branches=args.max_branches,
+        gateway_ratio=args.gateway_ratio,
+        loop_ratio=args.loop_ratio,
+        event_ratio=args.event_ratio,
+        gateway_mix=json.loads(args.gateway_mix) if args.gateway_mix else None,
+        seed=args.seed,
+    )
+    process = generator.generate()
+
+    if args.format == "xml":
+        output = generator.generate_xml(process)
+    else:
+        output = json.dumps({"process": process}, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        sys.stdout.write(output + "\n")
+    return 0
+
+
+def _add_batch_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser(
+        "batch", help="Create processes for a JSONL file of descriptions"
+    )
+    parser.add_argument(
+        "input", type=str, help='JSONL file with one {"id", "description", "model"} per line'
+    )
+    parser.add_argument("--output", "-o", type=str, required=True, help="JSONL results file")
+    parser.add_argument(
+        "--model",
+        action="append",
+        required=True,
+        help="Model for items without one (repeat to distribute items over several models)",
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip the items that succeeded in the existing output file and append to it",
+    )
+    parser.set_defaults(handler=_run_batch)
+
+
+def _run_batch(args: argparse.Namespace) -> int:
+    from bpmn_assistant.services.batch_generation import (
+        BatchGenerator,
+        read_checkpoint,
+        read_jsonl,
+    )
+    from bpmn_assistant.utils import get_llm_router
+
+    completed_ids = read_checkpoint(args.output) if args.resume else set()
+    # A line truncated by an interrupted run must be terminated before appending
+    truncated = args.resume and _ends_without_newline(args.output)
+    batch_generator = BatchGenerator(
+        args.model, facade_factory=get_llm_router, max_concurrency=args.concurrency
+    )
+
+    counts = {"succeeded": 0, "failed": 0}
+    with open(args.input, encoding="utf-8") as input_file, open(
+        args.output, "a" if args.resume else "w", encoding="utf-8"
+    ) as output_file:
+        if truncated:
+            output_file.write("\n")
+        for result in batch_generator.run(read_jsonl(input_file), skip_ids=completed_ids):
+            # Flushed after every result, so that the file is a checkpoint for --resume
+            output_file.write(json.dumps(result.to_dict()) + "\n")
+            output_file.flush()
+            counts[result.status] += 1
+            sys.stderr.write(
+                f"{result.id}: {result.status} ({result.duration_seconds:.1f}s)\n"
+            )
+
+    sys.stderr.write(
+        f"{counts['succeeded']} succeeded, {counts['failed']} failed, "
+        f"{len(completed_ids)} skipped\n"
+    )
+    return 1 if counts["failed"] else 0
+
+
+def _add_convert_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser(
+        "convert", help="Convert a directory of BPMN XML files to JSON in parallel"
+    )
+    parser.add_argument("directory", type=str, help="Directory searched recursively for BPMN files")
+    parser.add_argument("--output", "-o", type=str, required=True, help="JSONL results file")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Number of processes (default: CPU count)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=64, help="Files per dispatched chunk")
+    parser.add_argument(
+        "--extension",
+        action="append",
+        default=[],
+        help="Additional extension of the BPMN files, e.g. .xml (repeatable; "
+        "default: .bpmn and .bpmn20.xml)",
+    )
+    parser.set_defaults(handler=_run_convert)
+
+
+def _run_convert(args: argparse.Namespace) -> int:
+    from bpmn_assistant.services.bulk_conversion import (
+        BPMN_FILE_EXTENSIONS,
+        BulkConversionStats,
+        convert_files,
+        iter_bpmn_files,
+    )
+
+    extensions = BPMN_FILE_EXTENSIONS + tuple(
+        "." + extension.lower().lstrip(".") for extension in args.extension
+    )
+    stats = BulkConversionStats()
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        for result in convert_files(
+            iter_bpmn_files(args.directory, extensions),
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        ):
+            output_file.write(json.dumps(result) + "\n")
+            stats.add(result)
+            if result["status"] == "failed":
+                sys.stderr.write(f"{result['path']}: {result['error']}\n")
+
+    sys.stderr.write(json.dumps(stats.to_dict(), indent=2) + "\n")
+    return 1 if stats.failed else 0
+
+
+def _ends_without_newline(path: str) -> bool:
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    with open(path, "rb") as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) != b"\n"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="bpmn-assistant")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _add_generate_parser(subparsers)
+    _add_batch_parser(subparsers)
+    _add_convert_parser(subparsers)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 import logging
 
-from .log_config import setup_logger
+from .log_config import log_payload, request_id_var, setup_logger
 
 setup_logger()
 logger = logging.getLogger(__name__)
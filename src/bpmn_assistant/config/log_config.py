@@ -1,7 +1,27 @@
+import atexit
 import codecs
+import json
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import random
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Any
+
+PAYLOAD_LOGGER_NAME = "bpmn_assistant.payloads"
+
+# The ID of the request (or job) being handled, stamped on every log record
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# The attributes of every log record, as opposed to the "extra" fields of a log call
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", logging.INFO, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "request_id", "taskName"}
+
+_listeners: list[QueueListener] = []
+_payload_sample_rate = 0.0
 
 
 class CustomFormatter(logging.Formatter):
@@ -15,11 +35,47 @@ class CustomFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         log_fmt = self.FORMATS.get(record.levelno, self.FORMATS[logging.INFO])
+        if getattr(record, "request_id", None):
+            log_fmt = log_fmt.replace(" - %(message)s", " [%(request_id)s] - %(message)s")
         self._style._fmt = log_fmt
         self.datefmt = "%Y-%m-%d %H:%M:%S"
         return super().format(record)
 
 
+class JsonFormatter(logging.Formatter):
+    """
+    Formats the log records as JSON lines, with the request ID and the "extra" fields of
+    the log calls (e.g. durations and token counts).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.filename}:{record.lineno}",
+            "request_id": getattr(record, "request_id", None),
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamps the log records with the ID of the current request (see request_id_var).
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id_var.get()
+        return True
+
+
 class UTF8TimedRotatingFileHandler(TimedRotatingFileHandler):
     def __init__(
         self,
@@ -44,11 +100,68 @@ class UTF8TimedRotatingFileHandler(TimedRotatingFileHandler):
         )
 
 
+class LazyJson:
+    """
+    Formats a payload as indented JSON only if (and when) the log record is formatted.
+    """
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+    def __str__(self):
+        return json.dumps(self.payload, indent=2, default=str)
+
+
+def log_payload(label: str, payload: Any) -> None:
+    """
+    Log a large payload (e.g. a whole process) to the payload sink, if it is enabled and the
+    payload is sampled. The payload is only serialized if it is logged.
+    Args:
+        label: The description of the payload.
+        payload: The JSON-serializable payload.
+    """
+    payload_logger = logging.getLogger(PAYLOAD_LOGGER_NAME)
+    if not payload_logger.isEnabledFor(logging.DEBUG):
+        return
+    if _payload_sample_rate < 1 and random.random() >= _payload_sample_rate:
+        return
+    payload_logger.debug("%s:\n%s", label, LazyJson(payload))
+
+
 def setup_logger(
     enable_console: bool = True,
-    enable_file: bool = True,
+    enable_file: bool | None = None,
     disable_logging: bool = False,
+    payload_log_file: str | None = None,
+    payload_sample_rate: float | None = None,
+    json_format: bool | None = None,
 ) -> None:
+    """
+    Configure the loggers of the application. The file handler runs in a background thread,
+    so that logging does not block on disk writes.
+    Args:
+        enable_console: Whether to log (INFO and above) to the console.
+        enable_file: Whether to log (DEBUG and above) to logs/bpmn_assistant.log. Defaults
+            to whether BPMN_LOG_TO_FILE is not "false" (the tests disable it).
+        disable_logging: Whether to only log critical errors.
+        payload_log_file: The file of the payload sink (see log_payload), which is disabled
+            by default. Defaults to BPMN_PAYLOAD_LOG.
+        payload_sample_rate: The fraction of the payloads that are logged, between 0 and 1.
+            Defaults to BPMN_PAYLOAD_LOG_SAMPLE_RATE (ignored with a warning if it is not
+            such a number), or 1.
+        json_format: Whether to log JSON lines instead of text. Defaults to whether
+            BPMN_LOG_FORMAT is "json".
+    Raises:
+        ValueError: If payload_sample_rate is not between 0 and 1.
+    """
+    global _payload_sample_rate
+
+    if payload_sample_rate is not None and not 0 <= payload_sample_rate <= 1:
+        raise ValueError(
+            f"The payload sample rate must be between 0 and 1, got {payload_sample_rate}"
+        )
+
+    stop_logger()
 
     app_logger = logging.getLogger("bpmn_assistant")
     app_logger.handlers.clear()
@@ -61,15 +174,20 @@ def setup_logger(
     # Set the logging level for the root logger to WARNING to suppress logs from external libraries
     logging.getLogger().setLevel(logging.WARNING)
 
-    formatter = CustomFormatter()
+    if json_format is None:
+        json_format = os.getenv("BPMN_LOG_FORMAT", "text").lower() == "json"
+    formatter = JsonFormatter() if json_format else CustomFormatter()
 
     if enable_console:
         console_handler = logging.StreamHandler()
+        console_handler.addFilter(RequestContextFilter())
         console_handler.setFormatter(formatter)
         console_handler.setLevel(logging.INFO)
         console_handler.encoding = "utf-8"
         app_logger.addHandler(console_handler)
 
+    if enable_file is None:
+        enable_file = os.getenv("BPMN_LOG_TO_FILE", "true").lower() not in ("false", "0", "no")
     if enable_file:
         if not os.path.exists("logs"):
             os.makedirs("logs")
@@ -81,4 +199,62 @@ def setup_logger(
         )
         file_handler.setFormatter(formatter)
         file_handler.setLevel(logging.DEBUG)
-        app_logger.addHandler(file_handler)
+        _add_background_handler(app_logger, file_handler)
+
+    # Payloads are not written to the application log, only to their own (optional) sink
+    payload_logger = logging.getLogger(PAYLOAD_LOGGER_NAME)
+    payload_logger.handlers.clear()
+    payload_logger.propagate = False
+    payload_log_file = payload_log_file or os.getenv("BPMN_PAYLOAD_LOG")
+    if payload_sample_rate is None:
+        payload_sample_rate = _sample_rate_from_env(app_logger)
+    _payload_sample_rate = payload_sample_rate
+    if payload_log_file and not disable_logging:
+        payload_handler = logging.FileHandler(payload_log_file, encoding="utf-8")
+        payload_handler.setFormatter(formatter)
+        payload_logger.setLevel(logging.DEBUG)
+        _add_background_handler(payload_logger, payload_handler)
+    else:
+        payload_logger.setLevel(logging.CRITICAL + 1)
+
+
+def _sample_rate_from_env(app_logger: logging.Logger) -> float:
+    value = os.getenv("BPMN_PAYLOAD_LOG_SAMPLE_RATE")
+    if value is None:
+        return 1.0
+    try:
+        rate = float(value)
+    except ValueError:
+        rate = -1.0
+    if not 0 <= rate <= 1:
+        app_logger.warning(
+            f"Ignoring BPMN_PAYLOAD_LOG_SAMPLE_RATE={value!r}: not a number between 0 and 1"
+        )
+        return 1.0
+    return rate
+
+
+def _add_background_handler(logger: logging.Logger, handler: logging.Handler) -> None:
+    # The records are queued, and handled by a thread of a QueueListener
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # The request ID is read in the logging thread, not in the thread of the listener
+    queue_handler.addFilter(RequestContextFilter())
+    logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+
+def stop_logger() -> None:
+    """
+    Write the queued log records and stop the background logging threads.
+    """
+    while _listeners:
+        listener = _listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(stop_logger)
@@ -1,3 +1,4 @@
 from .llm_facade import LLMFacade
+from .llm_router import LLMRouter
 from .schemas import *
 from .decorators import handle_exceptions
\ No newline at end of file
@@ -11,6 +11,9 @@ def handle_exceptions(func: Callable):
     async def wrapper(*args, **kwargs):
         try:
             return await func(*args, **kwargs)
+        except HTTPException:
+            # Raised on purpose, e.g. for an invalid request
+            raise
         except Exception as e:
             logger.error(f"Error: {str(e)}", exc_info=e)
             raise HTTPException(status_code=500, detail=str(e))
@@ -1,4 +1,5 @@
 from .bpmn_element_type import BPMNElementType, EventDefinitionType
+from .job_status import JobStatus
 from .message_roles import MessageRole
 from .models import OpenAIModels, AnthropicModels, GoogleModels, FireworksAIModels
 from .output_modes import OutputMode
@@ -14,4 +15,5 @@ __all__ = [
     "BPMNElementType",
     "EventDefinitionType",
     "MessageRole",
+    "JobStatus",
 ]
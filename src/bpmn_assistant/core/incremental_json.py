@@ -0,0 +1,126 @@
+import json
+from typing import Any
+
+import json_repair
+
+
+class IncrementalJsonParser:
+    """
+    Parser for a JSON object that arrives in chunks (e.g. a streamed LLM response).
+    While the object is still incomplete, every completed item of the top-level array
+    `array_key` is parsed and returned, so that it can be validated before the rest of the
+    response has been generated. Text before the first '{' and after the end of the object
+    (e.g. markdown code fences) is ignored.
+
+    Example: for array_key="process", feeding '{"process": [{"id": "a"}, {"id"' returns
+    [{"id": "a"}]; the second item is returned once its closing brace arrives.
+    """
+
+    def __init__(self, array_key: str = "process"):
+        self.array_key = array_key
+        self._text = ""
+        self._pos = 0  # index of the next character to scan
+        self._start: int | None = None  # index of the opening brace of the root object
+        self._end: int | None = None  # index after the closing brace of the root object
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: str | None = None  # last string completed in the root object
+        self._current_key: str | None = None  # key of the value being parsed in the root object
+        self._in_array = False
+        self._item_start: int | None = None
+        self.items_count = 0
+
+    @property
+    def text(self) -> str:
+        """
+        The text received so far.
+        """
+        return self._text
+
+    @property
+    def is_complete(self) -> bool:
+        return self._end is not None
+
+    def feed(self, chunk: str) -> list[Any]:
+        """
+        Add a chunk of the response.
+        Args:
+            chunk: The next part of the response text.
+        Returns:
+            The items of the array that were completed by this chunk, in order.
+        """
+        self._text += chunk
+        completed: list[Any] = []
+
+        text = self._text
+        while self._pos < len(text) and self._end is None:
+            char = text[self._pos]
+            position = self._pos
+            self._pos += 1
+
+            if self._start is None:
+                if char == "{":
+                    self._start = position
+                    self._stack.append(char)
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_key = json.loads(text[self._string_start : position + 1])
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = position
+            elif char == ":" and len(self._stack) == 1:
+                self._current_key = self._last_key
+            elif char in "{[":
+                self._stack.append(char)
+                depth = len(self._stack)
+                if depth == 2 and char == "[" and self._current_key == self.array_key:
+                    self._in_array = True
+                elif depth == 3 and self._in_array:
+                    self._item_start = position
+            elif char in "}]":
+                self._stack.pop()
+                depth = len(self._stack)
+                if depth == 2 and self._in_array and self._item_start is not None:
+                    completed.append(json.loads(text[self._item_start : position + 1]))
+                    self.items_count += 1
+                    self._item_start = None
+                elif depth == 1 and self._in_array:
+                    self._in_array = False
+                elif depth == 0:
+                    self._end = position + 1
+
+        return completed
+
+    def result(self) -> dict[str, Any]:
+        """
+        Parse the complete response.
+        Returns:
+            The parsed JSON object.
+        Raises:
+            ValueError: If the response does not contain a JSON object.
+        """
+        if self._start is None:
+            raise ValueError(f"No JSON object found in the response: {self._text}")
+
+        raw_output = self._text[self._start : self._end]
+        try:
+            result = json.loads(raw_output)
+        except json.JSONDecodeError:
+            # Fix slightly incorrect JSON (e.g. a truncated response), as for non-streamed calls
+            result = json_repair.loads(raw_output)
+
+        if not isinstance(result, dict):
+            raise ValueError(f"Invalid JSON response from LLM: {result}")
+        return result
@@ -1,13 +1,21 @@
 import json
-from typing import Any, Generator
+import time
+from typing import Any, Callable, Generator
 
 from pydantic import BaseModel
 
 from bpmn_assistant.config import logger
 from bpmn_assistant.core.enums import MessageRole, OutputMode, Provider
+from bpmn_assistant.core.incremental_json import IncrementalJsonParser
 from bpmn_assistant.core.llm_provider import LLMProvider
+from bpmn_assistant.core.metrics import metrics
 from bpmn_assistant.core.provider_factory import ProviderFactory
+from bpmn_assistant.core.rate_limiter import RateLimiter, estimate_tokens, get_rate_limiter
 from bpmn_assistant.core.schemas import MessageImage
+from bpmn_assistant.core.tracing import span
+
+# The span attributes of the token usage (OpenTelemetry semantic conventions for GenAI)
+_USAGE_ATTRIBUTES = {"prompt_tokens": "input_tokens", "completion_tokens": "output_tokens"}
 
 
 class LLMFacade:
@@ -31,6 +39,8 @@ class LLMFacade:
         )
         self.model = model
         self.output_mode = output_mode
+        # Shared by all facades with the same provider and API key
+        self.rate_limiter: RateLimiter | None = get_rate_limiter(provider.value, api_key)
 
         if not self.provider.check_model_compatibility(self.model):
             raise ValueError(f"Unsupported model for provider {provider}: {self.model}")
@@ -76,13 +86,57 @@ class LLMFacade:
 
         self._append_user_message(prompt, images)
 
-        response = self.provider.call(
-            self.model,
-            self.messages,
-            max_tokens,
-            temperature,
-            structured_output,
-        )
+        def call_provider() -> str | dict[str, Any]:
+            start = time.perf_counter()
+            try:
+                with span(
+                    "llm.call",
+                    **{"gen_ai.request.model": self.model, "gen_ai.request.max_tokens": max_tokens},
+                ) as llm_span:
+                    # The usage is returned with the response, as the provider is shared by
+                    # the concurrent calls of the copies of this facade (see LLMRouter)
+                    response, usage = self.provider.call(
+                        self.model,
+                        self.messages,
+                        max_tokens,
+                        temperature,
+                        structured_output,
+                    )
+                    usage = usage or {}
+                    llm_span.set_attributes(
+                        {
+                            f"gen_ai.usage.{_USAGE_ATTRIBUTES[kind]}": tokens
+                            for kind, tokens in usage.items()
+                            if kind in _USAGE_ATTRIBUTES
+                        }
+                    )
+            except Exception:
+                metrics.counter("llm_call_errors_total", "Failed LLM calls").inc(
+                    model=self.model
+                )
+                raise
+            duration = time.perf_counter() - start
+            # Live latency distribution per model (without the time spent waiting for the
+            # rate limiter), used e.g. for hedged requests (see LLMRouter)
+            metrics.histogram("llm_call_latency_seconds", "Latency of LLM calls").observe(
+                duration, model=self.model
+            )
+            for kind, tokens in usage.items():
+                metrics.counter("llm_tokens_total", "Tokens used by LLM calls").inc(
+                    tokens, model=self.model, kind=kind
+                )
+            logger.info(
+                f"LLM call finished: {self.model} ({duration:.2f}s)",
+                extra={"model": self.model, "duration_seconds": round(duration, 3), **usage},
+            )
+            return response
+
+        if self.rate_limiter is None:
+            response = call_provider()
+        else:
+            response = self.rate_limiter.call(
+                call_provider, estimate_tokens(self.messages, max_tokens)
+            )
 
         if self.output_mode == OutputMode.JSON:
             if not isinstance(response, dict):
@@ -113,4 +167,78 @@ class LLMFacade:
 
         self._append_user_message(prompt, images)
 
-        return self.provider.stream(self.model, self.messages, max_tokens, temperature)
+        return self._stream_provider(max_tokens, temperature)
+
+    def stream_json(
+        self,
+        prompt: str,
+        array_key: str = "process",
+        on_item: Callable[[Any], None] | None = None,
+        max_tokens: int = 2000,
+        temperature: float = 0.3,
+        images: list[MessageImage] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Call the LLM model in JSON mode and parse the response while it is streamed.
+        Every completed item of the top-level array `array_key` is passed to `on_item` as soon
+        as it has been generated. If `on_item` raises an exception, the generation is aborted
+        and the exception is propagated, so that a retry can start without waiting for the
+        rest of the response.
+        Args:
+            prompt: The text prompt
+            array_key: The key of the top-level array whose items are passed to on_item
+            on_item: Optional callback for every completed item (e.g. a validator)
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            images: Optional list of images to attach to the user message
+        Returns:
+            The parsed JSON response
+        """
+        if self.output_mode != OutputMode.JSON:
+            raise ValueError("stream_json is only supported in JSON output mode")
+
+        logger.info(f"Calling LLM (streaming JSON): {self.model}")
+
+        self._append_user_message(prompt, images)
+
+        parser = IncrementalJsonParser(array_key)
+        chunks = self._stream_provider(max_tokens, temperature)
+
+        try:
+            for chunk in chunks:
+                for item in parser.feed(chunk):
+                    if on_item is not None:
+                        on_item(item)
+                if parser.is_complete:
+                    break
+        except Exception:
+            logger.info(
+                f"Aborted streaming after {parser.items_count} items of '{array_key}'"
+            )
+            # Keep the partial response in the conversation, so that the retry prompt
+            # refers to what the model has generated
+            self.messages.append(
+                {"role": MessageRole.ASSISTANT.value, "content": parser.text}
+            )
+            raise
+        finally:
+            # Stops the generation on the provider side if it was aborted
+            chunks.close()
+
+        response = parser.result()
+        self.messages.append(
+            {"role": MessageRole.ASSISTANT.value, "content": json.dumps(response)}
+        )
+        return response
+
+    def _stream_provider(
+        self, max_tokens: int, temperature: float
+    ) -> Generator[str, None, None]:
+        def start_stream() -> Generator[str, None, None]:
+            return self.provider.stream(self.model, self.messages, max_tokens, temperature)
+
+        if self.rate_limiter is None:
+            return start_stream()
+        return self.rate_limiter.stream(
+            start_stream, estimate_tokens(self.messages, max_tokens)
+        )
@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import Any, Generator
+from typing import Any, Generator, NamedTuple
 
 from pydantic import BaseModel
 
 
+class LLMResponse(NamedTuple):
+    content: str | dict[str, Any]
+    # The token usage of the call ({"prompt_tokens": ..., "completion_tokens": ...}),
+    # if the provider reports it
+    usage: dict[str, int] | None = None
+
+
 class LLMProvider(ABC):
     @abstractmethod
     def call(
@@ -13,7 +20,7 @@ class LLMProvider(ABC):
         max_tokens: int,
         temperature: float,
         structured_output: BaseModel | None = None,
-    ) -> str | dict[str, Any]:
+    ) -> LLMResponse:
         pass
 
     @abstractmethod
@@ -0,0 +1,301 @@
+import contextvars
+import copy
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Generator
+
+from pydantic import BaseModel
+
+from bpmn_assistant.config import logger
+from bpmn_assistant.core.enums import OutputMode
+from bpmn_assistant.core.llm_facade import LLMFacade
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.core.schemas import MessageImage
+
+# Calls that are abandoned after a timeout or a won hedge keep their worker until the
+# provider returns, so the pool is larger than the number of concurrent requests
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-router")
+
+
+class AllModelsFailedError(Exception):
+    def __init__(self, errors: list[tuple[str, Exception]]):
+        self.errors = errors
+        details = "; ".join(f"{model}: {error}" for model, error in errors)
+        super().__init__(f"All models failed. {details}")
+
+
+class _CallbackError(Exception):
+    """
+    Wraps an exception raised by a caller's callback, which must not trigger a fallback.
+    """
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+class _Attempt:
+    def __init__(self, facade: LLMFacade, initial_messages_count: int):
+        self.facade = facade
+        self.initial_messages_count = initial_messages_count
+        self.started = time.monotonic()
+
+
+class LLMRouter:
+    """
+    Drop-in replacement for LLMFacade that routes the calls of one conversation to an ordered
+    chain of facades (e.g. Sonnet -> GPT-4.1 -> a local Ollama model):
+    - if a model fails or exceeds the timeout, the next model in the chain is called
+    - optionally, if the first model has not answered within its live p95 latency, a hedged
+      duplicate request is sent to the next model and the first answer wins
+
+    The conversation is kept by the router, so that every model sees the same history.
+    """
+
+    def __init__(
+        self,
+        facades: list[LLMFacade],
+        timeout: float | None = None,
+        hedge: bool = False,
+        hedge_percentile: float = 95,
+        hedge_min_samples: int = 20,
+        default_hedge_delay: float | None = None,
+    ):
+        """
+        Args:
+            facades: The facades in order of preference (at least one).
+            timeout: Seconds after which a call is abandoned and the next model is called.
+            hedge: Whether to send hedged requests for call().
+            hedge_percentile: The latency percentile of the model after which to hedge.
+            hedge_min_samples: The number of observed latencies needed to use the percentile.
+            default_hedge_delay: Seconds after which to hedge while there are not enough
+                observations (no hedging if None).
+        """
+        if not facades:
+            raise ValueError("At least one LLM facade is required")
+
+        self.facades = facades
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.default_hedge_delay = default_hedge_delay
+        # User and assistant messages of the conversation, without provider-specific
+        # initial messages
+        self.turns: list[dict[str, Any]] = []
+
+    @property
+    def model(self) -> str:
+        return self.facades[0].model
+
+    @property
+    def output_mode(self) -> OutputMode:
+        return self.facades[0].output_mode
+
+    def call(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.3,
+        structured_output: BaseModel | None = None,
+        images: list[MessageImage] | None = None,
+    ) -> str | dict[str, Any]:
+        """
+        Call the first available model with the given prompt (see LLMFacade.call).
+        Raises:
+            AllModelsFailedError: If every model in the chain failed or timed out.
+        """
+        return self._route(
+            lambda facade: facade.call(
+                prompt, max_tokens, temperature, structured_output, images
+            ),
+            hedge=self.hedge,
+        )
+
+    def stream_json(
+        self,
+        prompt: str,
+        array_key: str = "process",
+        on_item: Callable[[Any], None] | None = None,
+        max_tokens: int = 2000,
+        temperature: float = 0.3,
+        images: list[MessageImage] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Stream a JSON response from the first available model (see LLMFacade.stream_json).
+        Exceptions raised by on_item abort the generation and are propagated without
+        falling back to the next model.
+        """
+
+        def checked_on_item(item: Any) -> None:
+            if on_item is None:
+                return
+            try:
+                on_item(item)
+            except Exception as e:
+                raise _CallbackError(e) from e
+
+        try:
+            return self._route(
+                lambda facade: facade.stream_json(
+                    prompt, array_key, checked_on_item, max_tokens, temperature, images
+                ),
+                hedge=False,
+            )
+        except _CallbackError as e:
+            raise e.error
+
+    def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 2000,
+        temperature: float = 0.3,
+        images: list[MessageImage] | None = None,
+    ) -> Generator[str, None, None]:
+        """
+        Stream a text response (see LLMFacade.stream). Falls back to the next model only if
+        a model fails before it has sent anything.
+        """
+        errors: list[tuple[str, Exception]] = []
+        for facade in self.facades:
+            attempt = self._start_attempt(facade)
+            chunks = attempt.facade.stream(prompt, max_tokens, temperature, images)
+            parts: list[str] = []
+            try:
+                for chunk in chunks:
+                    parts.append(chunk)
+                    yield chunk
+            except Exception as e:
+                if parts:
+                    raise
+                self._record_failure(facade.model, e, errors)
+                continue
+            attempt.facade.messages.append(
+                {"role": "assistant", "content": "".join(parts)}
+            )
+            self._adopt(attempt)
+            return
+        raise AllModelsFailedError(errors)
+
+    def _route(self, run: Callable[[LLMFacade], Any], hedge: bool) -> Any:
+        errors: list[tuple[str, Exception]] = []
+        pending: dict[Future, _Attempt] = {}
+        next_index = 0
+        hedged = False
+
+        def start_next() -> None:
+            nonlocal next_index
+            attempt = self._start_attempt(self.facades[next_index])
+            next_index += 1
+            # The context (e.g. the request ID of the logs) is propagated to the worker
+            pending[
+                _executor.submit(contextvars.copy_context().run, run, attempt.facade)
+            ] = attempt
+
+        start_next()
+
+        while pending:
+            now = time.monotonic()
+            deadlines = []
+            if self.timeout is not None:
+                deadlines += [attempt.started + self.timeout for attempt in pending.values()]
+
+            hedge_at = None
+            if hedge and not hedged and len(pending) == 1 and next_index < len(self.facades):
+                primary = next(iter(pending.values()))
+                hedge_delay = self._hedge_delay(primary.facade.model)
+                if hedge_delay is not None:
+                    hedge_at = primary.started + hedge_delay
+                    deadlines.append(hedge_at)
+
+            wait_timeout = max(0.0, min(deadlines) - now) if deadlines else None
+            done, _ = wait(list(pending), timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                attempt = pending.pop(future)
+                model = attempt.facade.model
+                try:
+                    result = future.result()
+                except _CallbackError:
+                    self._adopt(attempt)
+                    self._abandon(pending)
+                    raise
+                except Exception as e:
+                    self._record_failure(model, e, errors)
+                    continue
+
+                self._adopt(attempt)
+                self._abandon(pending)
+                if model != self.model:
+                    metrics.counter(
+                        "llm_router_fallback_successes_total",
+                        "Calls answered by a model other than the preferred one",
+                    ).inc(model=model)
+                return result
+
+            now = time.monotonic()
+            if self.timeout is not None:
+                for future, attempt in list(pending.items()):
+                    if now - attempt.started >= self.timeout:
+                        del pending[future]
+                        future.cancel()
+                        self._record_failure(
+                            attempt.facade.model,
+                            TimeoutError(f"No response within {self.timeout}s"),
+                            errors,
+                        )
+
+            if hedge_at is not None and now >= hedge_at and pending:
+                hedged = True
+                logger.info(
+                    f"Sending hedged request to {self.facades[next_index].model} "
+                    f"after {now - next(iter(pending.values())).started:.1f}s"
+                )
+                metrics.counter("llm_router_hedges_total", "Hedged LLM requests").inc(
+                    model=self.facades[next_index].model
+                )
+                start_next()
+
+            if not pending and next_index < len(self.facades):
+                start_next()
+
+        raise AllModelsFailedError(errors)
+
+    def _start_attempt(self, facade: LLMFacade) -> _Attempt:
+        """
+        Prepare a copy of the facade with the conversation of the router, so that
+        concurrent attempts do not share their messages.
+        """
+        attempt_facade = copy.copy(facade)
+        initial_messages = facade.provider.get_initial_messages()
+        attempt_facade.messages = [*initial_messages, *self.turns]
+        return _Attempt(attempt_facade, len(initial_messages))
+
+    def _adopt(self, attempt: _Attempt) -> None:
+        """
+        Continue the conversation with the messages of the given attempt.
+        """
+        self.turns = attempt.facade.messages[attempt.initial_messages_count :]
+
+    def _hedge_delay(self, model: str) -> float | None:
+        latencies = metrics.histogram("llm_call_latency_seconds")
+        if latencies.count(model=model) >= self.hedge_min_samples:
+            return latencies.percentile(self.hedge_percentile, model=model)
+        return self.default_hedge_delay
+
+    @staticmethod
+    def _abandon(pending: dict[Future, _Attempt]) -> None:
+        # Running calls cannot be interrupted; their results are ignored
+        for future in pending:
+            future.cancel()
+        pending.clear()
+
+    @staticmethod
+    def _record_failure(
+        model: str, error: Exception, errors: list[tuple[str, Exception]]
+    ) -> None:
+        logger.warning(f"LLM call to {model} failed: {error}")
+        metrics.counter("llm_router_failures_total", "Failed or timed out routed calls").inc(
+            model=model, reason=type(error).__name__
+        )
+        errors.append((model, error))
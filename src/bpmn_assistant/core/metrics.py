@@ -0,0 +1,229 @@
+import threading
+from collections import deque
+from typing import Optional
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _label_dict(key: LabelKey) -> dict[str, str]:
+    return dict(key)
+
+
+class Counter:
+    """
+    Monotonically increasing count, optionally split by labels.
+    """
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            values = [
+                {"labels": _label_dict(key), "value": value}
+                for key, value in self._values.items()
+            ]
+        return {"type": "counter", "description": self.description, "values": values}
+
+
+class Gauge:
+    """
+    Value that can go up and down (e.g. the number of queued requests).
+    """
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            values = [
+                {"labels": _label_dict(key), "value": value}
+                for key, value in self._values.items()
+            ]
+        return {"type": "gauge", "description": self.description, "values": values}
+
+
+class _HistogramSeries:
+    def __init__(self, window: int):
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        # Most recent observations, used for percentiles
+        self.recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.recent.append(value)
+
+
+class Histogram:
+    """
+    Distribution of observed values (e.g. latencies or attempts), optionally split by labels.
+    Count, sum, min and max cover all observations; percentiles are computed over a window
+    of the most recent observations.
+    """
+
+    def __init__(self, name: str, description: str = "", window: int = 1024):
+        self.name = name
+        self.description = description
+        self.window = window
+        self._series: dict[LabelKey, _HistogramSeries] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(self.window)
+            series.observe(value)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(_label_key(labels))
+        return series.count if series else 0
+
+    def mean(self, **labels: str) -> Optional[float]:
+        series = self._series.get(_label_key(labels))
+        if not series or not series.count:
+            return None
+        return series.sum / series.count
+
+    def percentile(self, q: float, **labels: str) -> Optional[float]:
+        """
+        Get the q-th percentile (0-100) of the recent observations, or None if there are none.
+        """
+        series = self._series.get(_label_key(labels))
+        if not series:
+            return None
+        with self._lock:
+            values = sorted(series.recent)
+        if not values:
+            return None
+        rank = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+        return values[rank]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> dict:
+        values = []
+        with self._lock:
+            keys = list(self._series)
+        for key in keys:
+            series = self._series[key]
+            labels = _label_dict(key)
+            values.append(
+                {
+                    "labels": labels,
+                    "count": series.count,
+                    "sum": series.sum,
+                    "mean": self.mean(**labels),
+                    "min": series.min,
+                    "max": series.max,
+                    "p50": self.percentile(50, **labels),
+                    "p95": self.percentile(95, **labels),
+                    "p99": self.percentile(99, **labels),
+                }
+            )
+        return {"type": "histogram", "description": self.description, "values": values}
+
+
+class MetricsRegistry:
+    """
+    In-process registry of named metrics. Metrics are created on first use, so modules can
+    declare them at import time without coordinating.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(name, Counter, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(name, Gauge, description)
+
+    def histogram(self, name: str, description: str = "", window: int = 1024) -> Histogram:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, description, window)
+        if not isinstance(metric, Histogram):
+            raise ValueError(f"Metric {name} is already registered as a {type(metric).__name__}")
+        return metric
+
+    def snapshot(self) -> dict:
+        """
+        Get the current values of all metrics (JSON serializable).
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {name: metric.snapshot() for name, metric in sorted(metrics.items())}
+
+    def reset(self) -> None:
+        """
+        Reset the values of all metrics (the metrics stay registered).
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+    def _get_or_create(self, name: str, metric_class: type, description: str):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, description)
+        if not isinstance(metric, metric_class):
+            raise ValueError(f"Metric {name} is already registered as a {type(metric).__name__}")
+        return metric
+
+
+metrics = MetricsRegistry()
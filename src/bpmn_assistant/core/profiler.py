@@ -0,0 +1,224 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter as FrameCounter
+from typing import Any, Optional
+
+from bpmn_assistant.config import logger
+
+APP_PACKAGE = "bpmn_assistant"
+
+# Leaf frames of threads that are blocked waiting for work (event loop, thread pools,
+# locks). Without them, the idle workers would dominate the profile.
+_IDLE_FRAMES = frozenset(
+    {
+        ("selectors.py", "select"),
+        ("threading.py", "wait"),
+        ("threading.py", "_wait_for_tstate_lock"),
+        ("queue.py", "get"),
+        ("handlers.py", "dequeue"),
+        ("thread.py", "_worker"),
+        ("connection.py", "_recv"),
+        ("socket.py", "accept"),
+    }
+)
+
+# A frame of a stack: (name, file, first line of the function, whether it is app code)
+Frame = tuple[str, str, int, bool]
+
+
+class Profile:
+    """
+    The stacks sampled by a SamplingProfiler, with the number of samples of each.
+    """
+
+    def __init__(
+        self, stacks: FrameCounter, interval: float, duration: float, samples: int
+    ):
+        self.stacks = stacks  # root-first tuples of frames -> number of samples
+        self.interval = interval
+        self.duration = duration
+        self.samples = samples  # number of times the threads were sampled
+
+    def __repr__(self):
+        return (
+            f"Profile(stacks={len(self.stacks)}, samples={self.samples}, "
+            f"duration={self.duration:.2f})"
+        )
+
+    def to_dict(self):
+        return {
+            "interval": self.interval,
+            "duration": self.duration,
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+        }
+
+    def to_collapsed(self) -> str:
+        """
+        Format the profile as collapsed stacks ("frame;frame;frame count" lines), the input
+        of flamegraph.pl, speedscope and most flame graph viewers. The frames of the
+        application are annotated with "_[j]", which flamegraph.pl --color=java renders
+        in green.
+        """
+        lines = []
+        for stack, count in self.stacks.most_common():
+            names = [
+                f"{name}_[j]" if is_app else name for name, _, _, is_app in stack
+            ]
+            lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def to_speedscope(self, name: str = "bpmn-assistant") -> dict[str, Any]:
+        """
+        Format the profile as a speedscope "sampled" profile (https://www.speedscope.app).
+        The frames are named after their module, so that searching for "bpmn_assistant"
+        highlights the frames of the application.
+        """
+        frames: list[dict[str, Any]] = []
+        frame_indexes: dict[Frame, int] = {}
+        samples = []
+        weights = []
+        for stack, count in self.stacks.most_common():
+            sample = []
+            for frame in stack:
+                if frame not in frame_indexes:
+                    frame_indexes[frame] = len(frames)
+                    frame_name, file, line, _ = frame
+                    frames.append({"name": frame_name, "file": file, "line": line})
+                sample.append(frame_indexes[frame])
+            samples.append(sample)
+            weights.append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": APP_PACKAGE,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler of all the threads of the process. A background thread samples the
+    stacks of the other threads (sys._current_frames) at a fixed interval, so the profiled
+    code is not instrumented and the overhead stays low enough for live workers. The samples
+    measure wall-clock time: code that waits (e.g. for an LLM response) is sampled too.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        include_idle: bool = False,
+        app_package: str = APP_PACKAGE,
+    ):
+        """
+        Args:
+            interval: The number of seconds between two samples.
+            include_idle: Whether to keep the stacks of the threads that wait for work.
+            app_package: The package whose frames are highlighted.
+        """
+        if interval <= 0:
+            raise ValueError("The sampling interval must be positive")
+
+        self.interval = interval
+        self.include_idle = include_idle
+        self.app_package = app_package
+
+    def __repr__(self):
+        return f"SamplingProfiler(interval={self.interval}, include_idle={self.include_idle})"
+
+    def run(self, duration: float) -> Profile:
+        """
+        Sample the threads for a number of seconds. Blocks until the profile is complete.
+        Args:
+            duration: The number of seconds to profile.
+        Returns:
+            The profile.
+        """
+        stacks: FrameCounter = FrameCounter()
+        samples = 0
+        own_thread = threading.get_ident()
+        start = time.perf_counter()
+        deadline = start + duration
+        next_sample = start
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now < next_sample:
+                time.sleep(next_sample - now)
+            next_sample += self.interval
+
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                if not self.include_idle and _is_idle(frame):
+                    continue
+                stack = self._get_stack(frame)
+                thread_name = thread_names.get(thread_id, f"Thread-{thread_id}")
+                stacks[((thread_name, "", 0, False), *stack)] += 1
+            samples += 1
+
+        duration = time.perf_counter() - start
+        logger.info(
+            f"Profiled the process for {duration:.1f}s ({samples} samples, "
+            f"{len(stacks)} distinct stacks)"
+        )
+        return Profile(stacks, self.interval, duration, samples)
+
+    def _get_stack(self, frame) -> tuple[Frame, ...]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "")
+            is_app = module == self.app_package or module.startswith(f"{self.app_package}.")
+            stack.append(
+                (f"{module}:{code.co_qualname}", code.co_filename, code.co_firstlineno, is_app)
+            )
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES
+
+
+_profile_lock = threading.Lock()
+
+
+def profile_process(
+    duration: float, interval: float = 0.01, include_idle: bool = False
+) -> Optional[Profile]:
+    """
+    Profile the process, unless another profile is already running (the samples of two
+    concurrent profilers would include each other).
+    Args:
+        duration: The number of seconds to profile.
+        interval: The number of seconds between two samples.
+        include_idle: Whether to keep the stacks of the threads that wait for work.
+    Returns:
+        The profile, or None if another profile is running.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return None
+    try:
+        return SamplingProfiler(interval, include_idle).run(duration)
+    finally:
+        _profile_lock.release()
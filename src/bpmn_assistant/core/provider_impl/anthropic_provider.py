@@ -2,12 +2,13 @@ import json
 from typing import Any, Generator
 
 from anthropic import Anthropic
-from anthropic.types import TextBlock
+from anthropic.types import TextBlock, ToolUseBlock
 from pydantic import BaseModel
 
 from bpmn_assistant.config import logger
 from bpmn_assistant.core.enums import AnthropicModels, OutputMode
-from bpmn_assistant.core.llm_provider import LLMProvider
+from bpmn_assistant.core.llm_provider import LLMProvider, LLMResponse
+from bpmn_assistant.core.structured_output import get_structured_output_schema
 
 
 class AnthropicProvider(LLMProvider):
@@ -22,10 +23,15 @@ class AnthropicProvider(LLMProvider):
         max_tokens: int,
         temperature: float,
         structured_output: BaseModel | None = None,
-    ) -> str | dict[str, Any]:
+    ) -> LLMResponse:
         """
         Implementation of the Anthropic API call.
         """
+        if self.output_mode == OutputMode.JSON and structured_output is not None:
+            return self._call_with_schema(
+                model, messages, max_tokens, temperature, structured_output
+            )
+
         if self.output_mode == OutputMode.JSON:
             # We add "{" to constrain the model to output a JSON object
             messages.append({"role": "assistant", "content": "{"})
@@ -51,7 +57,7 @@ class AnthropicProvider(LLMProvider):
             # Add "{" back to the raw output to make it a valid JSON object
             raw_output = "{" + raw_output
 
-            return self._process_response(raw_output)
+            return LLMResponse(self._process_response(raw_output), _get_usage(response))
         else:
             response = self.client.messages.create(
                 model=model,
@@ -67,7 +73,45 @@ class AnthropicProvider(LLMProvider):
 
             raw_output = content.text
 
-            return self._process_response(raw_output)
+            return LLMResponse(self._process_response(raw_output), _get_usage(response))
+
+    def _call_with_schema(
+        self,
+        model: str,
+        messages: list[dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        structured_output: BaseModel,
+    ) -> LLMResponse:
+        """
+        Call the model with a forced tool call whose input schema is the structured output
+        schema, so that the response is constrained to the schema.
+        """
+        schema = get_structured_output_schema(structured_output)
+
+        response = self.client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system="You are a helpful assistant designed to output JSON.",
+            messages=messages,  # type: ignore[arg-type]
+            tools=[
+                {
+                    "name": schema.name,
+                    "description": "Output the response in the required JSON structure.",
+                    "input_schema": schema.json_schema,
+                }
+            ],
+            tool_choice={"type": "tool", "name": schema.name},
+        )
+
+        tool_use = next(
+            (block for block in response.content if isinstance(block, ToolUseBlock)), None
+        )
+        if tool_use is None or not isinstance(tool_use.input, dict):
+            raise ValueError(f"Invalid response from Anthropic: {response.content}")
+
+        return LLMResponse(schema.parse(tool_use.input), _get_usage(response))
 
     def stream(
         self,
@@ -79,6 +123,23 @@ class AnthropicProvider(LLMProvider):
         """
         Implementation of the Anthropic API stream.
         """
+        if self.output_mode == OutputMode.JSON:
+            # As in call(), "{" is prefilled to constrain the model to output a JSON object.
+            # The prefill is not added to the conversation, which is managed by the caller.
+            response = self.client.messages.stream(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system="You are a helpful assistant designed to output JSON.",
+                messages=[*messages, {"role": "assistant", "content": "{"}],  # type: ignore[arg-type]
+            )
+
+            with response as stream:
+                yield "{"
+                for text in stream.text_stream:
+                    yield text
+            return
+
         response = self.client.messages.stream(
             model=model,
             max_tokens=max_tokens,
@@ -118,3 +179,10 @@ class AnthropicProvider(LLMProvider):
             return raw_output
         else:
             raise ValueError(f"Unsupported output mode: {self.output_mode}")
+
+
+def _get_usage(response) -> dict[str, int] | None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return {"prompt_tokens": usage.input_tokens, "completion_tokens": usage.output_tokens}
@@ -20,7 +20,8 @@ from bpmn_assistant.core.enums.models import (
     OpenAIModels,
 )
 from bpmn_assistant.core.enums.output_modes import OutputMode
-from bpmn_assistant.core.llm_provider import LLMProvider
+from bpmn_assistant.core.llm_provider import LLMProvider, LLMResponse
+from bpmn_assistant.core.structured_output import get_structured_output_schema
 
 # make sure we select the right provider in litellm_core_utils/get_llm_provider_logic.py
 #  add ollama provided models on localhost to list of known models
@@ -35,7 +36,7 @@ for mod in model_list:
 #litellm.ollama_models.append('granite4')
 #litellm.model_list.append('ollama')
 litellm.model_list_set = set(litellm.model_list)
-print('OLLAMA MODELS', litellm.ollama_models)
+logger.debug(f"Ollama models: {litellm.ollama_models}")
 
 
 
@@ -50,6 +51,10 @@ class LiteLLMProvider(LLMProvider):
         """Check if the given model is an OpenAI model."""
         return model in [m.value for m in OpenAIModels]
 
+    def _supports_json_schema(self, model: str) -> bool:
+        """Check if the given model supports JSON Schema constrained output."""
+        return self._is_openai_model(model) or model.startswith("ollama")
+
     def _validate_vision_support(self, model: str, messages: list[dict[str, Any]]) -> None:
         """
         Validate that only vision-supported models receive image content.
@@ -74,7 +79,7 @@ class LiteLLMProvider(LLMProvider):
         max_tokens: int,
         temperature: float,
         structured_output: BaseModel | None = None,
-    ) -> str | dict[str, Any]:
+    ) -> LLMResponse:
         self._validate_vision_support(model, messages)
 
         params: dict[str, Any] = {
@@ -90,7 +95,19 @@ class LiteLLMProvider(LLMProvider):
             params['api_key'] = 'sk-1234'
             logger.info("Using ollama model " + str(model))
 
-        if structured_output is not None or self.output_mode == OutputMode.JSON:
+        schema = None
+        if structured_output is not None and self._supports_json_schema(model):
+            # Schema-constrained decoding (mapped to 'format' for Ollama by litellm)
+            schema = get_structured_output_schema(structured_output)
+            params["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": schema.name,
+                    "schema": schema.strict_json_schema or schema.json_schema,
+                    "strict": schema.is_strict,
+                },
+            }
+        elif structured_output is not None or self.output_mode == OutputMode.JSON:
             params["response_format"] = {"type": "json_object"}
 
         params["max_tokens"] = max_tokens
@@ -107,6 +124,7 @@ class LiteLLMProvider(LLMProvider):
 
         if json_exists is None:
             response = completion(**params)
+            usage = _get_usage(response)
 
             if not response.choices:
                 logger.error(f"Emtpy response from model: {response.choices}")
@@ -115,6 +133,7 @@ class LiteLLMProvider(LLMProvider):
             raw_output = response.choices[0].message.content
         
         else:
+            usage = None
             f = open("json.txt")
             raw_output = f.read()
             f.close()
@@ -141,7 +160,7 @@ class LiteLLMProvider(LLMProvider):
                 ).strip()
 
         # for granite4 and qwen3 settle for the last json in raw output
-        if model.startswith('ollama'):
+        if model.startswith('ollama') and '```json\n' in raw_output:
             raw_output = raw_output[raw_output.rfind('```json\n') + 8:raw_output.rfind('```\n')]
             #print('RETURNED after stripping', raw_output)
 
@@ -154,7 +173,10 @@ class LiteLLMProvider(LLMProvider):
             f.close()
             
 
-        return self._process_response(raw_output)
+        result = self._process_response(raw_output)
+        if schema is not None and isinstance(result, dict):
+            result = schema.parse(result)
+        return LLMResponse(result, usage)
 
     def stream(
         self,
@@ -177,6 +199,9 @@ class LiteLLMProvider(LLMProvider):
             "stream": True
         }
 
+        if self.output_mode == OutputMode.JSON:
+            params["response_format"] = {"type": "json_object"}
+
         #print('STREAM', model)
         if model.startswith('ollama'):
             params['api_base'] = 'http://0.0.0.0:11434'
@@ -277,3 +302,13 @@ class LiteLLMProvider(LLMProvider):
             return raw_output
         else:
             raise ValueError(f"Unsupported output mode: {self.output_mode}")
+
+
+def _get_usage(response) -> dict[str, int] | None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+    }
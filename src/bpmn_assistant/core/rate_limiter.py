@@ -0,0 +1,330 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Generator, Optional, TypeVar
+
+from bpmn_assistant.config import logger
+from bpmn_assistant.core.metrics import metrics
+
+T = TypeVar("T")
+
+# Status codes of responses that ask the client to slow down (429: rate limit,
+# 503/529: provider overloaded)
+_RATE_LIMIT_STATUS_CODES = frozenset({429, 503, 529})
+
+# Rough number of characters per token, used to estimate the size of a request
+_CHARS_PER_TOKEN = 4
+
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously at a rate per minute. A reservation may exceed
+    the available tokens: the bucket goes into debt and the caller waits until the debt is
+    repaid, so that waiting callers are served in order and a single large request (e.g.
+    more tokens than the per-minute limit) is still possible.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            rate_per_minute: The number of tokens added per minute.
+            capacity: The maximum number of tokens (defaults to one minute worth of tokens).
+            clock: The monotonic clock, in seconds.
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("The rate must be positive")
+
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"TokenBucket(rate_per_minute={self.rate * 60}, capacity={self.capacity})"
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens from the bucket.
+        Args:
+            amount: The number of tokens.
+        Returns:
+            The number of seconds to wait before the tokens may be used.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """
+    Client-side rate limiter for the calls made with one provider API key:
+    - request and token budgets per minute (token buckets)
+    - a bounded number of concurrent calls
+    - calls rejected with a rate limit status are retried after the provider's Retry-After
+      delay, or after an exponential backoff with full jitter; all callers sharing the
+      limiter pause until then, so that the provider is not hit by a retry storm
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 16,
+        max_retries: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            name: The name used as the metric label (e.g. the provider).
+            requests_per_minute: The maximum number of requests per minute (no limit if None).
+            tokens_per_minute: The maximum number of tokens per minute (no limit if None).
+            max_concurrency: The maximum number of concurrent calls.
+            max_retries: The maximum number of retries of a rate limited call.
+            base_delay: The initial backoff delay in seconds.
+            max_delay: The maximum backoff delay in seconds.
+            clock: The monotonic clock, in seconds.
+            sleep: The function used to wait.
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._request_bucket = (
+            TokenBucket(requests_per_minute, clock=clock) if requests_per_minute else None
+        )
+        self._token_bucket = (
+            TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute else None
+        )
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f"RateLimiter(name={self.name}, requests={self._request_bucket}, "
+            f"tokens={self._token_bucket}, max_concurrency={self.max_concurrency})"
+        )
+
+    def call(self, fn: Callable[[], T], tokens: int = 0) -> T:
+        """
+        Call fn within the limits, retrying it if it is rate limited.
+        Args:
+            fn: The function that calls the provider.
+            tokens: The estimated number of tokens of the request.
+        Returns:
+            The result of fn.
+        """
+        retries = 0
+        while True:
+            self._acquire(tokens)
+            try:
+                return fn()
+            except Exception as e:
+                if not is_rate_limit_error(e) or retries >= self.max_retries:
+                    raise
+                retries += 1
+                self._back_off(e, retries)
+            finally:
+                self._semaphore.release()
+
+    def stream(
+        self, fn: Callable[[], Generator[str, None, None]], tokens: int = 0
+    ) -> Generator[str, None, None]:
+        """
+        Stream the chunks of fn within the limits. The concurrency slot is held until the
+        stream is exhausted or closed. The stream is retried if it is rate limited before
+        its first chunk.
+        Args:
+            fn: The function that starts the provider stream.
+            tokens: The estimated number of tokens of the request.
+        """
+        retries = 0
+        while True:
+            self._acquire(tokens)
+            started = False
+            chunks = None
+            try:
+                chunks = fn()
+                for chunk in chunks:
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or not is_rate_limit_error(e) or retries >= self.max_retries:
+                    raise
+                retries += 1
+                self._back_off(e, retries)
+            finally:
+                if chunks is not None and hasattr(chunks, "close"):
+                    chunks.close()
+                self._semaphore.release()
+
+    def _acquire(self, tokens: int) -> None:
+        queue_depth = metrics.gauge(
+            "llm_rate_limiter_queue_depth", "LLM calls waiting for the rate limiter"
+        )
+        queue_depth.inc(provider=self.name)
+        start = self._clock()
+        try:
+            delay = self._reserve(tokens)
+            if delay > 0:
+                logger.info(f"Rate limiter {self.name}: waiting {delay:.1f}s")
+                self._sleep(delay)
+            self._semaphore.acquire()
+        finally:
+            queue_depth.dec(provider=self.name)
+        metrics.histogram(
+            "llm_rate_limiter_wait_seconds", "Time spent waiting for the rate limiter"
+        ).observe(self._clock() - start, provider=self.name)
+
+    def _reserve(self, tokens: int) -> float:
+        delays = [self._paused_until - self._clock()]
+        if self._request_bucket is not None:
+            delays.append(self._request_bucket.reserve(1))
+        if self._token_bucket is not None and tokens:
+            delays.append(self._token_bucket.reserve(tokens))
+        return max(0.0, *delays)
+
+    def _back_off(self, error: Exception, retries: int) -> None:
+        retry_after = get_retry_after(error)
+        delay = (
+            min(retry_after, self.max_delay)
+            if retry_after is not None
+            else backoff_delay(retries, self.base_delay, self.max_delay)
+        )
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + delay)
+
+        metrics.counter(
+            "llm_rate_limited_total", "LLM calls rejected by the provider's rate limit"
+        ).inc(provider=self.name)
+        logger.warning(
+            f"Rate limited by {self.name} (retry {retries}/{self.max_retries} "
+            f"in {delay:.1f}s): {error}"
+        )
+
+
+_limiters: dict[tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, api_key: str) -> RateLimiter:
+    """
+    Get the rate limiter shared by all calls with the given provider and API key.
+    The limits are configured with the environment variables BPMN_LLM_RPM, BPMN_LLM_TPM,
+    BPMN_LLM_MAX_CONCURRENCY and BPMN_LLM_MAX_RETRIES, which may be overridden per provider
+    by adding the provider as suffix (e.g. BPMN_LLM_TPM_OPENAI).
+    Args:
+        provider: The provider (e.g. "openai").
+        api_key: The API key of the calls. Only its hash is kept.
+    Returns:
+        The rate limiter.
+    """
+    key = (provider, hashlib.sha256(api_key.encode()).hexdigest())
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(
+                provider,
+                requests_per_minute=_get_limit("BPMN_LLM_RPM", provider),
+                tokens_per_minute=_get_limit("BPMN_LLM_TPM", provider),
+                max_concurrency=int(_get_limit("BPMN_LLM_MAX_CONCURRENCY", provider) or 16),
+                max_retries=int(_get_limit("BPMN_LLM_MAX_RETRIES", provider) or 4),
+            )
+            _limiters[key] = limiter
+        return limiter
+
+
+def _get_limit(name: str, provider: str) -> Optional[float]:
+    value = os.getenv(f"{name}_{provider.upper()}") or os.getenv(name)
+    return float(value) if value else None
+
+
+def backoff_delay(attempt: int, base_delay: float = 1.0, max_delay: float = 60.0) -> float:
+    """
+    Exponential backoff with full jitter: a random delay between 0 and
+    base_delay * 2^(attempt - 1), capped at max_delay.
+    Args:
+        attempt: The number of the failed attempt (starting at 1).
+        base_delay: The maximum delay after the first attempt, in seconds.
+        max_delay: The maximum delay, in seconds.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+def estimate_tokens(messages: list[dict[str, Any]], max_tokens: int) -> int:
+    """
+    Estimate the number of tokens that a request counts against the token budget: the
+    prompt tokens and the maximum number of completion tokens, as providers do when they
+    admit a request.
+    """
+    chars = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            chars += sum(len(part.get("text", "")) for part in content if isinstance(part, dict))
+    return chars // _CHARS_PER_TOKEN + max_tokens
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Check whether an error of the provider SDKs (Anthropic, OpenAI/LiteLLM) means that the
+    request was rejected because of a rate limit or overload.
+    """
+    return getattr(error, "status_code", None) in _RATE_LIMIT_STATUS_CODES
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Get the delay in seconds requested by the Retry-After (or retry-after-ms) header of the
+    response of a failed request.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            # HTTP date
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
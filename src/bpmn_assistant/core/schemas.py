@@ -26,6 +26,18 @@ class MessageItem(BaseModel):
     images: Optional[List[MessageImage]] = None
 
 
+class TaskVariable(BaseModel):
+    """
+    Represents a form variable of a BPMN task, used for inter-task communication.
+    - 'readOnly': "yes" or "no"
+    - 'type': one of 'Boolean', 'Integer', 'String', 'Date', 'List'
+    """
+
+    id: str
+    readOnly: Optional[str] = None
+    type: str
+
+
 class BPMNTask(BaseModel):
     """
     Represents a BPMN task.
@@ -35,6 +47,7 @@ class BPMNTask(BaseModel):
     type: TaskType
     id: str
     label: str
+    variables: Optional[List[TaskVariable]] = None
 
 
 EventType = Literal["startEvent", "endEvent", "intermediateThrowEvent", "intermediateCatchEvent"]
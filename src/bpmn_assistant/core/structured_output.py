@@ -0,0 +1,136 @@
+import re
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+# Key of the wrapper property for schemas whose root is not an object (e.g. a union),
+# since providers only accept object schemas
+WRAPPER_KEY = "response"
+
+# Keywords that providers with strict schema decoding do not accept
+_UNSUPPORTED_STRICT_KEYWORDS = ("default", "title")
+
+
+class StructuredOutputSchema:
+    """
+    JSON Schema of a pydantic model, in the forms expected by the providers' schema-constrained
+    decoding: a plain schema (Anthropic tool input schema, Ollama format) and, if possible,
+    a strict schema (OpenAI json_schema with strict=True).
+    """
+
+    def __init__(self, output_model: type[BaseModel]):
+        self.name = re.sub(r"[^a-zA-Z0-9_-]", "_", output_model.__name__)[:64]
+
+        schema = output_model.model_json_schema()
+        self.is_wrapped = schema.get("type") != "object"
+        if self.is_wrapped:
+            definitions = schema.pop("$defs", {})
+            schema = {
+                "type": "object",
+                "properties": {WRAPPER_KEY: schema},
+                "required": [WRAPPER_KEY],
+                "$defs": definitions,
+            }
+
+        self.json_schema: dict[str, Any] = schema
+        self.strict_json_schema: Optional[dict[str, Any]] = _to_strict_schema(
+            deepcopy(schema)
+        )
+
+    def __repr__(self):
+        return f"StructuredOutputSchema(name={self.name}, strict={self.is_strict})"
+
+    @property
+    def is_strict(self) -> bool:
+        return self.strict_json_schema is not None
+
+    def parse(self, result: dict[str, Any]) -> dict[str, Any]:
+        """
+        Convert a response that follows the schema to the JSON representation used by the
+        application.
+        Args:
+            result: The parsed response of the model.
+        Returns:
+            The response without the wrapper property (if any) and without null fields,
+            which the strict schema forces the model to output for optional fields.
+        """
+        if self.is_wrapped and isinstance(result, dict) and WRAPPER_KEY in result:
+            result = result[WRAPPER_KEY]
+        if self.is_strict:
+            result = strip_null_fields(result)
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_structured_output_schema(output_model: type[BaseModel]) -> StructuredOutputSchema:
+    """
+    Get the (cached) JSON Schema of a structured output model.
+    """
+    return StructuredOutputSchema(output_model)
+
+
+def strip_null_fields(value: Any) -> Any:
+    """
+    Recursively remove dictionary fields whose value is None.
+    """
+    if isinstance(value, dict):
+        return {key: strip_null_fields(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [strip_null_fields(item) for item in value]
+    return value
+
+
+def _to_strict_schema(schema: Any) -> Optional[Any]:
+    """
+    Convert a schema for strict decoding: every object lists all its properties as required
+    and forbids additional properties. Optional properties without a default become nullable.
+    Returns:
+        The strict schema, or None if the schema contains free-form objects
+        (e.g. Dict[str, Any]), which cannot be expressed in strict mode.
+    """
+    if isinstance(schema, list):
+        items = []
+        for item in schema:
+            converted = _to_strict_schema(item)
+            if converted is None and item is not None:
+                return None
+            items.append(converted)
+        return items
+    if not isinstance(schema, dict):
+        return schema
+
+    for keyword in _UNSUPPORTED_STRICT_KEYWORDS:
+        # "title" may also be a property name, which must be kept
+        if keyword in schema and not isinstance(schema[keyword], dict):
+            del schema[keyword]
+
+    if schema.get("type") == "object":
+        properties = schema.get("properties")
+        if not properties or schema.get("additionalProperties") not in (None, False):
+            return None
+        required = set(schema.get("required", []))
+        for name, property_schema in properties.items():
+            if name in required or property_schema.get("default") is not None:
+                # Fields with a non-null default (e.g. an empty path) are simply required
+                continue
+            if not _is_nullable(property_schema):
+                properties[name] = {"anyOf": [property_schema, {"type": "null"}]}
+        schema["required"] = list(properties)
+        schema["additionalProperties"] = False
+
+    for key, value in list(schema.items()):
+        if isinstance(value, (dict, list)):
+            converted = _to_strict_schema(value)
+            if converted is None:
+                return None
+            schema[key] = converted
+
+    return schema
+
+
+def _is_nullable(schema: dict) -> bool:
+    if schema.get("type") == "null":
+        return True
+    return any(option.get("type") == "null" for option in schema.get("anyOf", []))
@@ -0,0 +1,168 @@
+import contextlib
+import functools
+import os
+from typing import Any, Callable, Iterator, Mapping, Optional, TypeVar
+
+from bpmn_assistant.config import logger
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # Tracing is optional
+    propagate = None
+    trace = None
+
+TRACER_NAME = "bpmn_assistant"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _NoopSpan:
+    """
+    Stands in for a span when OpenTelemetry is not installed.
+    """
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Mapping[str, Any]) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def setup_tracing(
+    exporter: Optional[str] = None, service_name: str = "bpmn-assistant"
+) -> bool:
+    """
+    Configure the export of the spans. Without this (or without OpenTelemetry), the spans
+    are not recorded.
+    Args:
+        exporter: "otlp" (configured with the standard OTEL_EXPORTER_OTLP_* variables),
+            "console", "file" (JSON lines in BPMN_TRACING_FILE, by default
+            logs/traces.jsonl) or "none". Defaults to BPMN_TRACING_EXPORTER ("none").
+        service_name: The name of the service in the traces.
+    Returns:
+        Whether the spans are exported.
+    Raises:
+        ValueError: If the exporter is not supported.
+    """
+    exporter = (exporter or os.getenv("BPMN_TRACING_EXPORTER", "none")).lower()
+    if exporter in ("none", "off", ""):
+        return False
+    if exporter not in ("otlp", "console", "file"):
+        raise ValueError(f"Unsupported tracing exporter: {exporter}")
+
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+        )
+    except ImportError:
+        logger.warning(
+            f"Tracing exporter '{exporter}' is configured, but the OpenTelemetry SDK is "
+            "not installed (pip install opentelemetry-sdk)"
+        )
+        return False
+
+    if exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logger.warning(
+                "The OTLP exporter is not installed "
+                "(pip install opentelemetry-exporter-otlp-proto-http)"
+            )
+            return False
+        span_exporter = OTLPSpanExporter()
+    elif exporter == "file":
+        path = os.getenv("BPMN_TRACING_FILE", os.path.join("logs", "traces.jsonl"))
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        span_exporter = ConsoleSpanExporter(
+            out=open(path, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+    else:
+        span_exporter = ConsoleSpanExporter()
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    # Spans are exported in a background thread, in batches
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    logger.info(f"Tracing enabled with the '{exporter}' exporter")
+    return True
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Trace a block of code in a span, child of the current span. Exceptions are recorded on
+    the span.
+    Args:
+        name: The name of the span.
+        **attributes: The attributes of the span (None values are omitted).
+    Returns:
+        The span, whose attributes can be set while it is active.
+    """
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(name, attributes=_clean(attributes)) as current:
+        yield current
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorator that traces each call of a function in a span.
+    Args:
+        name: The name of the span. Defaults to the qualified name of the function.
+    """
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@contextlib.contextmanager
+def server_span(name: str, headers: Mapping[str, str], **attributes: Any) -> Iterator[Any]:
+    """
+    Trace the handling of a request in a span, continuing the trace of the caller (W3C
+    traceparent header), if any.
+    Args:
+        name: The name of the span.
+        headers: The headers of the request.
+        **attributes: The attributes of the span.
+    """
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(
+        name,
+        context=propagate.extract(headers),
+        kind=trace.SpanKind.SERVER,
+        attributes=_clean(attributes),
+    ) as current:
+        yield current
+
+
+def _clean(attributes: Mapping[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in attributes.items() if value is not None}
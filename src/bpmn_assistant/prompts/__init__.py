@@ -1,3 +1,4 @@
+from .example_library import ExampleLibrary, get_example_library
 from .prompt_template_processor import PromptTemplateProcessor
 
-__all__ = ["PromptTemplateProcessor"]
+__all__ = ["ExampleLibrary", "PromptTemplateProcessor", "get_example_library"]
@@ -0,0 +1,294 @@
+import json
+import os
+import re
+import threading
+from typing import Any, Iterable, Optional
+
+from bpmn_assistant.core.metrics import metrics
+
+EXAMPLES_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "bpmn_examples.jinja2"
+)
+
+_CHARS_PER_TOKEN = 4
+_EXAMPLE_SEPARATOR = re.compile(r"\n-{3,}\n")
+_DESCRIPTION_PATTERN = re.compile(r'Textual description:\s*"(.*?)"', re.DOTALL)
+_JSON_PATTERN = re.compile(r"```json\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_PATTERN = re.compile(r",(\s*[}\]])")
+_WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Phrases of a request that suggest a feature of the process. The features of the
+# examples are extracted from their JSON, so both are matched in the same vocabulary.
+_FEATURE_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "exclusiveGateway": (
+        "if ", "whether", "otherwise", "either", "decide", "decision", "depending",
+        "valid", "approve", "reject", "in case",
+    ),
+    "parallelGateway": (
+        "at the same time", "in parallel", "parallel", "simultaneous", "meanwhile",
+        "concurrently", "while ",
+    ),
+    "inclusiveGateway": (
+        "one or more", "and/or", "any of", "any combination", "inclusive", "optionally",
+    ),
+    "loop": (
+        "again", "repeat", "retry", "go back", "loop", "until", "start over", "redo",
+    ),
+    "nested": ("sub-option", "nested", "followed by another decision", "within"),
+    "timerEventDefinition": (
+        "wait", "timer", "minute", "hour", "day", "week", "midnight", "every ",
+        "schedule", "deadline", "delay",
+    ),
+    "messageEventDefinition": (
+        "message", "notif", "confirmation", "receive", "email", "mail", "signal",
+    ),
+    "userTask": ("user", "form", "fills", "enters", "employee", "customer"),
+    "serviceTask": ("system", "automatic", "service", "api", "sends"),
+    "sendTask": ("send", "sends"),
+    "receiveTask": ("receive", "waits for"),
+    "manualTask": ("manual", "by hand", "physically"),
+    "scriptTask": ("script", "compute", "calculate"),
+    "businessRuleTask": ("rule", "eligib", "policy", "discount"),
+    "endEvent": ("ends with", "rejection", "cancel"),
+}
+
+# Features that shape the whole process count more than task types
+_FEATURE_WEIGHTS = {
+    "exclusiveGateway": 3.0,
+    "parallelGateway": 3.0,
+    "inclusiveGateway": 3.0,
+    "loop": 3.0,
+    "nested": 2.0,
+    "timerEventDefinition": 2.0,
+    "messageEventDefinition": 2.0,
+}
+
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is it of on or the then they this to with".split()
+)
+
+
+class BpmnExample:
+    """
+    A few-shot example: a textual description and its BPMN JSON representation.
+    """
+
+    def __init__(self, text: str, description: str, features: set[str]):
+        self.text = text  # the example as it appears in the prompt
+        self.description = description
+        self.features = features
+        self.words = _words(description)
+        self.tokens = len(text) // _CHARS_PER_TOKEN
+
+    def __repr__(self):
+        return f"BpmnExample(description={self.description[:40]!r}, features={sorted(self.features)})"
+
+    def to_dict(self):
+        return {
+            "description": self.description,
+            "features": sorted(self.features),
+            "tokens": self.tokens,
+        }
+
+
+class ExampleLibrary:
+    """
+    The few-shot examples of the create and edit prompts, indexed by the features of their
+    processes (gateway types, event definitions, task types, loops and nesting). Instead
+    of including every example in every prompt, the examples that cover the most features
+    of a request are selected, within a token budget.
+    """
+
+    def __init__(
+        self,
+        header: str,
+        examples: list[BpmnExample],
+        min_examples: int = 2,
+        max_examples: int = 3,
+        token_budget: int = 1500,
+    ):
+        """
+        Args:
+            header: The introduction of the examples section of the prompt.
+            examples: The examples, in their preferred order.
+            min_examples: The number of examples selected even if they do not cover any
+                further feature of the request.
+            max_examples: The maximum number of examples per prompt.
+            token_budget: The maximum (estimated) number of tokens of the selected
+                examples. The best example is always selected, even if it exceeds it.
+        """
+        if not examples:
+            raise ValueError("The example library is empty")
+
+        self.header = header
+        self.examples = examples
+        self.min_examples = min_examples
+        self.max_examples = max_examples
+        self.token_budget = token_budget
+
+    def __repr__(self):
+        return f"ExampleLibrary(examples={len(self.examples)}, max_examples={self.max_examples})"
+
+    @classmethod
+    def from_file(cls, path: str = EXAMPLES_FILE, **kwargs) -> "ExampleLibrary":
+        """
+        Load the examples of a prompt file, in which the examples follow the header and are
+        separated by "---" lines. Each example has a 'Textual description: "..."' and a
+        JSON code block.
+        """
+        with open(path, encoding="utf-8") as file:
+            content = file.read()
+
+        first = content.index("Textual description:")
+        header = content[:first]
+        examples = []
+        for text in _EXAMPLE_SEPARATOR.split(content[first:]):
+            text = text.strip()
+            description = _DESCRIPTION_PATTERN.search(text)
+            process_json = _JSON_PATTERN.search(text)
+            if not description or not process_json:
+                raise ValueError(f"Invalid example in {path}: {text[:80]!r}")
+            examples.append(
+                BpmnExample(
+                    text,
+                    " ".join(description.group(1).split()),
+                    get_process_features(_parse_lenient_json(process_json.group(1))["process"]),
+                )
+            )
+        return cls(header, examples, **kwargs)
+
+    def select(
+        self, request: str, process: Optional[list[dict[str, Any]]] = None
+    ) -> list[BpmnExample]:
+        """
+        Select the examples that are the most relevant to a request. Each example is
+        scored by the weight of the features of the request it covers and that no
+        previously selected example covers, with the words it shares with the request as
+        a tie-breaker.
+        Args:
+            request: The text of the request (e.g. the message history or change request).
+            process: The current process, whose features are added to those of the request.
+        Returns:
+            The selected examples, in library order.
+        """
+        features = get_request_features(request)
+        if process:
+            features |= get_process_features(process)
+        words = _words(request)
+
+        selected: list[BpmnExample] = []
+        covered: set[str] = set()
+        tokens = 0
+        candidates = list(self.examples)
+        while candidates and len(selected) < self.max_examples:
+            best = max(
+                candidates,
+                key=lambda example: (
+                    sum(_FEATURE_WEIGHTS.get(f, 1.0) for f in (example.features & features) - covered),
+                    len(example.words & words),
+                    -example.tokens,
+                ),
+            )
+            candidates.remove(best)
+            gain = (best.features & features) - covered
+            if len(selected) >= self.min_examples and not gain:
+                break
+            if selected and tokens + best.tokens > self.token_budget:
+                continue
+            selected.append(best)
+            covered |= best.features
+            tokens += best.tokens
+
+        metrics.histogram(
+            "prompt_examples_selected", "Number of few-shot examples per prompt"
+        ).observe(len(selected))
+        return sorted(selected, key=self.examples.index)
+
+    def render(self, request: str, process: Optional[list[dict[str, Any]]] = None) -> str:
+        """
+        Render the examples section of a prompt with the examples selected for a request.
+        """
+        examples = self.select(request, process)
+        return self.header + "\n\n---\n\n".join(example.text for example in examples)
+
+
+def get_request_features(request: str) -> set[str]:
+    """
+    Get the features that a request (in natural language) suggests.
+    """
+    text = request.lower()
+    features = {
+        feature
+        for feature, keywords in _FEATURE_KEYWORDS.items()
+        if any(keyword in text for keyword in keywords)
+    }
+    if len(re.findall(r"\bif\b", text)) > 1:
+        features.add("nested")
+    return features
+
+
+def get_process_features(process: Iterable[dict[str, Any]]) -> set[str]:
+    """
+    Get the features of a process: its element types and event definitions, "loop" if a
+    branch goes back to a previous element, and "nested" if a gateway is in a branch.
+    """
+    features: set[str] = set()
+    seen_ids: set[str] = set()
+
+    def visit(elements: Iterable[dict[str, Any]], depth: int) -> None:
+        for element in elements:
+            element_type = element.get("type")
+            features.add(element_type)
+            if element.get("eventDefinition"):
+                features.add(element["eventDefinition"])
+            if element.get("id"):
+                seen_ids.add(element["id"])
+            if "branches" not in element:
+                continue
+
+            if depth > 0:
+                features.add("nested")
+            for branch in element["branches"]:
+                if isinstance(branch, list):  # parallel gateway
+                    visit(branch, depth + 1)
+                    continue
+                visit(branch.get("path", []), depth + 1)
+                if branch.get("next") in seen_ids:
+                    features.add("loop")
+
+    visit(process, 0)
+    features.discard(None)
+    return features
+
+
+def _parse_lenient_json(text: str) -> Any:
+    # The examples are written for readability and may have trailing commas
+    return json.loads(_TRAILING_COMMA_PATTERN.sub(r"\1", text))
+
+
+def _words(text: str) -> set[str]:
+    return {
+        word
+        for word in _WORD_PATTERN.findall(text.lower())
+        if len(word) > 2 and word not in _STOP_WORDS
+    }
+
+
+_example_library: ExampleLibrary | None = None
+_example_library_lock = threading.Lock()
+
+
+def get_example_library() -> ExampleLibrary:
+    """
+    Get the library of the examples of bpmn_examples.jinja2, loading it on first use.
+    Configured with BPMN_MIN_EXAMPLES, BPMN_MAX_EXAMPLES and BPMN_EXAMPLES_TOKEN_BUDGET.
+    """
+    global _example_library
+    with _example_library_lock:
+        if _example_library is None:
+            _example_library = ExampleLibrary.from_file(
+                min_examples=int(os.getenv("BPMN_MIN_EXAMPLES", "2")),
+                max_examples=int(os.getenv("BPMN_MAX_EXAMPLES", "3")),
+                token_budget=int(os.getenv("BPMN_EXAMPLES_TOKEN_BUDGET", "1500")),
+            )
+        return _example_library
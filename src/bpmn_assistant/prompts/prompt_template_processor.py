@@ -1,22 +1,98 @@
 import os
+import re
+import threading
+import time
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemLoader, meta, select_autoescape
+
+from bpmn_assistant.core.metrics import metrics
+
+PROMPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_INCLUDE_PATTERN = re.compile(r"""{%-?\s*include\s+['"]([^'"]+)['"]\s*-?%}""")
+
+
+class _StaticIncludeLoader(FileSystemLoader):
+    """
+    Inlines the includes of static templates (without any variable or include, such as the
+    BPMN representation and examples) as constant text, so that they are rendered once
+    instead of on every render of the templates that include them.
+    """
+
+    def __init__(self, searchpath: str):
+        super().__init__(searchpath)
+        self._static: dict[str, str | None] = {}  # rendered static templates
+        self._lock = threading.Lock()
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+
+        def inline(match: re.Match) -> str:
+            rendered = self._render_static(environment, match.group(1))
+            if rendered is None:
+                return match.group(0)
+            return "{% raw %}" + rendered + "{% endraw %}"
+
+        return _INCLUDE_PATTERN.sub(inline, source), filename, uptodate
+
+    def _render_static(self, environment: Environment, name: str) -> str | None:
+        with self._lock:
+            if name not in self._static:
+                source = super().get_source(environment, name)[0]
+                ast = environment.parse(source)
+                is_static = (
+                    not meta.find_undeclared_variables(ast)
+                    and not list(meta.find_referenced_templates(ast))
+                    and "{% endraw %}" not in source
+                )
+                self._static[name] = (
+                    environment.from_string(source).render() if is_static else None
+                )
+            return self._static[name]
 
 
 class PromptTemplateProcessor:
-    def __init__(self, prompts_dir=os.path.dirname(os.path.abspath(__file__))):
+    # The environments are shared by all the processors of a directory, so that each
+    # template is read and compiled once per process
+    _environments: dict[str, Environment] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, prompts_dir=PROMPTS_DIR):
         """
         Initialize the template processor with a directory containing prompt templates.
 
         Args:
             prompts_dir (str): Path to the directory containing prompt templates
         """
-        self.env = Environment(
-            loader=FileSystemLoader(prompts_dir),
-            autoescape=select_autoescape(),
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        self.env = self._get_environment(prompts_dir)
+
+    @classmethod
+    def _get_environment(cls, prompts_dir: str) -> Environment:
+        with cls._lock:
+            if prompts_dir not in cls._environments:
+                cls._environments[prompts_dir] = Environment(
+                    loader=_StaticIncludeLoader(prompts_dir),
+                    autoescape=select_autoescape(),
+                    trim_blocks=True,
+                    lstrip_blocks=True,
+                    # The templates are part of the package, so they are not checked for
+                    # changes on every render
+                    auto_reload=False,
+                    cache_size=-1,
+                )
+            return cls._environments[prompts_dir]
+
+    def precompile(self) -> list[str]:
+        """
+        Compile all the templates of the directory, so that no request has to.
+
+        Returns:
+            list[str]: Names of the compiled templates
+        """
+        names = self.env.list_templates(extensions=["jinja2"])
+        for name in names:
+            self.env.get_template(name)
+        return names
 
     def render_template(self, template_name, **kwargs):
         """
@@ -29,8 +105,13 @@ class PromptTemplateProcessor:
         Returns:
             str: Rendered template string
         """
+        start = time.perf_counter()
         template = self.env.get_template(template_name)
-        return template.render(**kwargs)
+        prompt = template.render(**kwargs)
+        metrics.histogram(
+            "prompt_render_seconds", "Duration of the rendering of the prompt templates"
+        ).observe(time.perf_counter() - start, template=template_name)
+        return prompt
 
 
 if __name__ == "__main__":
@@ -3,7 +3,10 @@ from .bpmn_modeling_service import BpmnModelingService
 from .bpmn_process_transformer import BpmnProcessTransformer
 from .bpmn_xml_generator import BpmnXmlGenerator
 from .conversational_service import ConversationalService
+from .conversion_cache import ConversionCache
 from .determine_intent import determine_intent
+from .process_hash import bpmn_xml_hash, canonical_process_json, process_hash
+from .synthetic_process_generator import SyntheticProcessGenerator, generate_process
 
 __all__ = [
     "BpmnJsonGenerator",
@@ -11,5 +14,11 @@ __all__ = [
     "BpmnProcessTransformer",
     "BpmnXmlGenerator",
     "ConversationalService",
+    "ConversionCache",
     "determine_intent",
+    "bpmn_xml_hash",
+    "canonical_process_json",
+    "process_hash",
+    "SyntheticProcessGenerator",
+    "generate_process",
 ]
@@ -0,0 +1,203 @@
+import contextvars
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from bpmn_assistant.config import logger
+from bpmn_assistant.core import LLMFacade, MessageItem
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.services.bpmn_modeling_service import BpmnModelingService
+from bpmn_assistant.services.bpmn_xml_generator import BpmnXmlGenerator
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class BatchResult:
+    """
+    The result of creating the process of one batch item.
+    """
+
+    def __init__(
+        self,
+        id: str,
+        status: str,
+        model: str,
+        duration_seconds: float,
+        bpmn_json: Optional[list] = None,
+        bpmn_xml: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        self.id = id
+        self.status = status  # "succeeded" or "failed"
+        self.model = model
+        self.duration_seconds = duration_seconds
+        self.bpmn_json = bpmn_json
+        self.bpmn_xml = bpmn_xml
+        self.error = error
+
+    def __repr__(self):
+        return f"BatchResult(id={self.id}, status={self.status}, model={self.model})"
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "model": self.model,
+            "duration_seconds": round(self.duration_seconds, 3),
+            "bpmn_json": self.bpmn_json,
+            "bpmn_xml": self.bpmn_xml,
+            "error": self.error,
+        }
+
+
+class BatchGenerator:
+    """
+    Creates the processes of many descriptions concurrently. Items without a model are
+    distributed round-robin over the given models, so that a batch can spread its load
+    over several providers (each of which is throttled by its own rate limiter).
+    """
+
+    def __init__(
+        self,
+        models: list[str],
+        facade_factory: Callable[[str], LLMFacade],
+        max_concurrency: int = 4,
+        modeling_service: Optional[BpmnModelingService] = None,
+        xml_generator: Optional[BpmnXmlGenerator] = None,
+    ):
+        """
+        Args:
+            models: The models used for items that do not specify one.
+            facade_factory: Creates a new LLM facade for a model (one per item, since a
+                facade keeps the conversation).
+            max_concurrency: The maximum number of items processed concurrently.
+            modeling_service: The service that creates the processes.
+            xml_generator: The generator of the BPMN XML of the processes.
+        """
+        if not models:
+            raise ValueError("At least one model is required")
+
+        self.models = models
+        self.facade_factory = facade_factory
+        self.max_concurrency = max_concurrency
+        self.modeling_service = modeling_service or BpmnModelingService()
+        self.xml_generator = xml_generator or BpmnXmlGenerator()
+
+    def run(
+        self, items: Iterable[dict[str, Any]], skip_ids: Iterable[str] = ()
+    ) -> Iterator[BatchResult]:
+        """
+        Create the processes of the items.
+        Args:
+            items: The items, each with a "description", and optionally an "id" and a
+                "model". Items without an ID are identified by their position.
+            skip_ids: The IDs of the items to skip (e.g. those completed before a restart).
+        Returns:
+            The results, in order of completion. At most max_concurrency items are read
+            ahead, so that large inputs are streamed.
+        """
+        skip_ids = set(skip_ids)
+        pending: set[Future] = set()
+        model_index = 0
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="batch"
+        ) as executor:
+            for index, item in enumerate(items):
+                item_id = str(item.get("id", index))
+                if item_id in skip_ids:
+                    continue
+
+                model = item.get("model")
+                if not model:
+                    model = self.models[model_index % len(self.models)]
+                    model_index += 1
+
+                if len(pending) >= self.max_concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+                pending.add(
+                    executor.submit(
+                        # Propagates the context (e.g. the request ID of the logs)
+                        contextvars.copy_context().run,
+                        self._create,
+                        item_id,
+                        model,
+                        item.get("description"),
+                    )
+                )
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def _create(self, item_id: str, model: str, description: Any) -> BatchResult:
+        start = time.perf_counter()
+        try:
+            if not isinstance(description, str) or not description.strip():
+                raise ValueError("The item has no description")
+
+            process = self.modeling_service.create_bpmn(
+                self.facade_factory(model),
+                [MessageItem(role="user", content=description)],
+            )
+            result = BatchResult(
+                item_id,
+                SUCCEEDED,
+                model,
+                time.perf_counter() - start,
+                bpmn_json=process,
+                bpmn_xml=self.xml_generator.create_bpmn_xml(process),
+            )
+        except Exception as e:
+            logger.warning(f"Batch item {item_id} failed: {e}")
+            result = BatchResult(
+                item_id, FAILED, model, time.perf_counter() - start, error=str(e)
+            )
+
+        metrics.counter("batch_items_total", "Processed batch items").inc(
+            status=result.status, model=model
+        )
+        return result
+
+
+def read_jsonl(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """
+    Parse JSON Lines, skipping blank lines.
+    Raises:
+        ValueError: If a line is not a JSON object.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        if not isinstance(item, dict):
+            raise ValueError(f"Line {line_number} is not a JSON object")
+        yield item
+
+
+def read_checkpoint(path: str) -> set[str]:
+    """
+    Get the IDs of the items that succeeded in a previous run that wrote its results to
+    the given JSONL file. Failed items are not included, so that they are retried.
+    A truncated last line (e.g. after a crash) is ignored.
+    """
+    if not os.path.exists(path):
+        return set()
+
+    succeeded: set[str] = set()
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(result, dict) and result.get("status") == SUCCEEDED:
+                succeeded.add(str(result.get("id")))
+    return succeeded
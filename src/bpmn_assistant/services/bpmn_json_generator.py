@@ -1,8 +1,39 @@
+import hashlib
+import os
 import xml.etree.ElementTree as ET
 from collections import deque
-from typing import Any, Callable, Optional
+from concurrent.futures import BrokenExecutor, Executor
+from copy import deepcopy
+from typing import Any, BinaryIO, Callable, Iterator, Optional
 
 from bpmn_assistant.core.enums import BPMNElementType
+from bpmn_assistant.services.conversion_cache import ConversionCache
+from bpmn_assistant.services.process_hash import normalize_bpmn_xml
+
+_SUPPORTED_TAGS = frozenset(element.value for element in BPMNElementType)
+
+_LABELED_ELEMENTS = frozenset(
+    {
+        BPMNElementType.TASK.value,
+        BPMNElementType.USER_TASK.value,
+        BPMNElementType.SERVICE_TASK.value,
+        BPMNElementType.SEND_TASK.value,
+        BPMNElementType.RECEIVE_TASK.value,
+        BPMNElementType.BUSINESS_RULE_TASK.value,
+        BPMNElementType.MANUAL_TASK.value,
+        BPMNElementType.SCRIPT_TASK.value,
+        BPMNElementType.EXCLUSIVE_GATEWAY.value,
+        BPMNElementType.INCLUSIVE_GATEWAY.value,
+        BPMNElementType.START_EVENT.value,
+        BPMNElementType.END_EVENT.value,
+        BPMNElementType.INTERMEDIATE_THROW_EVENT.value,
+        BPMNElementType.INTERMEDIATE_CATCH_EVENT.value,
+    }
+)
+
+_GATEWAYS_WITH_DEFAULT_FLOW = frozenset(
+    {BPMNElementType.INCLUSIVE_GATEWAY.value, BPMNElementType.EXCLUSIVE_GATEWAY.value}
+)
 
 
 class BpmnJsonGenerator:
@@ -10,30 +41,184 @@ class BpmnJsonGenerator:
     Class to generate the JSON representation of a BPMN process from the BPMN XML.
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ConversionCache] = None):
+        """
+        Args:
+            cache: Optional cache of the results of create_bpmn_json, by hash of the
+                normalized XML. On a cache hit, the generator itself is not populated.
+        """
+        self.cache = cache
         self.elements: dict[str, dict[str, Any]] = {}
         self.flows: dict[str, dict[str, Any]] = {}
         self.process: list[dict[str, Any]] = []
+        # Tags of the process children that cannot be converted (e.g. subProcess), by ID
+        self.unsupported_elements: dict[str, str] = {}
 
     def _find_process_element(self, root: ET.Element) -> ET.Element:
+        # The process is normally the root or one of its children, so the (usually much
+        # larger) diagram interchange section does not need to be searched
+        for elem in (root, *root):
+            if _local_name(elem.tag) == "process":
+                return elem
         for elem in root.iter():
             if elem.tag.endswith("process"):
                 return elem
         raise ValueError("No process element found in the BPMN XML")
 
-    def create_bpmn_json(self, bpmn_xml: str) -> list[dict[str, Any]]:
+    def create_bpmn_json(self, bpmn_xml: str | bytes) -> list[dict[str, Any]]:
         """
         Create the JSON representation of the process from the BPMN XML
         Constraints:
             - Supported elements: task, userTask, serviceTask, sendTask, receiveTask, businessRuleTask, manualTask, scriptTask, startEvent, endEvent, intermediateThrowEvent, intermediateCatchEvent, exclusiveGateway, inclusiveGateway, parallelGateway
             - Supported event definitions: timerEventDefinition, messageEventDefinition
             - The process must have only one start event
-            - The process must not contain pools or lanes
+            - Only the first process of a collaboration (pool) is converted (see
+              create_collaboration_json); lanes are ignored
             - Parallel gateways must have a corresponding join gateway
         """
+        if self.cache is not None:
+            normalized = normalize_bpmn_xml(bpmn_xml)
+            key = hashlib.sha256(normalized).hexdigest()
+            process = self.cache.get(key)
+            if process is not None:
+                # The cached process must not be modified by the caller
+                return deepcopy(process)
+
         root = ET.fromstring(bpmn_xml)
         process_element = self._find_process_element(root)
         self._get_elements_and_flows(process_element)
+        process = self._create_process()
+
+        if self.cache is not None:
+            self.cache.put(key, deepcopy(process), len(normalized))
+        return process
+
+    def create_bpmn_json_from_file(
+        self, source: str | os.PathLike | BinaryIO
+    ) -> list[dict[str, Any]]:
+        """
+        Create the JSON representation of the process from a BPMN XML file, with the same
+        constraints as create_bpmn_json. The file is parsed incrementally: only the flow
+        nodes and sequence flows of the first process are kept, everything before them is
+        discarded while it is parsed, and parsing stops at the end of the process, so that
+        the diagram interchange section (most of a large export) is never read.
+        Args:
+            source: The path of the file, or a binary file object.
+        Returns:
+            The JSON representation of the process.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as file:
+                return self.create_bpmn_json_from_file(file)
+
+        for elem in _iter_process_children(source):
+            self._add_element(elem)
+        return self._create_process()
+
+    def create_collaboration_json(
+        self, bpmn_xml: str | bytes, executor: Optional[Executor] = None
+    ) -> dict[str, Any]:
+        """
+        Create the JSON representation of every process of a collaboration (one per pool),
+        with the same constraints per process as create_bpmn_json. A process that cannot be
+        converted does not prevent the conversion of the others.
+        Args:
+            bpmn_xml: The BPMN XML.
+            executor: Optional executor (e.g. a ProcessPoolExecutor) in which the processes
+                are converted in parallel. Without it, they are converted sequentially.
+        Raises:
+            BrokenExecutor: If the executor breaks (e.g. BrokenProcessPool).
+        Returns:
+            A dictionary with:
+            - "participants": by participant ID (or process ID for processes without a
+              participant), the "name", "process_id" and either the "process" (None for
+              pools without a process) or the "error"
+            - "message_flows": the message flows, with the participants they connect
+        """
+        root = ET.fromstring(bpmn_xml)
+        processes = {
+            elem.get("id"): elem
+            for elem in (root, *root)
+            if _local_name(elem.tag) == "process"
+        }
+        if not processes:
+            raise ValueError("No process element found in the BPMN XML")
+
+        participants: dict[str, dict[str, Any]] = {}
+        message_flow_elements: list[ET.Element] = []
+        for collaboration in root:
+            if _local_name(collaboration.tag) != "collaboration":
+                continue
+            for elem in collaboration:
+                tag = _local_name(elem.tag)
+                if tag == "participant":
+                    participants[elem.get("id")] = {
+                        "name": elem.get("name"),
+                        "process_id": elem.get("processRef"),
+                    }
+                elif tag == "messageFlow":
+                    message_flow_elements.append(elem)
+
+        referenced = {participant["process_id"] for participant in participants.values()}
+        for process_id, process in processes.items():
+            if process_id not in referenced:
+                participants[process_id] = {"name": process.get("name"), "process_id": process_id}
+
+        # Convert the processes (in parallel if an executor is given)
+        results: dict[str, Any] = {}
+        for participant_id, participant in participants.items():
+            process = processes.get(participant["process_id"])
+            if process is None:
+                continue
+            if executor is not None:
+                results[participant_id] = executor.submit(
+                    _convert_process_xml, ET.tostring(process)
+                )
+            else:
+                results[participant_id] = _convert_process_element(process)
+
+        # Map every element to its participant, to resolve the ends of the message flows
+        owners: dict[str, str] = {}
+        for participant_id, participant in participants.items():
+            owners[participant_id] = participant_id
+            process = processes.get(participant["process_id"])
+            if process is not None:
+                for elem in process.iter():
+                    if elem.get("id"):
+                        owners[elem.get("id")] = participant_id
+
+        for participant_id, participant in participants.items():
+            participant["process"] = None
+            if participant_id not in results:
+                continue
+            result = results[participant_id]
+            if executor is not None:
+                error = result.exception()
+                if isinstance(error, BrokenExecutor):
+                    # The executor is unusable (e.g. a worker was killed), not the process
+                    raise error
+                result = error or result.result()
+            if isinstance(result, Exception):
+                participant["error"] = str(result)
+            else:
+                participant["process"] = result
+
+        message_flows = []
+        for elem in message_flow_elements:
+            message_flow = {
+                "id": elem.get("id"),
+                "source": elem.get("sourceRef"),
+                "target": elem.get("targetRef"),
+                "source_participant": owners.get(elem.get("sourceRef")),
+                "target_participant": owners.get(elem.get("targetRef")),
+            }
+            if elem.get("name"):
+                message_flow["label"] = elem.get("name")
+            message_flows.append(message_flow)
+
+        return {"participants": participants, "message_flows": message_flows}
+
+    def _create_process(self) -> list[dict[str, Any]]:
         start_events = [
             elem
             for elem in self.elements.values()
@@ -68,7 +253,7 @@ class BpmnJsonGenerator:
 
         visited.add(current_id)
 
-        current_element = self.elements[current_id]
+        current_element = self._get_element(current_id)
 
         handler = self._get_gateway_handler(current_element["type"])
         if handler:
@@ -385,19 +570,35 @@ class BpmnJsonGenerator:
 
     def _is_parallel_gateway(self, gateway_id: str) -> bool:
         return (
-            self.elements[gateway_id]["type"] == BPMNElementType.PARALLEL_GATEWAY.value
+            self._get_element(gateway_id)["type"] == BPMNElementType.PARALLEL_GATEWAY.value
         )
 
     def _is_exclusive_gateway(self, gateway_id: str) -> bool:
         return (
-            self.elements[gateway_id]["type"] == BPMNElementType.EXCLUSIVE_GATEWAY.value
+            self._get_element(gateway_id)["type"] == BPMNElementType.EXCLUSIVE_GATEWAY.value
         )
 
     def _is_inclusive_gateway(self, gateway_id: str) -> bool:
         return (
-            self.elements[gateway_id]["type"] == BPMNElementType.INCLUSIVE_GATEWAY.value
+            self._get_element(gateway_id)["type"] == BPMNElementType.INCLUSIVE_GATEWAY.value
         )
 
+    def _get_element(self, element_id: str) -> dict[str, Any]:
+        """
+        Get a flow node of the process.
+        Raises:
+            ValueError: If the element is not supported or does not exist.
+        """
+        element = self.elements.get(element_id)
+        if element is None:
+            if element_id in self.unsupported_elements:
+                raise ValueError(
+                    f"Unsupported element type: {self.unsupported_elements[element_id]} "
+                    f"({element_id})"
+                )
+            raise ValueError(f"Sequence flow references an unknown element: {element_id}")
+        return element
+
     def _get_outgoing_flows(self, element_id: str) -> list[dict[str, str]]:
         return [flow for flow in self.flows.values() if flow["source"] == element_id]
 
@@ -467,53 +668,103 @@ class BpmnJsonGenerator:
         return handlers.get(element_type)
 
     def _get_elements_and_flows(self, process: ET.Element):
-        labeled_elements = {
-            BPMNElementType.TASK.value,
-            BPMNElementType.USER_TASK.value,
-            BPMNElementType.SERVICE_TASK.value,
-            BPMNElementType.SEND_TASK.value,
-            BPMNElementType.RECEIVE_TASK.value,
-            BPMNElementType.BUSINESS_RULE_TASK.value,
-            BPMNElementType.MANUAL_TASK.value,
-            BPMNElementType.SCRIPT_TASK.value,
-            BPMNElementType.EXCLUSIVE_GATEWAY.value,
-            BPMNElementType.INCLUSIVE_GATEWAY.value,
-            BPMNElementType.START_EVENT.value,
-            BPMNElementType.END_EVENT.value,
-            BPMNElementType.INTERMEDIATE_THROW_EVENT.value,
-            BPMNElementType.INTERMEDIATE_CATCH_EVENT.value,
-        }
-
         for elem in process:
-            tag = elem.tag.split("}")[-1]  # Remove namespace
-            elem_id = elem.get("id")
-
-            if tag in [element.value for element in BPMNElementType]:
-                self.elements[elem_id] = {
-                    "type": tag,
-                    "id": elem_id,
-                }
-                if tag in labeled_elements:
-                    name = elem.get("name")
-                    if name:  # Only add label if name exists and is not empty
-                        self.elements[elem_id]["label"] = name
-
-                # Store default flow for inclusive/exclusive gateways
-                if tag in [BPMNElementType.INCLUSIVE_GATEWAY.value, BPMNElementType.EXCLUSIVE_GATEWAY.value]:
-                    default_flow = elem.get("default")
-                    if default_flow:
-                        self.elements[elem_id]["default_flow"] = default_flow
-
-                # Check for event definitions (timerEventDefinition, messageEventDefinition, etc.)
-                for child in elem:
-                    child_tag = child.tag.split("}")[-1]
-                    if child_tag.endswith("EventDefinition"):
-                        self.elements[elem_id]["eventDefinition"] = child_tag
-                        break
-            elif tag == "sequenceFlow":
-                self.flows[elem_id] = {
-                    "id": elem_id,
-                    "source": elem.get("sourceRef"),
-                    "target": elem.get("targetRef"),
-                    "condition": elem.get("name"),
-                }
+            self._add_element(elem)
+
+    def _add_element(self, elem: ET.Element) -> None:
+        """
+        Add a child of the process element (a flow node or a sequence flow).
+        """
+        tag = _local_name(elem.tag)
+        elem_id = elem.get("id")
+
+        if tag in _SUPPORTED_TAGS:
+            self.elements[elem_id] = {
+                "type": tag,
+                "id": elem_id,
+            }
+            if tag in _LABELED_ELEMENTS:
+                name = elem.get("name")
+                if name:  # Only add label if name exists and is not empty
+                    self.elements[elem_id]["label"] = name
+
+            # Store default flow for inclusive/exclusive gateways
+            if tag in _GATEWAYS_WITH_DEFAULT_FLOW:
+                default_flow = elem.get("default")
+                if default_flow:
+                    self.elements[elem_id]["default_flow"] = default_flow
+
+            # Check for event definitions (timerEventDefinition, messageEventDefinition, etc.)
+            for child in elem:
+                child_tag = _local_name(child.tag)
+                if child_tag.endswith("EventDefinition"):
+                    self.elements[elem_id]["eventDefinition"] = child_tag
+                    break
+        elif tag == "sequenceFlow":
+            self.flows[elem_id] = {
+                "id": elem_id,
+                "source": elem.get("sourceRef"),
+                "target": elem.get("targetRef"),
+                "condition": elem.get("name"),
+            }
+        elif elem_id:
+            self.unsupported_elements[elem_id] = tag
+
+
+def _convert_process_element(process: ET.Element) -> list[dict[str, Any]] | Exception:
+    """
+    Convert a process element with a new generator.
+    Returns:
+        The JSON representation of the process, or the exception raised by the conversion.
+    """
+    generator = BpmnJsonGenerator()
+    try:
+        generator._get_elements_and_flows(process)
+        return generator._create_process()
+    except Exception as e:
+        return e
+
+
+def _convert_process_xml(process_xml: bytes) -> list[dict[str, Any]]:
+    # Module-level, so that it can be run in a process pool
+    return BpmnJsonGenerator().create_bpmn_json(process_xml)
+
+
+def _local_name(tag: str) -> str:
+    return tag.split("}")[-1]  # Remove namespace
+
+
+def _iter_process_children(file: BinaryIO) -> Iterator[ET.Element]:
+    """
+    Parse a BPMN XML document incrementally and yield the complete children of its first
+    process element. Elements are detached from the tree once they have been processed,
+    so that memory use does not grow with the size of the document.
+    Raises:
+        ValueError: If the document has no process element.
+    """
+    stack: list[ET.Element] = []
+    process_depth: Optional[int] = None
+
+    for event, elem in ET.iterparse(file, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if process_depth is None and _local_name(elem.tag) == "process":
+                process_depth = len(stack)
+            continue
+
+        stack.pop()
+        depth = len(stack)
+
+        if process_depth is None:
+            # Before the process (e.g. a collaboration or message definitions)
+            if stack:
+                stack[-1].remove(elem)
+        elif depth < process_depth:
+            # End of the process; the rest of the document is not needed
+            return
+        elif depth == process_depth:
+            yield elem
+            stack[-1].remove(elem)
+
+    if process_depth is None:
+        raise ValueError("No process element found in the BPMN XML")
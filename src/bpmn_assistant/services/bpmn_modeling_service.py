@@ -1,16 +1,20 @@
-import json
+import time
 import traceback
 
-from bpmn_assistant.config import logger
-from bpmn_assistant.core import LLMFacade, MessageItem, MessageImage
-from bpmn_assistant.prompts import PromptTemplateProcessor
+from bpmn_assistant.config import log_payload, logger
+from bpmn_assistant.core import LLMFacade, MessageItem, MessageImage, ProcessModel
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.core.rate_limiter import backoff_delay, is_rate_limit_error
+from bpmn_assistant.core.tracing import traced
+from bpmn_assistant.prompts import PromptTemplateProcessor, get_example_library
 from bpmn_assistant.services.process_editing import (
     BpmnEditingService,
     define_change_request,
 )
 from bpmn_assistant.utils import message_history_to_string
 
-from .validate_bpmn import validate_bpmn
+from .repair_bpmn import get_unrepairable_issues, repair_bpmn
+from .validate_bpmn import BpmnValidationError, validate_bpmn
 
 
 class BpmnModelingService:
@@ -18,9 +22,17 @@ class BpmnModelingService:
     Service for creating and editing BPMN processes.
     """
 
-    def __init__(self):
+    def __init__(self, stream_json: bool = False):
+        """
+        Args:
+            stream_json: Whether to stream the generated processes and validate their elements
+                while they are generated, aborting the generation at the first defect that
+                cannot be repaired locally.
+        """
         self.prompt_processor = PromptTemplateProcessor()
+        self.stream_json = stream_json
 
+    @traced("BpmnModelingService.create_bpmn")
     def create_bpmn(
         self,
         llm_facade: LLMFacade,
@@ -40,9 +52,11 @@ class BpmnModelingService:
         """
 
         logger.info('create_bpmn enter')
+        history = message_history_to_string(message_history)
         prompt = self.prompt_processor.render_template(
             "create_bpmn.jinja2",
-            message_history=message_history_to_string(message_history),
+            message_history=history,
+            examples=get_example_library().render(history),
         )
 
         attempts = 0
@@ -51,24 +65,50 @@ class BpmnModelingService:
         while attempts < max_retries:
             attempts += 1
             try:
-                response = llm_facade.call(prompt, max_tokens=4000, images=images)
-                logger.debug(f"LLM response:\n{json.dumps(response, indent=2)}")
-                process = response["process"]
+                if self.stream_json:
+                    response = self._stream_process(llm_facade, prompt, images)
+                else:
+                    response = llm_facade.call(
+                        prompt,
+                        max_tokens=4000,
+                        structured_output=ProcessModel,
+                        images=images,
+                    )
+                log_payload("LLM response", response)
+                # Fix mechanical defects locally instead of asking the LLM to retry
+                process, _ = repair_bpmn(response["process"])
                 validate_bpmn(process)
-                logger.debug(
-                    f"Generated BPMN process:\n{json.dumps(process, indent=2)}"
-                )
+                log_payload("Generated BPMN process", process)
+                self._observe_attempts(attempts)
                 return process  # Return the process if it's valid
+            except BpmnValidationError as e:
+                last_error = e
+                metrics.counter(
+                    "bpmn_validation_issues_total",
+                    "Validation issues reported back to the LLM",
+                ).inc(len(e.report), operation="create")
+                logger.warning(
+                    f"Validation errors (attempt {attempts}): {e.report.messages}"
+                )
+                # All issues are reported at once, so that they can be fixed in a single retry
+                prompt = self.prompt_processor.render_template(
+                    "fix_validation_errors.jinja2",
+                    subject="BPMN process",
+                    issues=e.report.issues,
+                    instruction="Respond with the complete corrected process in the same JSON format.",
+                )
             except (ValueError, Exception) as e:
                 last_error = e
                 logger.warning(
                     f"Error (attempt {attempts}): {str(e)}\n"
                     f"Traceback: {traceback.format_exc()}"
                 )
-                print(f"Error (attempt {attempts}): {str(e)}\n")
-                print("GOT \n", process)
+                if is_rate_limit_error(e):
+                    # The rate limiter has already retried; do not add to the overload
+                    time.sleep(backoff_delay(attempts))
                 prompt = f"Error: {str(e)}. Try again."
 
+        self._observe_attempts(attempts, outcome="failure")
         message = "Max number of retries reached. Could not create the BPMN process."
         if last_error:
             message += f" Last error from provider: {last_error}"
@@ -76,6 +116,50 @@ class BpmnModelingService:
 
         logger.info('create_bpmn leave')
 
+    @staticmethod
+    def _observe_attempts(attempts: int, outcome: str = "success") -> None:
+        metrics.histogram(
+            "bpmn_create_attempts",
+            "Number of LLM calls needed to create a valid process",
+        ).observe(attempts, outcome=outcome)
+
+    def _stream_process(
+        self,
+        llm_facade: LLMFacade,
+        prompt: str,
+        images: list[MessageImage] | None = None,
+    ) -> dict:
+        """
+        Generate a process with a streamed LLM call, checking every top-level element as soon
+        as it is complete.
+        Raises:
+            BpmnValidationError: As soon as the elements generated so far contain a defect
+                that repair_bpmn cannot fix.
+        """
+        elements: list[dict] = []
+
+        def check_element(element: dict) -> None:
+            elements.append(element)
+            report = get_unrepairable_issues(elements, is_top_level=False)
+            if not report.is_valid:
+                metrics.counter(
+                    "bpmn_stream_aborts_total",
+                    "Streamed generations aborted because of an invalid element",
+                ).inc()
+                logger.info(
+                    f"Aborting generation at element {len(elements)}: {report.messages}"
+                )
+                report.raise_if_invalid()
+
+        return llm_facade.stream_json(
+            prompt,
+            array_key="process",
+            on_item=check_element,
+            max_tokens=4000,
+            images=images,
+        )
+
+    @traced("BpmnModelingService.edit_bpmn")
     def edit_bpmn(
         self,
         llm_facade: LLMFacade,
@@ -87,7 +87,6 @@ class BpmnProcessTransformer:
                 branch_next = branch.get("next")
 
                 if branch_next:
-                    print("TRANSFORM PATH", branch["path"])
                     branch_structure = self.transform(branch["path"], branch_next)
                 else:
                     branch_structure = self.transform(
@@ -253,13 +252,15 @@ class BpmnProcessTransformer:
                 # Add the flow between the current element and the next element in the process
                 add_flow(element["id"], next_element_id)
 
-        # Add incoming and outgoing flows to each element
+        # Add incoming and outgoing flows to each element (indexed once, instead of
+        # scanning all the flows for every element)
+        incoming_flows: dict[str, list[str]] = {}
+        outgoing_flows: dict[str, list[str]] = {}
+        for flow in flows:
+            incoming_flows.setdefault(flow["targetRef"], []).append(flow["id"])
+            outgoing_flows.setdefault(flow["sourceRef"], []).append(flow["id"])
         for element in elements:
-            element["incoming"] = [
-                flow["id"] for flow in flows if flow["targetRef"] == element["id"]
-            ]
-            element["outgoing"] = [
-                flow["id"] for flow in flows if flow["sourceRef"] == element["id"]
-            ]
+            element["incoming"] = list(incoming_flows.get(element["id"], ()))
+            element["outgoing"] = list(outgoing_flows.get(element["id"], ()))
 
         return {"elements": elements, "flows": flows}
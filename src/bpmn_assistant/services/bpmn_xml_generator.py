@@ -1,8 +1,66 @@
-import json
 import xml.etree.ElementTree as ET
+from typing import Any, Optional
 
-from bpmn_assistant.config import logger
+from bpmn_assistant.config import log_payload, logger
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.core.tracing import span, traced
 from bpmn_assistant.services import BpmnProcessTransformer
+from bpmn_assistant.services.conversion_cache import ConversionCache
+from bpmn_assistant.services.process_hash import process_hash
+
+
+def _create_document_parts() -> tuple[str, str]:
+    # The XML before and after the children of the process element
+    root = ET.Element("definitions")
+    root.set("xmlns", "http://www.omg.org/spec/BPMN/20100524/MODEL")
+    root.set("xmlns:bpmndi", "http://www.omg.org/spec/BPMN/20100524/DI")
+    root.set("xmlns:dc", "http://www.omg.org/spec/DD/20100524/DC")
+    root.set("xmlns:di", "http://www.omg.org/spec/DD/20100524/DI")
+    root.set("xmlns:flowable", "http://flowable.org/bpmn")
+    root.set("id", "definitions_1")
+
+    process_element = ET.SubElement(root, "process")
+    process_element.set("id", "Process_1")
+    process_element.set("isExecutable", "false")
+    ET.SubElement(process_element, "placeholder")
+
+    head, tail = ET.tostring(root, encoding="unicode").split("<placeholder />")
+    return head, tail
+
+
+_DOCUMENT_HEAD, _DOCUMENT_TAIL = _create_document_parts()
+_EMPTY_DOCUMENT = _DOCUMENT_HEAD[: -len(">")] + " />" + _DOCUMENT_TAIL[len("</process>") :]
+
+
+class _XmlFragments:
+    """
+    The transformed elements and flows of a process, each with its serialized XML, from
+    which the XML of the next version of the process is assembled.
+    """
+
+    def __init__(
+        self,
+        elements: list[tuple[dict, str]],
+        flows: list[tuple[dict, str]],
+    ):
+        self.elements = elements
+        self.flows = flows
+        self.xml = (
+            _DOCUMENT_HEAD
+            + "".join(fragment for _, fragment in elements)
+            + "".join(fragment for _, fragment in flows)
+            + _DOCUMENT_TAIL
+            if elements or flows
+            else _EMPTY_DOCUMENT
+        )
+
+    def __repr__(self):
+        return f"_XmlFragments(elements={len(self.elements)}, flows={len(self.flows)})"
+
+    @property
+    def size(self) -> int:
+        # The fragments and the assembled XML
+        return 2 * len(self.xml)
 
 
 class BpmnXmlGenerator:
@@ -10,98 +68,181 @@ class BpmnXmlGenerator:
     Class to generate BPMN XML from the BPMN process data in JSON format.
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[ConversionCache] = None):
+        """
+        Args:
+            cache: Optional cache of the generated XML (with its fragments, for
+                update_bpmn_xml), by hash of the process.
+        """
         self.transformer = BpmnProcessTransformer()
+        self.cache = cache
 
+    @traced("BpmnXmlGenerator.create_bpmn_xml")
     def create_bpmn_xml(self, process: list[dict]) -> str:
         """
         Create BPMN XML from the process data.
         Args:
             process: BPMN process structure generated by the LLM.
+        Returns:
             The BPMN XML string.
         """
+        return self._get_fragments(process).xml
 
+    @traced("BpmnXmlGenerator.update_bpmn_xml")
+    def update_bpmn_xml(
+        self, process: list[dict], previous_process: list[dict]
+    ) -> tuple[str, Optional[dict[str, Any]]]:
+        """
+        Create the BPMN XML of an edited process incrementally: only the elements and flows
+        that the edit added or changed (e.g. the neighbours of a moved element) are
+        serialized again, the XML of the others is reused from the previous version.
+        Args:
+            process: The edited process.
+            previous_process: The process before the edit.
+        Returns:
+            The BPMN XML string, and the patch from the previous version: the "elements"
+            and "flows" (in the transformed structure, whose IDs are those of the XML) that
+            were "added", "removed" (IDs) or "changed". The patch is None if the previous
+            process cannot be converted.
+        """
+        try:
+            previous = self._get_fragments(previous_process)
+        except Exception as e:
+            logger.warning(f"Cannot convert the previous process, no patch is created: {e}")
+            return self.create_bpmn_xml(process), None
+
+        fragments = self._get_fragments(process, previous)
+        patch = {
+            "elements": _diff(previous.elements, fragments.elements),
+            "flows": _diff(previous.flows, fragments.flows),
+        }
+
+        changes = sum(len(items) for diff in patch.values() for items in diff.values())
+        metrics.histogram(
+            "xml_patch_changes", "Number of elements and flows changed by an edit"
+        ).observe(changes)
+        return fragments.xml, patch
+
+    def _get_fragments(
+        self, process: list[dict], previous: Optional[_XmlFragments] = None
+    ) -> _XmlFragments:
+        if self.cache is None:
+            return self._create_fragments(process, previous)
+
+        key = process_hash(process)
+        fragments = self.cache.get(key)
+        if fragments is None:
+            fragments = self._create_fragments(process, previous)
+            self.cache.put(key, fragments, fragments.size)
+        return fragments
+
+    def _create_fragments(
+        self, process: list[dict], previous: Optional[_XmlFragments] = None
+    ) -> _XmlFragments:
         logger.info('create_bpmn_xml enter')
 
-        transformed_process = self.transformer.transform(process)
-        logger.debug(
-            f"Transformed process:\n{json.dumps(transformed_process, indent=2)}"
-        )
-
-        # Create the root element (definitions)
-        root = ET.Element("definitions")
-        root.set("xmlns", "http://www.omg.org/spec/BPMN/20100524/MODEL")
-        root.set("xmlns:bpmndi", "http://www.omg.org/spec/BPMN/20100524/DI")
-        root.set("xmlns:dc", "http://www.omg.org/spec/DD/20100524/DC")
-        root.set("xmlns:di", "http://www.omg.org/spec/DD/20100524/DI")
-        root.set("xmlns:flowable", "http://flowable.org/bpmn")
-        root.set("id", "definitions_1")
-
-        # Create the process element
-        process_element = ET.SubElement(root, "process")
-        process_element.set("id", "Process_1")
-        process_element.set("isExecutable", "false")
-
-        # Add elements
-        for element in transformed_process["elements"]:
-            elem = ET.SubElement(process_element, element["type"])
-            elem.set("id", element["id"])
-
-            # Add label if it exists
-            if "label" in element and element["label"]:
-                elem.set("name", element["label"])
-
-            # Add default flow attribute for inclusive/exclusive gateways if it exists
-            if "default_flow" in element and element["default_flow"]:
-                elem.set("default", element["default_flow"])
-
-            if "variables" in element and element["variables"]:
-                for elpar in element["variables"]:
-                    print('VARIABLES', elpar)
-                    # TODO permissions ?
-                    extension_el = ET.SubElement(elem, "bpmn:extensionElements")
-                    form_el = ET.SubElement(extension_el, "flowable:formProperty")
-                    if 'type' in elpar and 'id' in elpar: 
-                        var_el = ET.SubElement(form_el, "flowable:value")
-                        var_el.set('id', elpar['id'])
-                        var_el.set('name', elpar['id'])
-                        var_el.set('type', elpar['type'])
-                        readable = "yes"
-                        if 'readable' in var_el: readable = elpar['readable']
-                        var_el.set('readable', readable)
-                        required = "yes"
-                        if 'required' in elpar: required = elpar['required']
-                        var_el.set('required', required)
-                #print(ET.tostring(elem, encoding='utf8'))
-                #print(ET.tostring(elem))
-
-            # Add incoming and outgoing flows as child elements
-            for incoming in element["incoming"]:
-                ET.SubElement(elem, "incoming").text = incoming
-            for outgoing in element["outgoing"]:
-                ET.SubElement(elem, "outgoing").text = outgoing
-
-            # Add event definition if it exists
-            if "eventDefinition" in element and element["eventDefinition"]:
-                event_def_type = element["eventDefinition"]
-                # Create event definition element with a unique ID
-                event_def_elem = ET.SubElement(elem, event_def_type)
-                event_def_elem.set("id", f"{event_def_type}_{element['id']}")
-
-        # Add flows
-        for flow in transformed_process["flows"]:
-            seq_flow = ET.SubElement(process_element, "sequenceFlow")
-            seq_flow.set("id", flow["id"])
-            seq_flow.set("sourceRef", flow["sourceRef"])
-            seq_flow.set("targetRef", flow["targetRef"])
-
-            # Add condition if it exists
-            if flow["condition"]:
-                seq_flow.set("name", flow["condition"])
-
-        xml_string = ET.tostring(root, encoding="unicode")
-        print("ALLES: ", xml_string)
+        with span("BpmnProcessTransformer.transform"):
+            transformed_process = self.transformer.transform(process)
+        log_payload("Transformed process", transformed_process)
+
+        # The XML of the unchanged elements and flows is reused
+        previous_elements: dict[str, tuple[dict, str]] = {}
+        previous_flows: dict[str, tuple[dict, str]] = {}
+        if previous is not None:
+            previous_elements = {item["id"]: (item, xml) for item, xml in previous.elements}
+            previous_flows = {item["id"]: (item, xml) for item, xml in previous.flows}
+
+        elements = [
+            _reuse(previous_elements, element) or (element, _element_xml(element))
+            for element in transformed_process["elements"]
+        ]
+        flows = [
+            _reuse(previous_flows, flow) or (flow, _flow_xml(flow))
+            for flow in transformed_process["flows"]
+        ]
+        fragments = _XmlFragments(elements, flows)
 
         logger.info('create_bpmn_xml leave')
 
-        return xml_string
+        return fragments
+
+
+def _reuse(previous: dict[str, tuple[dict, str]], item: dict) -> Optional[tuple[dict, str]]:
+    previous_item = previous.get(item["id"])
+    if previous_item is not None and previous_item[0] == item:
+        return previous_item
+    return None
+
+
+def _diff(
+    previous: list[tuple[dict, str]], current: list[tuple[dict, str]]
+) -> dict[str, list]:
+    previous_items = {item["id"]: item for item, _ in previous}
+    current_items = {item["id"]: item for item, _ in current}
+    return {
+        "added": [item for id_, item in current_items.items() if id_ not in previous_items],
+        "removed": [id_ for id_ in previous_items if id_ not in current_items],
+        "changed": [
+            item
+            for id_, item in current_items.items()
+            if id_ in previous_items and previous_items[id_] != item
+        ],
+    }
+
+
+def _element_xml(element: dict) -> str:
+    elem = ET.Element(element["type"])
+    elem.set("id", element["id"])
+
+    # Add label if it exists
+    if "label" in element and element["label"]:
+        elem.set("name", element["label"])
+
+    # Add default flow attribute for inclusive/exclusive gateways if it exists
+    if "default_flow" in element and element["default_flow"]:
+        elem.set("default", element["default_flow"])
+
+    if "variables" in element and element["variables"]:
+        for elpar in element["variables"]:
+            # TODO permissions ?
+            extension_el = ET.SubElement(elem, "bpmn:extensionElements")
+            form_el = ET.SubElement(extension_el, "flowable:formProperty")
+            if 'type' in elpar and 'id' in elpar: 
+                var_el = ET.SubElement(form_el, "flowable:value")
+                var_el.set('id', elpar['id'])
+                var_el.set('name', elpar['id'])
+                var_el.set('type', elpar['type'])
+                readable = "yes"
+                if 'readable' in var_el: readable = elpar['readable']
+                var_el.set('readable', readable)
+                required = "yes"
+                if 'required' in elpar: required = elpar['required']
+                var_el.set('required', required)
+
+    # Add incoming and outgoing flows as child elements
+    for incoming in element["incoming"]:
+        ET.SubElement(elem, "incoming").text = incoming
+    for outgoing in element["outgoing"]:
+        ET.SubElement(elem, "outgoing").text = outgoing
+
+    # Add event definition if it exists
+    if "eventDefinition" in element and element["eventDefinition"]:
+        event_def_type = element["eventDefinition"]
+        # Create event definition element with a unique ID
+        event_def_elem = ET.SubElement(elem, event_def_type)
+        event_def_elem.set("id", f"{event_def_type}_{element['id']}")
+
+    return ET.tostring(elem, encoding="unicode")
+
+
+def _flow_xml(flow: dict) -> str:
+    seq_flow = ET.Element("sequenceFlow")
+    seq_flow.set("id", flow["id"])
+    seq_flow.set("sourceRef", flow["sourceRef"])
+    seq_flow.set("targetRef", flow["targetRef"])
+
+    # Add condition if it exists
+    if flow["condition"]:
+        seq_flow.set("name", flow["condition"])
+
+    return ET.tostring(seq_flow, encoding="unicode")
@@ -0,0 +1,143 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional
+
+from bpmn_assistant.services.bpmn_json_generator import BpmnJsonGenerator
+
+# Not ".xml", which would match every XML file of a directory (pom.xml, configurations...)
+BPMN_FILE_EXTENSIONS = (".bpmn", ".bpmn20.xml")
+
+
+class BulkConversionStats:
+    """
+    Throughput and error statistics of a bulk conversion.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.bytes = 0
+        self.errors: Counter[str] = Counter()  # number of failed files per error message
+        self._start = time.perf_counter()
+
+    def __repr__(self):
+        return (
+            f"BulkConversionStats(files={self.files}, succeeded={self.succeeded}, "
+            f"failed={self.failed})"
+        )
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self._start
+
+    def add(self, result: dict[str, Any]) -> None:
+        self.files += 1
+        self.bytes += result.get("bytes", 0)
+        if result["status"] == "succeeded":
+            self.succeeded += 1
+        else:
+            self.failed += 1
+            self.errors[result["error"]] += 1
+
+    def to_dict(self, top_errors: int = 10):
+        elapsed = self.elapsed_seconds
+        return {
+            "files": self.files,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_second": round(self.files / elapsed, 1) if elapsed else None,
+            "megabytes_per_second": (
+                round(self.bytes / elapsed / 1_000_000, 2) if elapsed else None
+            ),
+            "top_errors": [
+                {"error": error, "files": count}
+                for error, count in self.errors.most_common(top_errors)
+            ],
+        }
+
+
+def iter_bpmn_files(
+    directory: str, extensions: tuple[str, ...] = BPMN_FILE_EXTENSIONS
+) -> Iterator[str]:
+    """
+    Walk a directory recursively and yield the paths of the BPMN files, in a stable order.
+    Args:
+        directory: The directory to walk.
+        extensions: The (lowercase) extensions of the BPMN files.
+    """
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions):
+                yield os.path.join(dirpath, filename)
+
+
+def convert_file(path: str) -> dict[str, Any]:
+    """
+    Convert a BPMN XML file to its JSON representation.
+    Returns:
+        The result, with the "path", "status" ("succeeded" or "failed"), "bytes" and
+        "duration_seconds", and either the "process" or the "error" and its "error_type"
+        (e.g. the element types that cannot be converted or several start events).
+    """
+    start = time.perf_counter()
+    result: dict[str, Any] = {"path": path}
+    try:
+        result["bytes"] = os.path.getsize(path)
+        result["process"] = BpmnJsonGenerator().create_bpmn_json_from_file(path)
+        result["status"] = "succeeded"
+    except Exception as e:
+        result["status"] = "failed"
+        result["error_type"] = type(e).__name__
+        result["error"] = str(e)
+    result["duration_seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def _convert_chunk(paths: list[str]) -> list[dict[str, Any]]:
+    return [convert_file(path) for path in paths]
+
+
+def convert_files(
+    paths: Iterable[str], workers: Optional[int] = None, chunk_size: int = 64
+) -> Iterator[dict[str, Any]]:
+    """
+    Convert BPMN files in a pool of processes, since the conversion is CPU-bound.
+    Files are dispatched in chunks to amortize the inter-process overhead, and only a few
+    chunks per worker are in flight, so that the paths can be produced lazily.
+    Args:
+        paths: The paths of the files.
+        workers: The number of processes (defaults to the number of CPUs). With 1 worker,
+            the files are converted in the current process.
+        chunk_size: The number of files per dispatched chunk.
+    Returns:
+        The results of convert_file, in order of completion.
+    """
+    paths = iter(paths)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for path in paths:
+            yield convert_file(path)
+        return
+
+    max_pending = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: set[Future] = set()
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(paths, chunk_size))
+                if not chunk:
+                    break
+                pending.add(executor.submit(_convert_chunk, chunk))
+            if not pending:
+                return
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
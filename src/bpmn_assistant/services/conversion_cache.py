@@ -0,0 +1,130 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from bpmn_assistant.core.metrics import metrics
+
+
+class ConversionCache:
+    """
+    Thread-safe LRU cache of conversion results (BPMN XML <-> JSON), keyed by the content
+    hash of the converted input. Bounded both by the number of entries and by their total
+    size; the least recently used entries are evicted first. Hits, misses and evictions
+    are counted in the conversion_cache_* metrics, labelled with the name of the cache.
+    """
+
+    def __init__(self, name: str, max_entries: int = 256, max_bytes: int = 64_000_000):
+        """
+        Args:
+            name: The name of the cache in the metrics (e.g. "bpmn_xml").
+            max_entries: The maximum number of entries.
+            max_bytes: The maximum total size of the entries, as estimated by the callers.
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self._hits = metrics.counter("conversion_cache_hits_total", "Conversion cache hits")
+        self._misses = metrics.counter(
+            "conversion_cache_misses_total", "Conversion cache misses"
+        )
+        self._evictions = metrics.counter(
+            "conversion_cache_evictions_total", "Conversion cache evictions"
+        )
+        self._size = metrics.gauge(
+            "conversion_cache_bytes", "Estimated size of the conversion cache entries"
+        )
+
+    def __repr__(self):
+        return (
+            f"ConversionCache(name={self.name!r}, entries={len(self._entries)}, "
+            f"bytes={self._bytes})"
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get the cached value of a key, marking it as the most recently used.
+        Returns:
+            The value, or None if the key is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            self._misses.inc(cache=self.name)
+            return None
+        self._hits.inc(cache=self.name)
+        return entry[0]
+
+    def put(self, key: str, value: Any, size: int) -> None:
+        """
+        Cache a value, evicting the least recently used entries if the cache is full.
+        Values larger than the whole cache are not cached.
+        Args:
+            key: The content hash of the input.
+            value: The result of the conversion. It must not be modified afterwards.
+            size: The estimated size of the value, in bytes.
+        """
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+
+        evicted = 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                evicted += 1
+            total = self._bytes
+
+        if evicted:
+            self._evictions.inc(evicted, cache=self.name)
+        self._size.set(total, cache=self.name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        self._size.set(0, cache=self.name)
+
+
+_caches: dict[str, ConversionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_conversion_cache(name: str) -> ConversionCache:
+    """
+    Get the shared conversion cache with a name, creating it on first use. Configured with
+    BPMN_CONVERSION_CACHE_ENTRIES (per cache, 0 disables caching) and
+    BPMN_CONVERSION_CACHE_MB.
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = ConversionCache(
+                name,
+                max_entries=int(os.getenv("BPMN_CONVERSION_CACHE_ENTRIES", "256")),
+                max_bytes=int(float(os.getenv("BPMN_CONVERSION_CACHE_MB", "64")) * 1_000_000),
+            )
+        return cache
@@ -1,9 +1,11 @@
 import traceback
+from typing import Literal
 
 from pydantic import BaseModel
 
 from bpmn_assistant.config import logger
 from bpmn_assistant.core import LLMFacade, MessageItem, MessageImage
+from bpmn_assistant.core.tracing import traced
 from bpmn_assistant.prompts import PromptTemplateProcessor
 from bpmn_assistant.utils import message_history_to_string
 
@@ -24,9 +26,10 @@ def _validate_determine_intent(response: dict) -> None:
 
 
 class DetermineIntentResponse(BaseModel):
-    intent: str
+    intent: Literal["modify", "talk"]
 
 
+@traced("determine_intent")
 def determine_intent(
     llm_facade: LLMFacade,
     message_history: list[MessageItem],
@@ -0,0 +1,334 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from bpmn_assistant.config import logger, request_id_var
+from bpmn_assistant.core.enums import JobStatus
+from bpmn_assistant.core.metrics import metrics
+
+
+_FINISHED_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+# Reports the progress of a job, e.g. report("editing", step=2)
+ProgressReporter = Callable[..., None]
+
+# Executes a job: (request, secrets, report) -> result
+JobHandler = Callable[[dict[str, Any], dict[str, Any], ProgressReporter], dict[str, Any]]
+
+
+class Job:
+    """
+    A background job as stored in the JobStore.
+    """
+
+    def __init__(
+        self,
+        id: str,
+        kind: str,
+        status: JobStatus,
+        request: dict[str, Any],
+        created_at: float,
+        updated_at: float,
+        result: Optional[dict[str, Any]] = None,
+        error: Optional[str] = None,
+        has_secrets: bool = False,
+    ):
+        self.id = id
+        self.kind = kind  # e.g. "modify"
+        self.status = status
+        self.request = request  # the request without secrets (e.g. API keys)
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.result = result
+        self.error = error
+        self.has_secrets = has_secrets  # whether the job needs secrets that are not stored
+
+    def __repr__(self):
+        return f"Job(id={self.id}, kind={self.kind}, status={self.status.value})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in _FINISHED_STATUSES
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobStore:
+    """
+    SQLite store of jobs and their progress events, so that jobs survive restarts.
+    The connection is shared by the worker threads and serialized with a lock.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: The path of the SQLite database (":memory:" for a non-persistent store).
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    has_secrets INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    event TEXT NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)"
+            )
+
+    def create(self, kind: str, request: dict[str, Any], has_secrets: bool = False) -> Job:
+        now = time.time()
+        job = Job(
+            uuid.uuid4().hex,
+            kind,
+            JobStatus.QUEUED,
+            request,
+            created_at=now,
+            updated_at=now,
+            has_secrets=has_secrets,
+        )
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO jobs (id, kind, status, request, has_secrets, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    kind,
+                    job.status.value,
+                    json.dumps(request),
+                    int(has_secrets),
+                    now,
+                    now,
+                ),
+            )
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return _row_to_job(row) if row else None
+
+    def get_unfinished(self) -> list[Job]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+            ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def update(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (
+                    status.value,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def add_event(self, job_id: str, event: dict[str, Any]) -> int:
+        """
+        Append a progress event to a job.
+        Returns:
+            The sequence number of the event (starting at 1).
+        """
+        with self._lock, self._connection:
+            (seq,) = self._connection.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+            self._connection.execute(
+                "INSERT INTO job_events (job_id, seq, created_at, event) VALUES (?, ?, ?, ?)",
+                (job_id, seq, time.time(), json.dumps(event)),
+            )
+        return seq
+
+    def get_events(self, job_id: str, after: int = 0) -> list[tuple[int, dict[str, Any]]]:
+        """
+        Get the progress events of a job.
+        Args:
+            job_id: The job ID.
+            after: Only return events with a higher sequence number.
+        Returns:
+            The (sequence number, event) pairs in order.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT seq, event FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+        return [(row["seq"], json.loads(row["event"])) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class JobQueue:
+    """
+    Executes jobs in a pool of worker threads, independently of the HTTP requests that
+    submitted them. Secrets (e.g. user API keys) are only kept in memory: after a restart,
+    unfinished jobs without secrets are re-queued and those with secrets fail.
+    """
+
+    def __init__(self, store: JobStore, handlers: dict[str, JobHandler], max_workers: int = 4):
+        """
+        Args:
+            store: The job store.
+            handlers: The handler of each job kind.
+            max_workers: The number of jobs executed concurrently.
+        """
+        self.store = store
+        self.handlers = handlers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._secrets: dict[str, dict[str, Any]] = {}
+
+    def submit(
+        self, kind: str, request: dict[str, Any], secrets: Optional[dict[str, Any]] = None
+    ) -> Job:
+        """
+        Store a job and queue it for execution.
+        Args:
+            kind: The job kind, which selects the handler.
+            request: The request, which is stored.
+            secrets: Values that the handler needs but must not be stored.
+        Returns:
+            The queued job.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unsupported job kind: {kind}")
+
+        job = self.store.create(kind, request, has_secrets=bool(secrets))
+        logger.info(f"Job {job.id} submitted", extra={"job_id": job.id, "kind": kind})
+        if secrets:
+            self._secrets[job.id] = secrets
+        self.store.add_event(job.id, {"type": "status", "status": JobStatus.QUEUED.value})
+        self._queue(job)
+        return job
+
+    def recover(self) -> None:
+        """
+        Resume the jobs that were unfinished when the process stopped. Running jobs are
+        restarted from the beginning.
+        """
+        for job in self.store.get_unfinished():
+            if job.has_secrets:
+                self._finish(
+                    job.id,
+                    JobStatus.FAILED,
+                    error="The server restarted before the job finished. Resubmit the job.",
+                )
+                continue
+            logger.info(f"Resuming job {job.id}")
+            self._queue(job)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _queue(self, job: Job) -> None:
+        metrics.gauge("jobs_queued", "Background jobs waiting for a worker").inc(kind=job.kind)
+        self._executor.submit(self._run, job)
+
+    def _run(self, job: Job) -> None:
+        # The logs of a job are correlated by its ID
+        request_id_var.set(job.id)
+        metrics.gauge("jobs_queued").dec(kind=job.kind)
+        secrets = self._secrets.pop(job.id, {})
+
+        self.store.update(job.id, JobStatus.RUNNING)
+        self.store.add_event(job.id, {"type": "status", "status": JobStatus.RUNNING.value})
+
+        def report(stage: str, **data: Any) -> None:
+            self.store.add_event(job.id, {"type": "progress", "stage": stage, **data})
+
+        start = time.perf_counter()
+        try:
+            result = self.handlers[job.kind](job.request, secrets, report)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}", exc_info=e)
+            self._finish(job.id, JobStatus.FAILED, error=str(e))
+        else:
+            self._finish(job.id, JobStatus.SUCCEEDED, result=result)
+        finally:
+            metrics.histogram("job_duration_seconds", "Duration of background jobs").observe(
+                time.perf_counter() - start, kind=job.kind
+            )
+
+    def _finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self.store.update(job_id, status, result=result, error=error)
+        event: dict[str, Any] = {"type": "status", "status": status.value}
+        if error is not None:
+            event["error"] = error
+        self.store.add_event(job_id, event)
+        metrics.counter("jobs_finished_total", "Finished background jobs").inc(
+            status=status.value
+        )
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    return Job(
+        row["id"],
+        row["kind"],
+        JobStatus(row["status"]),
+        json.loads(row["request"]),
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        result=json.loads(row["result"]) if row["result"] is not None else None,
+        error=row["error"],
+        has_secrets=bool(row["has_secrets"]),
+    )
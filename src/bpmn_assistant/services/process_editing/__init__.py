@@ -1,3 +1,5 @@
 from .functions import *
 from .bpmn_editing_service import *
 from .define_change_request import *
+from .process_index import ProcessIndex
+from .helpers import copy_path, find_branch_position, find_position, get_all_ids
@@ -1,7 +1,9 @@
 from bpmn_assistant.config import logger
 from bpmn_assistant.core import EditProposal, IntermediateEditProposal, LLMFacade
 from bpmn_assistant.core.exceptions import ProcessException
-from bpmn_assistant.prompts import PromptTemplateProcessor
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.core.tracing import span
+from bpmn_assistant.prompts import PromptTemplateProcessor, get_example_library
 from bpmn_assistant.services.process_editing import (
     add_element,
     delete_element,
@@ -9,7 +11,8 @@ from bpmn_assistant.services.process_editing import (
     redirect_branch,
     update_element,
 )
-from bpmn_assistant.services.validate_bpmn import validate_element
+from bpmn_assistant.services.process_editing.process_index import ProcessIndex
+from bpmn_assistant.services.validate_bpmn import BpmnValidationError, validate_element
 
 
 class BpmnEditingService:
@@ -17,6 +20,8 @@ class BpmnEditingService:
         self.llm_facade = llm_facade
         self.process = process
         self.change_request = change_request
+        # Maintained incrementally by the edit functions across iterations
+        self.index = ProcessIndex(process)
         self.prompt_processor = PromptTemplateProcessor()
 
     def edit_bpmn(self) -> list:
@@ -47,6 +52,7 @@ class BpmnEditingService:
             "edit_bpmn.jinja2",
             process=str(self.process),
             change_request=self.change_request,
+            examples=get_example_library().render(self.change_request, self.process),
         )
 
         last_error: Exception | None = None
@@ -65,16 +71,24 @@ class BpmnEditingService:
                 # Update process based on the edit proposal
                 try:
                     updated_process = self._update_process(self.process, edit_proposal)
+                    self._observe_attempts(attempts, step="initial")
                     return updated_process
                 except ProcessException as e:
                     last_error = e
                     logger.warning(f"Validation error (attempt {attempts}): {str(e)}")
                     prompt = f"Error: {str(e)}. Try again. Change request: {self.change_request}"
+            except BpmnValidationError as e:
+                last_error = e
+                logger.warning(
+                    f"Validation errors (attempt {attempts}): {e.report.messages}"
+                )
+                prompt = self._render_validation_errors(e, self.change_request)
             except ValueError as e:
                 last_error = e
                 logger.warning(f"Validation error (attempt {attempts}): {str(e)}")
                 prompt = f"Editing error: {str(e)}. Provide a new edit proposal."
 
+        self._observe_attempts(attempts, step="initial", outcome="failure")
         message = "Max number of retries reached."
         if last_error:
             message += f" Last error from provider: {last_error}"
@@ -127,8 +141,16 @@ class BpmnEditingService:
                         updated_process, edit_proposal
                     )
 
+                    self._observe_attempts(attempts, step="intermediate")
                     break
 
+                except BpmnValidationError as e:
+                    last_error = e
+                    last_iteration_error = e
+                    logger.warning(
+                        f"Validation errors (attempt {attempts}): {e.report.messages}"
+                    )
+                    prompt = self._render_validation_errors(e)
                 except (ValueError, ProcessException) as e:
                     last_error = e
                     last_iteration_error = e
@@ -136,6 +158,7 @@ class BpmnEditingService:
                     prompt = f"Editing error: {str(e)}. Provide a new edit proposal."
 
             else:
+                self._observe_attempts(attempts, step="intermediate", outcome="failure")
                 error_message = (
                     f"Edit iteration {iteration_index+1} failed after {max_retries} attempts."
                 )
@@ -148,6 +171,31 @@ class BpmnEditingService:
             message += f" Last error from provider: {last_iteration_error}"
         raise Exception(message)
 
+    def _render_validation_errors(
+        self, error: BpmnValidationError, change_request: str | None = None
+    ) -> str:
+        """
+        Render a correction prompt that lists all the issues of an invalid edit proposal.
+        """
+        metrics.counter(
+            "bpmn_validation_issues_total",
+            "Validation issues reported back to the LLM",
+        ).inc(len(error.report), operation="edit")
+        return self.prompt_processor.render_template(
+            "fix_validation_errors.jinja2",
+            subject="edit proposal",
+            issues=error.report.issues,
+            instruction="Provide a new edit proposal.",
+            change_request=change_request,
+        )
+
+    @staticmethod
+    def _observe_attempts(attempts: int, step: str, outcome: str = "success") -> None:
+        metrics.histogram(
+            "bpmn_edit_attempts",
+            "Number of LLM calls needed for a valid edit proposal",
+        ).observe(attempts, step=step, outcome=outcome)
+
     def _update_process(self, process: list, edit_proposal: dict) -> list:
         """
         Update the process based on the edit proposal.
@@ -170,7 +218,8 @@ class BpmnEditingService:
         function_to_call = edit_proposal["function"]
         args = edit_proposal["arguments"]
 
-        res = edit_functions[function_to_call](process, **args)
+        with span(f"edit.{function_to_call}", **{"bpmn.edit.function": function_to_call}):
+            res = edit_functions[function_to_call](process, **args, index=self.index)
         return res["process"]
 
     def _validate_edit_proposal(
@@ -218,7 +267,7 @@ class BpmnEditingService:
             raise ValueError("Arguments should contain 'new_element' key.")
         elif len(args) > 1:
             raise ValueError("Arguments should contain only 'new_element' key.")
-        validate_element(args["new_element"])
+        validate_element(args["new_element"], path="arguments.new_element")
 
     def _validate_move_element(self, args):
         if "element_id" not in args:
@@ -247,7 +296,7 @@ class BpmnEditingService:
             raise ValueError(
                 "Arguments should contain only 'element' and either 'before_id' or 'after_id' keys."
             )
-        validate_element(args["element"])
+        validate_element(args["element"], path="arguments.element")
 
     def _validate_redirect_branch(self, args):
         if "branch_condition" not in args or "next_id" not in args:
@@ -1,9 +1,11 @@
 from bpmn_assistant.config import logger
 from bpmn_assistant.core import LLMFacade, MessageItem, MessageImage
-from bpmn_assistant.prompts import PromptTemplateProcessor
+from bpmn_assistant.core.tracing import traced
+from bpmn_assistant.prompts import PromptTemplateProcessor, get_example_library
 from bpmn_assistant.utils import message_history_to_string
 
 
+@traced("define_change_request")
 def define_change_request(
     text_llm_facade: LLMFacade,
     process: list[dict],
@@ -22,10 +24,12 @@ def define_change_request(
     """
     prompt_processor = PromptTemplateProcessor()
 
+    history = message_history_to_string(message_history)
     prompt = prompt_processor.render_template(
         "define_change_request.jinja2",
         process=str(process),
-        message_history=message_history_to_string(message_history),
+        message_history=history,
+        examples=get_example_library().render(history, process),
     )
 
     change_request = text_llm_facade.call(prompt, max_tokens=5000, temperature=0.4, images=images)
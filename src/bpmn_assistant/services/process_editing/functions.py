@@ -1,58 +1,59 @@
-from copy import deepcopy
-from typing import Optional
+from typing import Container, Optional
 
 from bpmn_assistant.core.exceptions import (
     ElementAlreadyExistsError,
     ElementNotFoundException,
     GatewayUpdateError,
+    ProcessException,
 )
 
-from .helpers import find_branch_position, find_position, get_all_ids
+from .helpers import copy_path
+from .process_index import ProcessIndex
 
 
-def delete_element(process: list[dict], element_id: str) -> dict:
-    ids = get_all_ids(process)
+def delete_element(
+    process: list[dict], element_id: str, index: Optional[ProcessIndex] = None
+) -> dict:
+    index = ProcessIndex.for_process(process, index)
 
-    if element_id not in ids:
+    if element_id not in index:
         raise ElementNotFoundException(f"Element with id {element_id} does not exist")
 
-    process_copy = deepcopy(process)
-
-    position = find_position(process_copy, before_id=element_id)
-
-    current = process_copy
+    position = index.find_position(before_id=element_id)
 
-    for path_element in position.path[:-1]:
-        current = current[path_element]
+    process_copy, target_list = copy_path(process, position.path)
 
-    if position.path:
-        removed_element = current[position.path[-1]].pop(position.index)
-    else:
-        removed_element = current.pop(position.index)
+    removed_element = target_list.pop(position.index)
 
     if removed_element is None:
         raise ElementNotFoundException("Could not find the element to remove")
 
+    index.remove(element_id, process_copy)
+
     return {
         "process": process_copy,
         "removed_element": removed_element,
     }
 
 
-def redirect_branch(process: list[dict], branch_condition: str, next_id: str) -> dict:
+def redirect_branch(
+    process: list[dict],
+    branch_condition: str,
+    next_id: str,
+    index: Optional[ProcessIndex] = None,
+) -> dict:
     # FIXME: Two branches can have the same condition in different gateways
-    position = find_branch_position(process, branch_condition)
-
-    process_copy = deepcopy(process)
-
-    current = process_copy
+    index = ProcessIndex.for_process(process, index)
 
-    for path_element in position.path:
-        current = current[path_element]
+    position = index.find_branch_position(branch_condition)
 
-    branch = current[position.index]
+    process_copy, branches = copy_path(process, position.path)
 
+    branch = dict(branches[position.index])
     branch["next"] = next_id
+    branches[position.index] = branch
+
+    index.bind(process_copy)
 
     return {
         "process": process_copy,
@@ -60,7 +61,9 @@ def redirect_branch(process: list[dict], branch_condition: str, next_id: str) ->
     }
 
 
-def validate_params(ids: list[str], before_id: Optional[str], after_id: Optional[str]):
+def validate_params(
+    ids: Container[str], before_id: Optional[str], after_id: Optional[str]
+):
     """
     Validate the parameters for placing an element within the process.
     """
@@ -79,32 +82,25 @@ def add_element(
     element: dict,
     before_id: Optional[str] = None,
     after_id: Optional[str] = None,
+    index: Optional[ProcessIndex] = None,
 ) -> dict:
-    ids = get_all_ids(process)
+    index = ProcessIndex.for_process(process, index)
 
-    if element["id"] in ids:
+    if element["id"] in index:
         raise ElementAlreadyExistsError(
             f"Element with id {element['id']} already exists"
         )
 
-    validate_params(ids, before_id, after_id)
-
-    position = find_position(process, before_id=before_id, after_id=after_id)
+    validate_params(index, before_id, after_id)
 
-    process_copy = deepcopy(process)
+    position = index.find_position(before_id=before_id, after_id=after_id)
 
-    current = process_copy
-
-    for path_element in position.path[:-1]:
-        current = current[path_element]
-
-    if position.path:
-        target_list = current[position.path[-1]]
-    else:
-        target_list = current
+    process_copy, target_list = copy_path(process, position.path)
 
     target_list.insert(position.index, element)
 
+    index.insert(element, process_copy, before_id=before_id, after_id=after_id)
+
     return {
         "process": process_copy,
         "added_element": element,
@@ -116,18 +112,27 @@ def move_element(
     element_id: str,
     before_id: Optional[str] = None,
     after_id: Optional[str] = None,
+    index: Optional[ProcessIndex] = None,
 ) -> dict:
-    ids = get_all_ids(process)
+    index = ProcessIndex.for_process(process, index)
 
-    if element_id not in ids:
+    if element_id not in index:
         raise ElementNotFoundException(f"Element with id {element_id} does not exist")
 
-    validate_params(ids, before_id, after_id)
+    validate_params(index, before_id, after_id)
+
+    anchor_id = before_id if before_id is not None else after_id
+    if index.is_nested_in(anchor_id, element_id):
+        raise ProcessException(
+            f"Cannot move element {element_id} next to itself or to an element nested in it"
+        )
 
-    process_copy, removed_element = delete_element(process, element_id).values()
+    process_copy, removed_element = delete_element(
+        process, element_id, index=index
+    ).values()
 
     process_copy, added_element = add_element(
-        process_copy, removed_element, before_id, after_id
+        process_copy, removed_element, before_id, after_id, index=index
     ).values()
 
     return {
@@ -136,10 +141,12 @@ def move_element(
     }
 
 
-def update_element(process: list[dict], new_element: dict) -> dict:
-    ids = get_all_ids(process)
+def update_element(
+    process: list[dict], new_element: dict, index: Optional[ProcessIndex] = None
+) -> dict:
+    index = ProcessIndex.for_process(process, index)
 
-    if new_element["id"] not in ids:
+    if new_element["id"] not in index:
         raise ElementNotFoundException(
             f"Element with id {new_element['id']} does not exist"
         )
@@ -150,21 +157,14 @@ def update_element(process: list[dict], new_element: dict) -> dict:
     ]:
         raise GatewayUpdateError("Cannot update a gateway element")
 
-    position = find_position(process, before_id=new_element["id"])
-
-    process_copy = deepcopy(process)
+    position = index.find_position(before_id=new_element["id"])
 
-    current = process_copy
-    for path_element in position.path[:-1]:
-        current = current[path_element]
-
-    if position.path:
-        target_list = current[position.path[-1]]
-    else:
-        target_list = current
+    process_copy, target_list = copy_path(process, position.path)
 
     target_list[position.index] = new_element
 
+    index.replace(new_element, process_copy)
+
     return {
         "process": process_copy,
         "updated_element": new_element,
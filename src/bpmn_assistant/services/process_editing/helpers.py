@@ -1,8 +1,8 @@
 from typing import Optional
 
 from bpmn_assistant.core.enums import BPMNElementType
-from bpmn_assistant.core.exceptions import ProcessException
 from bpmn_assistant.services.process_editing.position import Position
+from bpmn_assistant.services.process_editing.process_index import ProcessIndex
 
 
 def get_all_ids(process: list[dict]):
@@ -16,7 +16,10 @@ def get_all_ids(process: list[dict]):
     ids = []
     for element in process:
         ids.append(element["id"])
-        if element["type"] == BPMNElementType.EXCLUSIVE_GATEWAY.value:
+        if element["type"] in [
+            BPMNElementType.EXCLUSIVE_GATEWAY.value,
+            BPMNElementType.INCLUSIVE_GATEWAY.value,
+        ]:
             for branch in element["branches"]:
                 ids += get_all_ids(branch["path"])
         elif element["type"] == BPMNElementType.PARALLEL_GATEWAY.value:
@@ -25,49 +28,33 @@ def get_all_ids(process: list[dict]):
     return ids
 
 
-def _find_position_in_process(
-    process: list[dict],
-    target_id: str,
-    after: bool = False,
-    path: Optional[list] = None,
-) -> dict | None:
+def copy_path(process: list[dict], path: list) -> tuple[list[dict], list]:
     """
-    Recursively find the position of the target_id in the process.
+    Copy the process along the given path (path-copying), leaving the original process untouched.
+    Only the containers on the path are copied, all other elements and branches are shared
+    between the original process and the copy.
     Args:
-        process: The process in JSON format.
-        target_id: The id of the target element.
-        after: A boolean indicating whether to find the position after the target_id.
-        path: The path to the current process.
+        process: The process.
+        path: The path to the target container, as found in Position.path.
+        Example: [0, "branches", 1, "path"]
     Returns:
-        dict: A dictionary containing the position and path of the target_id.
+        tuple: The copied process and the copied container at the end of the path.
     """
-    path = path or []
-    for index, element in enumerate(process):
-        current_path = path + [index]
-        if element["id"] == target_id:
-            return {"index": index + 1 if after else index, "path": path}
-        if element["type"] == BPMNElementType.EXCLUSIVE_GATEWAY.value:
-            for branch_index, branch in enumerate(element["branches"]):
-                result = _find_position_in_process(
-                    branch["path"],
-                    target_id,
-                    after,
-                    current_path + ["branches", branch_index, "path"],
-                )
-                if result:
-                    return result
-        elif element["type"] == BPMNElementType.PARALLEL_GATEWAY.value:
-            for branch_index, branch in enumerate(element["branches"]):
-                result = _find_position_in_process(
-                    branch, target_id, after, current_path + ["branches", branch_index]
-                )
-                if result:
-                    return result
-    return None
+    process_copy = list(process)
+    current: list | dict = process_copy
+    for path_element in path:
+        child = current[path_element]
+        child_copy = list(child) if isinstance(child, list) else dict(child)
+        current[path_element] = child_copy
+        current = child_copy
+    return process_copy, current
 
 
 def find_position(
-    process: list[dict], before_id: Optional[str] = None, after_id: Optional[str] = None
+    process: list[dict],
+    before_id: Optional[str] = None,
+    after_id: Optional[str] = None,
+    index: Optional[ProcessIndex] = None,
 ) -> Position:
     """
     Find the position to insert a new element based on the before_id or after_id.
@@ -75,89 +62,27 @@ def find_position(
         process: The process.
         before_id: The id of the element before which the new element should be inserted.
         after_id: The id of the element after which the new element should be inserted.
+        index: An optional index of the process (built if not provided or out of date).
     Returns:
         Position: A class that contains the index and path of the element.
         Example: Position(index=2, path=[0, "branches", 1, "path"])
     """
-    ids = get_all_ids(process)
-
-    position = None
-
-    if before_id is None and after_id is None:
-        raise ProcessException("Both before_id and after_id cannot be None")
-    elif before_id is not None and after_id is not None:
-        raise ProcessException("Only one of before_id and after_id can be specified")
-    elif before_id is not None:
-        if before_id not in ids:
-            raise ProcessException(f"Element with id {before_id} does not exist")
-        position = _find_position_in_process(process, before_id)
-    elif after_id is not None:
-        if after_id not in ids:
-            raise ProcessException(f"Element with id {after_id} does not exist")
-        position = _find_position_in_process(process, after_id, after=True)
-
-    if position is None:
-        raise ProcessException("Element not found")
-
-    return Position(position["index"], position["path"])
-
-
-def _find_branch_by_condition(
-    process: list[dict], target_condition: str, path: Optional[list] = None
-) -> dict | None:
-    """
-    Recursively find the position of a branch with the target condition in the process.
-    Args:
-        process: The process.
-        target_condition: The condition of the target branch.
-        path: The path to the current process.
-    Returns:
-        dict: A dictionary containing the position and path of the target branch.
-    """
-    path = path or []
-    for index, element in enumerate(process):
-        current_path = path + [index]
-        if element["type"] == BPMNElementType.EXCLUSIVE_GATEWAY.value:
-            for branch_index, branch in enumerate(element["branches"]):
-                if branch["condition"] == target_condition:
-                    return {
-                        "gateway_index": index,
-                        "branch_index": branch_index,
-                        "path": current_path,
-                    }
-
-            # If not found in this gateway, search nested gateways
-            for branch_index, branch in enumerate(element["branches"]):
-                result = _find_branch_by_condition(
-                    branch["path"],
-                    target_condition,
-                    current_path + ["branches", branch_index, "path"],
-                )
-                if result:
-                    return result
-        elif element["type"] == BPMNElementType.PARALLEL_GATEWAY.value:
-            for branch_index, branch in enumerate(element["branches"]):
-                result = _find_branch_by_condition(
-                    branch, target_condition, current_path + ["branches", branch_index]
-                )
-                if result:
-                    return result
-    return None
+    index = ProcessIndex.for_process(process, index)
+    return index.find_position(before_id=before_id, after_id=after_id)
 
 
-def find_branch_position(process: list[dict], condition: str) -> Position:
+def find_branch_position(
+    process: list[dict], condition: str, index: Optional[ProcessIndex] = None
+) -> Position:
     """
-    Find the position of a branch in an exclusive gateway based on its condition.
+    Find the position of a branch in an exclusive or inclusive gateway based on its condition.
     Args:
         process: The original process.
         condition: The condition of the branch to find.
+        index: An optional index of the process (built if not provided or out of date).
     Returns:
         Position: A class that contains the index and path of the branch.
         Example: Position(index=1, path=[2, "branches"])
     """
-    result = _find_branch_by_condition(process, condition)
-
-    if result is None:
-        raise ProcessException(f"Branch with condition '{condition}' does not exist")
-
-    return Position(result["branch_index"], result["path"] + ["branches"])
+    index = ProcessIndex.for_process(process, index)
+    return index.find_branch_position(condition)
@@ -0,0 +1,280 @@
+from typing import Optional
+
+from bpmn_assistant.core.enums import BPMNElementType
+from bpmn_assistant.core.exceptions import ProcessException
+from bpmn_assistant.services.process_editing.position import Position
+
+# A sequence of elements is identified by the gateway and the index of the branch that
+# contains it. The top-level sequence of the process is identified by None.
+SequenceKey = Optional[tuple[str, int]]
+
+_BRANCHING_GATEWAYS = {
+    BPMNElementType.EXCLUSIVE_GATEWAY.value,
+    BPMNElementType.INCLUSIVE_GATEWAY.value,
+}
+
+
+class IndexEntry:
+    def __init__(
+        self,
+        element_type: str,
+        sequence: SequenceKey,
+        num_branches: int = 0,
+        conditions: Optional[list[str]] = None,
+    ):
+        self.element_type = element_type
+        self.sequence = sequence  # the gateway branch that contains the element
+        self.num_branches = num_branches
+        self.conditions = conditions or []  # branch conditions of a gateway
+
+    def __repr__(self):
+        return f"IndexEntry(element_type={self.element_type}, sequence={self.sequence})"
+
+
+class ProcessIndex:
+    """
+    Index of the element ids of a process, built in a single traversal.
+    Answers existence and position queries without searching the process, and is updated
+    incrementally by the process editing functions.
+    """
+
+    def __init__(self, process: list[dict]):
+        self.process = process  # the version of the process described by the index
+        self._entries: dict[str, IndexEntry] = {}
+        self._sequences: dict[SequenceKey, list[str]] = {}
+        self._offsets: dict[SequenceKey, dict[str, int]] = {}
+        self._branch_conditions: dict[str, list[tuple[str, int]]] = {}
+        self._index_sequence(process, None)
+
+    @classmethod
+    def for_process(
+        cls, process: list[dict], index: Optional["ProcessIndex"] = None
+    ) -> "ProcessIndex":
+        """
+        Return the given index if it describes the given process, otherwise build a new one.
+        """
+        if index is not None and index.process is process:
+            return index
+        return cls(process)
+
+    def __contains__(self, element_id: object) -> bool:
+        return element_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ids(self) -> list[str]:
+        return list(self._entries)
+
+    def gateway_context(self, element_id: str) -> SequenceKey:
+        """
+        Get the gateway and branch index that contain the element (None for top-level elements).
+        """
+        return self._get_entry(element_id).sequence
+
+    def is_nested_in(self, element_id: str, ancestor_id: str) -> bool:
+        """
+        Check whether the element is the ancestor itself or nested in one of its branches.
+        """
+        current_id: Optional[str] = element_id
+        while current_id is not None:
+            if current_id == ancestor_id:
+                return True
+            sequence = self._get_entry(current_id).sequence
+            current_id = sequence[0] if sequence is not None else None
+        return False
+
+    def find_position(
+        self, before_id: Optional[str] = None, after_id: Optional[str] = None
+    ) -> Position:
+        """
+        Find the position to insert a new element based on the before_id or after_id.
+        Args:
+            before_id: The id of the element before which the new element should be inserted.
+            after_id: The id of the element after which the new element should be inserted.
+        Returns:
+            Position: The index and path of the position.
+        """
+        if before_id is None and after_id is None:
+            raise ProcessException("Both before_id and after_id cannot be None")
+        elif before_id is not None and after_id is not None:
+            raise ProcessException("Only one of before_id and after_id can be specified")
+
+        target_id = before_id if before_id is not None else after_id
+        if target_id not in self._entries:
+            raise ProcessException(f"Element with id {target_id} does not exist")
+
+        entry = self._entries[target_id]
+        index = self._offset(entry.sequence, target_id)
+        if after_id is not None:
+            index += 1
+
+        return Position(index, self._sequence_path(entry.sequence))
+
+    def find_branch_position(self, condition: str) -> Position:
+        """
+        Find the position of the first gateway branch with the given condition.
+        Returns:
+            Position: The index of the branch and the path of the branches list.
+        """
+        branches = self._branch_conditions.get(condition)
+        if not branches:
+            raise ProcessException(f"Branch with condition '{condition}' does not exist")
+
+        gateway_id, branch_index = branches[0]
+        gateway_entry = self._entries[gateway_id]
+        path = self._sequence_path(gateway_entry.sequence) + [
+            self._offset(gateway_entry.sequence, gateway_id),
+            "branches",
+        ]
+        return Position(branch_index, path)
+
+    def insert(
+        self,
+        element: dict,
+        process: list[dict],
+        before_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+    ) -> None:
+        """
+        Register an element inserted before or after an existing element.
+        Args:
+            element: The inserted element.
+            process: The new version of the process, which contains the element.
+            before_id: The id of the element before which the element was inserted.
+            after_id: The id of the element after which the element was inserted.
+        """
+        position = self.find_position(before_id=before_id, after_id=after_id)
+        target_id = before_id if before_id is not None else after_id
+        sequence = self._entries[target_id].sequence
+
+        self._sequences[sequence].insert(position.index, element["id"])
+        self._offsets.pop(sequence, None)
+        self._index_element(element, sequence)
+        self.process = process
+
+    def remove(self, element_id: str, process: list[dict]) -> None:
+        """
+        Unregister an element (and all elements nested in it).
+        Args:
+            element_id: The id of the removed element.
+            process: The new version of the process, which no longer contains the element.
+        """
+        entry = self._get_entry(element_id)
+        offset = self._offset(entry.sequence, element_id)
+
+        del self._sequences[entry.sequence][offset]
+        self._offsets.pop(entry.sequence, None)
+        self._unindex_element(element_id)
+        self.process = process
+
+    def replace(self, element: dict, process: list[dict]) -> None:
+        """
+        Register an element that replaced the element with the same id.
+        Args:
+            element: The new element.
+            process: The new version of the process, which contains the new element.
+        """
+        sequence = self._get_entry(element["id"]).sequence
+
+        self._unindex_element(element["id"])
+        self._index_element(element, sequence)
+        self.process = process
+
+    def bind(self, process: list[dict]) -> None:
+        """
+        Register a new version of the process whose structure did not change (e.g. a branch redirect).
+        """
+        self.process = process
+
+    def _get_entry(self, element_id: str) -> IndexEntry:
+        if element_id not in self._entries:
+            raise ProcessException(f"Element with id {element_id} does not exist")
+        return self._entries[element_id]
+
+    def _offset(self, sequence: SequenceKey, element_id: str) -> int:
+        offsets = self._offsets.get(sequence)
+        if offsets is None:
+            offsets = {}
+            for offset, sequence_element_id in enumerate(self._sequences[sequence]):
+                offsets.setdefault(sequence_element_id, offset)
+            self._offsets[sequence] = offsets
+        return offsets[element_id]
+
+    def _sequence_path(self, sequence: SequenceKey) -> list:
+        """
+        Get the path of a sequence within the process.
+        Example: [0, "branches", 1, "path"]
+        """
+        path: list = []
+        while sequence is not None:
+            gateway_id, branch_index = sequence
+            gateway_entry = self._entries[gateway_id]
+            segment: list = [
+                self._offset(gateway_entry.sequence, gateway_id),
+                "branches",
+                branch_index,
+            ]
+            if gateway_entry.element_type in _BRANCHING_GATEWAYS:
+                segment.append("path")
+            path = segment + path
+            sequence = gateway_entry.sequence
+        return path
+
+    def _index_sequence(self, elements: list[dict], sequence: SequenceKey) -> None:
+        self._sequences[sequence] = [element["id"] for element in elements]
+        for element in elements:
+            self._index_element(element, sequence)
+
+    def _index_element(self, element: dict, sequence: SequenceKey) -> None:
+        element_id = element["id"]
+        element_type = element["type"]
+
+        if element_id in self._entries:
+            # Duplicate ids are invalid; the first occurrence wins, as in a linear search
+            return
+
+        if element_type in _BRANCHING_GATEWAYS:
+            branches = element["branches"]
+            conditions = []
+            for branch_index, branch in enumerate(branches):
+                condition = branch.get("condition")
+                if condition is not None:
+                    conditions.append(condition)
+                    self._branch_conditions.setdefault(condition, []).append(
+                        (element_id, branch_index)
+                    )
+            self._entries[element_id] = IndexEntry(
+                element_type, sequence, len(branches), conditions
+            )
+            for branch_index, branch in enumerate(branches):
+                self._index_sequence(branch.get("path", []), (element_id, branch_index))
+        elif element_type == BPMNElementType.PARALLEL_GATEWAY.value:
+            branches = element["branches"]
+            self._entries[element_id] = IndexEntry(element_type, sequence, len(branches))
+            for branch_index, branch in enumerate(branches):
+                self._index_sequence(branch, (element_id, branch_index))
+        else:
+            self._entries[element_id] = IndexEntry(element_type, sequence)
+
+    def _unindex_element(self, element_id: str) -> None:
+        entry = self._entries.pop(element_id)
+
+        for branch_index in range(entry.num_branches):
+            sequence = (element_id, branch_index)
+            for nested_id in self._sequences.pop(sequence, []):
+                nested_entry = self._entries.get(nested_id)
+                if nested_entry is not None and nested_entry.sequence == sequence:
+                    self._unindex_element(nested_id)
+            self._offsets.pop(sequence, None)
+
+        for condition in set(entry.conditions):
+            branches = [
+                branch
+                for branch in self._branch_conditions[condition]
+                if branch[0] != element_id
+            ]
+            if branches:
+                self._branch_conditions[condition] = branches
+            else:
+                del self._branch_conditions[condition]
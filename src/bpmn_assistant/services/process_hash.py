@@ -0,0 +1,52 @@
+import hashlib
+import json
+import re
+from typing import Any
+
+_PROCESS_START = re.compile(rb"<(?:([\w.-]+):)?process[\s/>]")
+_WHITESPACE_BETWEEN_TAGS = re.compile(rb">\s+<")
+
+
+def canonical_process_json(process: Any) -> bytes:
+    """
+    Serialize a process (or any JSON value) canonically: sorted keys, no whitespace and
+    UTF-8, so that equal processes have the same serialization whatever the order of the
+    keys of their elements.
+    """
+    return json.dumps(
+        process, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def process_hash(process: Any) -> str:
+    """
+    Get the content hash (SHA-256, hexadecimal) of the canonical serialization of a process.
+    """
+    return hashlib.sha256(canonical_process_json(process)).hexdigest()
+
+
+def normalize_bpmn_xml(bpmn_xml: str | bytes) -> bytes:
+    """
+    Reduce BPMN XML to what its JSON representation depends on: the first process element
+    (not the collaboration or the diagram interchange section, so moving shapes does not
+    change it), without the whitespace between tags. The text is not parsed, so this is
+    much cheaper than the conversion itself; documents that only differ in the order of
+    the attributes are not recognized as equal.
+    """
+    if isinstance(bpmn_xml, str):
+        bpmn_xml = bpmn_xml.encode("utf-8")
+
+    match = _PROCESS_START.search(bpmn_xml)
+    if match is not None:
+        prefix = match.group(1) + b":" if match.group(1) else b""
+        end = bpmn_xml.find(b"</" + prefix + b"process>", match.end())
+        if end != -1:
+            bpmn_xml = bpmn_xml[match.start() : end]
+    return _WHITESPACE_BETWEEN_TAGS.sub(b"><", bpmn_xml.strip())
+
+
+def bpmn_xml_hash(bpmn_xml: str | bytes) -> str:
+    """
+    Get the content hash (SHA-256, hexadecimal) of the normalized BPMN XML.
+    """
+    return hashlib.sha256(normalize_bpmn_xml(bpmn_xml)).hexdigest()
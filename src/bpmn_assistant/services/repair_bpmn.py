@@ -0,0 +1,282 @@
+import re
+from copy import deepcopy
+from typing import Any, Optional
+
+from bpmn_assistant.config import logger
+from bpmn_assistant.core.enums import BPMNElementType
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.services.validate_bpmn import ValidationReport, get_validation_report
+
+_TASK_TYPES = frozenset(
+    {
+        BPMNElementType.TASK.value,
+        BPMNElementType.USER_TASK.value,
+        BPMNElementType.SERVICE_TASK.value,
+        BPMNElementType.SEND_TASK.value,
+        BPMNElementType.RECEIVE_TASK.value,
+        BPMNElementType.BUSINESS_RULE_TASK.value,
+        BPMNElementType.MANUAL_TASK.value,
+        BPMNElementType.SCRIPT_TASK.value,
+    }
+)
+
+_BRANCHING_GATEWAYS = frozenset(
+    {
+        BPMNElementType.EXCLUSIVE_GATEWAY.value,
+        BPMNElementType.INCLUSIVE_GATEWAY.value,
+    }
+)
+
+_BOOLEAN_STRINGS = {"true": True, "false": False, "yes": True, "no": False}
+
+
+class Repair:
+    """
+    A fix applied to a process by repair_bpmn.
+    """
+
+    def __init__(self, kind: str, path: str, description: str):
+        self.kind = kind  # e.g. "duplicate_id", used as the metric label
+        self.path = path  # JSON path of the repaired part, e.g. "process[2].id"
+        self.description = description
+
+    def __repr__(self):
+        return f"Repair(kind={self.kind}, path={self.path}, description={self.description})"
+
+    def to_dict(self):
+        return {"kind": self.kind, "path": self.path, "description": self.description}
+
+
+def repair_bpmn(process: list) -> tuple[list, list[Repair]]:
+    """
+    Apply deterministic fixes for common defects in LLM-generated processes, so that they do
+    not need another LLM round-trip. Only fixes that cannot change the meaning of the process
+    are applied; everything else (e.g. missing IDs, which the model may refer to elsewhere)
+    is left to validation and the LLM.
+
+    Repaired defects:
+    - duplicate element IDs (later occurrences get a new unique ID)
+    - tasks without a label (the label is derived from the ID)
+    - 'has_join' / 'is_default' given as strings or numbers instead of booleans
+    - gateway branches without a 'path' (an empty path is added)
+    - empty branches of a parallel gateway (removed while at least two branches remain)
+    - missing or additional top-level start events
+
+    Args:
+        process: The BPMN process in JSON format. It is not modified.
+    Returns:
+        The repaired process (a copy) and the list of applied repairs.
+    """
+    if not isinstance(process, list):
+        return process, []
+
+    repairer = _ProcessRepairer(deepcopy(process))
+    repairer.repair()
+
+    repairs_counter = metrics.counter(
+        "bpmn_repairs_total", "Defects in generated processes fixed without calling the LLM"
+    )
+    for repair in repairer.repairs:
+        repairs_counter.inc(kind=repair.kind)
+        logger.info(f"Repaired {repair.path}: {repair.description}")
+
+    return repairer.process, repairer.repairs
+
+
+def get_unrepairable_issues(process: list, is_top_level: bool = True) -> ValidationReport:
+    """
+    Validate the process as it will be after repair_bpmn, without logging or counting the
+    repairs. Used to check partial processes while they are generated, so that generation
+    is only aborted for defects that need the LLM.
+    Args:
+        process: The BPMN process in JSON format (or the elements generated so far).
+        is_top_level: Whether this is the complete top-level process. For partial processes,
+            start events and 'next' references are not checked.
+    Returns:
+        The validation report of the repaired process.
+    """
+    if not isinstance(process, list):
+        return get_validation_report(process, is_top_level)
+
+    repairer = _ProcessRepairer(deepcopy(process))
+    repairer.repair(is_top_level)
+    return get_validation_report(repairer.process, is_top_level)
+
+
+class _ProcessRepairer:
+    def __init__(self, process: list):
+        self.process = process
+        self.repairs: list[Repair] = []
+        self._all_ids = set(_collect_ids(process))
+        self._seen_ids: set[str] = set()
+
+    def repair(self, is_top_level: bool = True) -> None:
+        self._repair_sequence(self.process, "process")
+        if is_top_level:
+            self._repair_start_events()
+
+    def _add(self, kind: str, path: str, description: str) -> None:
+        self.repairs.append(Repair(kind, path, description))
+
+    def _repair_sequence(self, elements: list, path: str) -> None:
+        for index, element in enumerate(elements):
+            if isinstance(element, dict):
+                self._repair_element(element, f"{path}[{index}]")
+
+    def _repair_element(self, element: dict, path: str) -> None:
+        element_id = element.get("id")
+        element_type = element.get("type")
+
+        if isinstance(element_id, str):
+            if element_id in self._seen_ids:
+                new_id = self._unique_id(element_id)
+                element["id"] = new_id
+                self._add(
+                    "duplicate_id",
+                    f"{path}.id",
+                    f"renamed duplicate ID {element_id} to {new_id}",
+                )
+                element_id = new_id
+            self._seen_ids.add(element_id)
+
+        if (
+            element_type in _TASK_TYPES
+            and "label" not in element
+            and isinstance(element_id, str)
+        ):
+            element["label"] = _label_from_id(element_id)
+            self._add("missing_label", f"{path}.label", f"added label '{element['label']}'")
+
+        if element_type in _BRANCHING_GATEWAYS:
+            self._repair_boolean(element, "has_join", path)
+            branches = element.get("branches")
+            if isinstance(branches, list):
+                for branch_index, branch in enumerate(branches):
+                    if isinstance(branch, dict):
+                        self._repair_branch(branch, f"{path}.branches[{branch_index}]")
+        elif element_type == BPMNElementType.PARALLEL_GATEWAY.value:
+            self._repair_parallel_gateway(element, path)
+
+    def _repair_branch(self, branch: dict, path: str) -> None:
+        if "is_default" in branch:
+            self._repair_boolean(branch, "is_default", path)
+        if "path" not in branch or branch["path"] is None:
+            branch["path"] = []
+            self._add("missing_path", f"{path}.path", "added empty path")
+        if isinstance(branch["path"], list):
+            self._repair_sequence(branch["path"], f"{path}.path")
+
+    def _repair_parallel_gateway(self, element: dict, path: str) -> None:
+        branches = element.get("branches")
+        if not isinstance(branches, list):
+            return
+
+        non_empty = [branch for branch in branches if branch != []]
+        if len(non_empty) < len(branches) and len(non_empty) >= 2:
+            element["branches"] = non_empty
+            self._add(
+                "empty_parallel_branch",
+                f"{path}.branches",
+                f"removed {len(branches) - len(non_empty)} empty branch(es)",
+            )
+
+        for branch_index, branch in enumerate(element["branches"]):
+            if isinstance(branch, list):
+                self._repair_sequence(branch, f"{path}.branches[{branch_index}]")
+
+    def _repair_boolean(self, container: dict, key: str, path: str) -> None:
+        value = container.get(key)
+        repaired: Optional[bool] = None
+        if isinstance(value, str) and value.strip().lower() in _BOOLEAN_STRINGS:
+            repaired = _BOOLEAN_STRINGS[value.strip().lower()]
+        elif isinstance(value, int) and not isinstance(value, bool) and value in (0, 1):
+            repaired = bool(value)
+
+        if repaired is not None:
+            container[key] = repaired
+            self._add(
+                f"non_boolean_{key}", f"{path}.{key}", f"converted {value!r} to {repaired}"
+            )
+
+    def _repair_start_events(self) -> None:
+        start_indices = [
+            index
+            for index, element in enumerate(self.process)
+            if isinstance(element, dict)
+            and element.get("type") == BPMNElementType.START_EVENT.value
+        ]
+
+        if not start_indices:
+            start_event = {
+                "type": BPMNElementType.START_EVENT.value,
+                "id": self._unique_id("start"),
+            }
+            self.process.insert(0, start_event)
+            self._add(
+                "missing_start_event", "process[0]", f"added start event {start_event['id']}"
+            )
+            return
+
+        # Keep the first start event; the others cannot be reached from it
+        for index in reversed(start_indices[1:]):
+            removed = self.process.pop(index)
+            if _is_referenced(self.process, removed.get("id")):
+                # Removing the event would break a branch 'next' reference
+                self.process.insert(index, removed)
+                continue
+            self._add(
+                "extra_start_event",
+                f"process[{index}]",
+                f"removed start event {removed.get('id')}",
+            )
+
+    def _unique_id(self, base_id: str) -> str:
+        counter = 2
+        candidate = base_id if base_id not in self._all_ids else f"{base_id}_{counter}"
+        while candidate in self._all_ids:
+            counter += 1
+            candidate = f"{base_id}_{counter}"
+        self._all_ids.add(candidate)
+        return candidate
+
+
+def _collect_ids(elements: Any):
+    if not isinstance(elements, list):
+        return
+    for element in elements:
+        if not isinstance(element, dict):
+            continue
+        if isinstance(element.get("id"), str):
+            yield element["id"]
+        for branch in element.get("branches") or []:
+            if isinstance(branch, dict):
+                yield from _collect_ids(branch.get("path"))
+            else:
+                yield from _collect_ids(branch)
+
+
+def _is_referenced(elements: Any, element_id: Optional[str]) -> bool:
+    if not isinstance(elements, list):
+        return False
+    for element in elements:
+        if not isinstance(element, dict):
+            continue
+        for branch in element.get("branches") or []:
+            if isinstance(branch, dict):
+                if branch.get("next") == element_id:
+                    return True
+                if _is_referenced(branch.get("path"), element_id):
+                    return True
+            elif _is_referenced(branch, element_id):
+                return True
+    return False
+
+
+def _label_from_id(element_id: str) -> str:
+    """
+    Derive a readable label from an element ID, e.g. "reviewOrder_1" -> "Review order 1".
+    """
+    words = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", element_id)
+    words = re.sub(r"([A-Za-z])(\d)", r"\1 \2", words)
+    words = re.sub(r"[_\-\s]+", " ", words).strip().lower()
+    return words.capitalize() if words else element_id
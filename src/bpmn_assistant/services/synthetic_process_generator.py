@@ -0,0 +1,325 @@
+import random
+from collections import defaultdict
+from typing import Any, Optional
+
+from bpmn_assistant.core.enums import BPMNElementType, EventDefinitionType
+from bpmn_assistant.services.bpmn_xml_generator import BpmnXmlGenerator
+
+TASK_TYPES = [
+    BPMNElementType.TASK.value,
+    BPMNElementType.USER_TASK.value,
+    BPMNElementType.SERVICE_TASK.value,
+    BPMNElementType.SEND_TASK.value,
+    BPMNElementType.RECEIVE_TASK.value,
+    BPMNElementType.BUSINESS_RULE_TASK.value,
+    BPMNElementType.MANUAL_TASK.value,
+    BPMNElementType.SCRIPT_TASK.value,
+]
+
+DEFAULT_GATEWAY_MIX = {
+    BPMNElementType.EXCLUSIVE_GATEWAY.value: 0.5,
+    BPMNElementType.INCLUSIVE_GATEWAY.value: 0.2,
+    BPMNElementType.PARALLEL_GATEWAY.value: 0.3,
+}
+
+_VERBS = [
+    "Review", "Approve", "Send", "Receive", "Check", "Prepare", "Validate",
+    "Archive", "Notify", "Calculate", "Update", "Register", "Ship", "Invoice",
+]
+_NOUNS = [
+    "order", "invoice", "request", "contract", "payment", "application",
+    "report", "document", "shipment", "customer data", "claim", "quote",
+]
+
+
+class SyntheticProcessGenerator:
+    """
+    Class to generate synthetic BPMN processes in the JSON representation used by the LLM
+    (see core/schemas.py ProcessModel). Intended for scale and performance testing.
+    The processes are limited to the structures that BpmnJsonGenerator can import, so that
+    their XML can be converted back to JSON.
+    """
+
+    def __init__(
+        self,
+        size: int = 50,
+        max_depth: int = 3,
+        max_branches: int = 3,
+        gateway_ratio: float = 0.15,
+        loop_ratio: float = 0.1,
+        event_ratio: float = 0.1,
+        event_definition_ratio: float = 0.5,
+        end_event_ratio: float = 0.1,
+        gateway_mix: Optional[dict[str, float]] = None,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            size: Total number of elements in the process, including nested elements.
+            max_depth: Maximum gateway nesting depth.
+            max_branches: Maximum number of branches per gateway (at least 2).
+            gateway_ratio: Probability that the next element in a sequence is a gateway.
+            loop_ratio: Probability that an exclusive/inclusive branch loops back via 'next'
+                (only in gateways without join).
+            event_ratio: Probability that the next non-gateway element is an intermediate event.
+            event_definition_ratio: Probability that an event gets a timer or message definition.
+            end_event_ratio: Probability that an exclusive branch ends the process with an end event
+                (only in gateways without join).
+            gateway_mix: Relative weights of the gateway types.
+            seed: Seed for the random number generator (for reproducible processes).
+        """
+        if size < 2:
+            raise ValueError("Process size must be at least 2 (start and end event)")
+        if max_branches < 2:
+            raise ValueError("Gateways must have at least 2 branches")
+
+        self.size = size
+        self.max_depth = max_depth
+        self.max_branches = max_branches
+        self.gateway_ratio = gateway_ratio
+        self.loop_ratio = loop_ratio
+        self.event_ratio = event_ratio
+        self.event_definition_ratio = event_definition_ratio
+        self.end_event_ratio = end_event_ratio
+        self.gateway_mix = gateway_mix or DEFAULT_GATEWAY_MIX
+        self.seed = seed
+
+        self._rng = random.Random(seed)
+        self._counters: dict[str, int] = defaultdict(int)
+
+    def generate(self) -> list[dict[str, Any]]:
+        """
+        Generate a process with exactly `size` elements.
+        Returns:
+            The BPMN process in JSON format.
+        """
+        self._rng = random.Random(self.seed)
+        self._counters = defaultdict(int)
+
+        start_event = self._make_event(BPMNElementType.START_EVENT.value)
+        end_event = self._make_event(BPMNElementType.END_EVENT.value)
+        body = self._generate_sequence(self.size - 2, depth=0, loop_targets=[])
+
+        return [start_event, *body, end_event]
+
+    def generate_xml(self, process: Optional[list[dict[str, Any]]] = None) -> str:
+        """
+        Generate the BPMN XML equivalent of a synthetic process.
+        Args:
+            process: The process to convert. A new process is generated if not provided.
+        Returns:
+            The BPMN XML string.
+        """
+        if process is None:
+            process = self.generate()
+        return BpmnXmlGenerator().create_bpmn_xml(process)
+
+    def _generate_sequence(
+        self, budget: int, depth: int, loop_targets: list[str], must_join: bool = False
+    ) -> list[dict[str, Any]]:
+        """
+        Generate a sequence of elements that uses up exactly `budget` elements.
+        Args:
+            budget: The number of elements (including nested ones) to generate.
+            depth: The current gateway nesting depth.
+            loop_targets: IDs of preceding elements that branches may loop back to.
+            must_join: Whether the sequence must reach the join of an enclosing gateway.
+        """
+        sequence: list[dict[str, Any]] = []
+        loop_targets = list(loop_targets)
+        # The importer (BpmnJsonGenerator) cannot tell a gateway that directly follows the
+        # branches of a gateway without join, or that ends a branch, from a join gateway.
+        # So an activity follows these gateways, and nested sequences end with one
+        reserved = 1 if depth > 0 else 0
+        activity_required = False
+
+        while budget > 0:
+            if (
+                not activity_required
+                and depth < self.max_depth
+                and budget - reserved >= 3
+                and self._rng.random() < self.gateway_ratio
+            ):
+                element, used = self._make_gateway(
+                    budget - reserved, depth, loop_targets, must_join
+                )
+                activity_required = not element.get("has_join", True)
+            else:
+                element, used = self._make_activity(), 1
+                activity_required = False
+                # Only activities are loop targets: a branch looping back to a gateway
+                # would make it a join as well
+                loop_targets.append(element["id"])
+
+            sequence.append(element)
+            budget -= used
+
+        return sequence
+
+    def _make_activity(self) -> dict[str, Any]:
+        if self._rng.random() < self.event_ratio:
+            event_type = self._rng.choice(
+                [
+                    BPMNElementType.INTERMEDIATE_THROW_EVENT.value,
+                    BPMNElementType.INTERMEDIATE_CATCH_EVENT.value,
+                ]
+            )
+            return self._make_event(event_type)
+
+        task_type = self._rng.choice(TASK_TYPES)
+        return {
+            "type": task_type,
+            "id": self._next_id("task"),
+            "label": self._make_label(),
+        }
+
+    def _make_event(self, event_type: str) -> dict[str, Any]:
+        event: dict[str, Any] = {"type": event_type, "id": self._next_id(event_type)}
+
+        allowed_definitions = {
+            BPMNElementType.START_EVENT.value: [
+                EventDefinitionType.TIMER.value,
+                EventDefinitionType.MESSAGE.value,
+            ],
+            BPMNElementType.END_EVENT.value: [EventDefinitionType.MESSAGE.value],
+            BPMNElementType.INTERMEDIATE_THROW_EVENT.value: [
+                EventDefinitionType.MESSAGE.value
+            ],
+            BPMNElementType.INTERMEDIATE_CATCH_EVENT.value: [
+                EventDefinitionType.TIMER.value,
+                EventDefinitionType.MESSAGE.value,
+            ],
+        }[event_type]
+
+        if self._rng.random() < self.event_definition_ratio:
+            event["eventDefinition"] = self._rng.choice(allowed_definitions)
+            event["label"] = self._make_label()
+
+        return event
+
+    def _make_gateway(
+        self, budget: int, depth: int, loop_targets: list[str], must_join: bool
+    ) -> tuple[dict[str, Any], int]:
+        """
+        Generate a gateway whose subtree uses at most `budget` elements.
+        The importer finds a join as the element that all paths from the gateway reach, so
+        the branches of a gateway with join (at any depth) neither loop back nor end the
+        process.
+        Returns:
+            The gateway and the number of elements it uses (including itself).
+        """
+        gateway_types = list(self.gateway_mix.keys())
+        weights = list(self.gateway_mix.values())
+        gateway_type = self._rng.choices(gateway_types, weights=weights)[0]
+
+        num_branches = self._rng.randint(2, self.max_branches)
+        inner_budget = self._rng.randint(0, budget - 1)
+
+        if gateway_type == BPMNElementType.PARALLEL_GATEWAY.value:
+            # Every parallel branch needs at least one element
+            num_branches = min(num_branches, budget - 1)
+            inner_budget = max(inner_budget, num_branches)
+            branch_budgets = self._split_budget(inner_budget, num_branches, minimum=1)
+            gateway = {
+                "type": gateway_type,
+                "id": self._next_id("parallel"),
+                "branches": [
+                    self._generate_sequence(
+                        branch_budget, depth + 1, loop_targets=[], must_join=True
+                    )
+                    for branch_budget in branch_budgets
+                ],
+            }
+            return gateway, inner_budget + 1
+
+        is_inclusive = gateway_type == BPMNElementType.INCLUSIVE_GATEWAY.value
+        gateway_id = self._next_id("inclusive" if is_inclusive else "exclusive")
+        has_join = self._rng.random() < 0.5
+        has_default = is_inclusive and self._rng.random() < 0.5
+
+        # An empty branch leads to the element after the gateway, not to its join, so only
+        # gateways without join have empty branches (and at least their first one is not)
+        num_branches = min(num_branches, budget - 1)
+        minimum = 1 if has_join else 0
+        inner_budget = max(inner_budget, num_branches * minimum, 1)
+        branch_budgets = self._split_budget(inner_budget, num_branches, minimum=minimum)
+        if branch_budgets[0] == 0:
+            nonempty = next(index for index, size in enumerate(branch_budgets) if size)
+            branch_budgets[0], branch_budgets[nonempty] = branch_budgets[nonempty], 0
+
+        branch_must_join = must_join or has_join
+        branches = []
+        for branch_index, branch_budget in enumerate(branch_budgets):
+            is_default = has_default and branch_index == num_branches - 1
+            # The first branch always continues forward (to the join or the next element),
+            # so that the rest of the process can be reached
+            loops_back = (
+                branch_index > 0
+                and not branch_must_join
+                and loop_targets
+                and self._rng.random() < self.loop_ratio
+            )
+            ends_process = (
+                branch_index > 0
+                and not is_inclusive
+                and not branch_must_join
+                and not loops_back
+                and branch_budget > 0
+                and self._rng.random() < self.end_event_ratio
+            )
+
+            path_budget = branch_budget - 1 if ends_process else branch_budget
+            path = self._generate_sequence(
+                path_budget, depth + 1, loop_targets, branch_must_join
+            )
+            if ends_process:
+                path.append(self._make_event(BPMNElementType.END_EVENT.value))
+
+            branch: dict[str, Any] = {"path": path}
+            if is_default:
+                branch["is_default"] = True
+            else:
+                branch["condition"] = self._make_condition(gateway_id, branch_index)
+            if loops_back:
+                branch["next"] = self._rng.choice(loop_targets)
+
+            branches.append(branch)
+
+        gateway = {
+            "type": gateway_type,
+            "id": gateway_id,
+            "label": f"{self._make_label()}?",
+            "has_join": has_join,
+            "branches": branches,
+        }
+        return gateway, inner_budget + 1
+
+    def _split_budget(self, total: int, parts: int, minimum: int) -> list[int]:
+        """
+        Randomly split `total` into `parts` non-negative integers, each at least `minimum`.
+        """
+        remaining = total - minimum * parts
+        cuts = sorted(self._rng.randint(0, remaining) for _ in range(parts - 1))
+        bounds = [0, *cuts, remaining]
+        return [minimum + bounds[i + 1] - bounds[i] for i in range(parts)]
+
+    def _next_id(self, prefix: str) -> str:
+        self._counters[prefix] += 1
+        return f"{prefix}{self._counters[prefix]}"
+
+    def _make_label(self) -> str:
+        return f"{self._rng.choice(_VERBS)} {self._rng.choice(_NOUNS)}"
+
+    def _make_condition(self, gateway_id: str, branch_index: int) -> str:
+        return f"{self._make_label()} ({gateway_id}/{branch_index + 1})"
+
+
+def generate_process(**kwargs: Any) -> list[dict[str, Any]]:
+    """
+    Generate a synthetic BPMN process.
+    Args:
+        **kwargs: Arguments passed to SyntheticProcessGenerator.
+    Returns:
+        The BPMN process in JSON format.
+    """
+    return SyntheticProcessGenerator(**kwargs).generate()
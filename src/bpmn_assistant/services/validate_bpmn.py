@@ -1,9 +1,102 @@
-from pydantic import ValidationError
+from typing import Any, Optional
 
-from bpmn_assistant.core.enums import BPMNElementType
-from bpmn_assistant.core.schemas import BPMNTask, ExclusiveGateway, InclusiveGateway, ParallelGateway
+from bpmn_assistant.core.enums import BPMNElementType, EventDefinitionType
+from bpmn_assistant.core.tracing import traced
 
+# Lookup tables are built once at import time instead of for every validated element
+SUPPORTED_ELEMENT_TYPES = [e.value for e in BPMNElementType]
 
+_SUPPORTED_ELEMENT_TYPES = frozenset(SUPPORTED_ELEMENT_TYPES)
+
+_TASK_TYPES = frozenset(
+    {
+        BPMNElementType.TASK.value,
+        BPMNElementType.USER_TASK.value,
+        BPMNElementType.SERVICE_TASK.value,
+        BPMNElementType.SEND_TASK.value,
+        BPMNElementType.RECEIVE_TASK.value,
+        BPMNElementType.BUSINESS_RULE_TASK.value,
+        BPMNElementType.MANUAL_TASK.value,
+        BPMNElementType.SCRIPT_TASK.value,
+    }
+)
+
+_EVENT_TYPES = frozenset(
+    {
+        BPMNElementType.START_EVENT.value,
+        BPMNElementType.END_EVENT.value,
+        BPMNElementType.INTERMEDIATE_THROW_EVENT.value,
+        BPMNElementType.INTERMEDIATE_CATCH_EVENT.value,
+    }
+)
+
+_EVENT_DEFINITIONS = [d.value for d in EventDefinitionType if d.value is not None]
+
+_EVENT_DEFINITION_SET = frozenset(_EVENT_DEFINITIONS)
+
+
+class ValidationIssue:
+    """
+    A single violation found in a process.
+    """
+
+    def __init__(self, path: str, message: str):
+        self.path = path  # JSON path of the offending element, e.g. "process[2].branches[0]"
+        self.message = message
+
+    def __repr__(self):
+        return f"ValidationIssue(path={self.path}, message={self.message})"
+
+    def to_dict(self):
+        return {"path": self.path, "message": self.message}
+
+
+class ValidationReport:
+    """
+    All violations found in a process, in the order of the elements in the process.
+    """
+
+    def __init__(self, issues: Optional[list[ValidationIssue]] = None):
+        self.issues = issues or []
+
+    def __repr__(self):
+        return f"ValidationReport(issues={self.issues})"
+
+    def __len__(self):
+        return len(self.issues)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.issues
+
+    @property
+    def messages(self) -> list[str]:
+        return [issue.message for issue in self.issues]
+
+    def to_dict(self):
+        return {"issues": [issue.to_dict() for issue in self.issues]}
+
+    def raise_if_invalid(self) -> None:
+        """
+        Raises:
+            BpmnValidationError: If the report contains any issue.
+        """
+        if self.issues:
+            raise BpmnValidationError(self)
+
+
+class BpmnValidationError(ValueError):
+    """
+    Raised when a process is invalid. The message is the first issue (for callers that only
+    show one error); the full report is available as `report`.
+    """
+
+    def __init__(self, report: ValidationReport):
+        super().__init__(report.issues[0].message)
+        self.report = report
+
+
+@traced("validate_bpmn")
 def validate_bpmn(process: list, is_top_level: bool = True) -> None:
     """
     Validate the BPMN process.
@@ -11,134 +104,309 @@ def validate_bpmn(process: list, is_top_level: bool = True) -> None:
         process: The BPMN process in JSON format.
         is_top_level: Whether this is the top-level process (not a branch).
     Raises:
-        ValueError: If the BPMN process, or any of its elements, is invalid.
+        BpmnValidationError: If the BPMN process, or any of its elements, is invalid.
+            The message describes the first error found, the report contains all of them.
     """
-    seen_ids = set()
-    start_event_count = 0
+    get_validation_report(process, is_top_level).raise_if_invalid()
 
-    for element in process:
-        validate_element(element)
 
-        if element["id"] in seen_ids:
-            raise ValueError(f"Duplicate element ID found: {element['id']}")
-        seen_ids.add(element["id"])
+def validate_element(element: dict, path: str = "element") -> None:
+    """
+    Validate the BPMN element (including the elements nested in its branches).
+    Args:
+        element: The BPMN element in JSON format.
+        path: The JSON path of the element, used in the validation report.
+    Raises:
+        BpmnValidationError: If the BPMN element is invalid.
+            The message describes the first error found, the report contains all of them.
+    """
+    validator = _ProcessValidator()
+    validator.validate_element(element, path)
+    ValidationReport(validator.issues).raise_if_invalid()
 
-        # Count start events at the top level
-        if is_top_level and element["type"] == BPMNElementType.START_EVENT.value:
-            start_event_count += 1
 
-        if element["type"] == BPMNElementType.EXCLUSIVE_GATEWAY.value:
-            for branch in element["branches"]:
-                validate_bpmn(branch["path"], is_top_level=False)
-        if element["type"] == BPMNElementType.INCLUSIVE_GATEWAY.value:
-            for branch in element["branches"]:
-                validate_bpmn(branch["path"], is_top_level=False)
-        if element["type"] == BPMNElementType.PARALLEL_GATEWAY.value:
-            for branch in element["branches"]:
-                validate_bpmn(branch, is_top_level=False)
+def get_validation_report(
+    process: list, is_top_level: bool = True, path: str = "process"
+) -> ValidationReport:
+    """
+    Validate the BPMN process in a single traversal and collect all errors.
+    Args:
+        process: The BPMN process in JSON format.
+        is_top_level: Whether this is the top-level process (not a branch).
+            Only the top-level process must have exactly one start event, and only in the
+            top-level process the 'next' references of gateway branches can be resolved.
+        path: The JSON path of the process, used as the prefix of the issue paths.
+    Returns:
+        The validation report (empty if the process is valid).
+    """
+    validator = _ProcessValidator()
+    validator.validate_process(process, is_top_level, path)
+    return ValidationReport(validator.issues)
+
 
-    # Check for exactly one start event at the top level
-    if is_top_level and start_event_count != 1:
-        raise ValueError(f"Process must contain exactly one start event, found {start_event_count}")
+def get_validation_errors(process: list, is_top_level: bool = True) -> list[str]:
+    """
+    Validate the BPMN process and collect all error messages.
+    Returns:
+        The error messages, in the order of the elements in the process (empty if valid).
+    """
+    return get_validation_report(process, is_top_level).messages
 
 
-def validate_element(element: dict) -> None:
+class _ProcessValidator:
     """
-    Validate the BPMN element.
-    Args:
-        element: The BPMN element in JSON format.
-    Raises:
-        ValueError: If the BPMN element is invalid.
+    Checks the elements of a process in one traversal. Element IDs are collected across all
+    nesting levels, so duplicates in different branches and dangling 'next' references of
+    gateway branches are detected as well.
     """
-    if "id" not in element:
-        raise ValueError(f"Element is missing an ID: {element}")
-    elif "type" not in element:
-        raise ValueError(f"Element is missing a type: {element}")
 
-    supported_elements = [e.value for e in BPMNElementType]
+    def __init__(self):
+        self.issues: list[ValidationIssue] = []
+        self._seen_ids: set[str] = set()
+        # (path of the branch, gateway id, branch condition, referenced id)
+        self._next_references: list[tuple[str, str, Any, str]] = []
 
-    if element["type"] not in supported_elements:
-        raise ValueError(
-            f"Unsupported element type: {element['type']}. Supported types: {supported_elements}"
-        )
+    def validate_process(self, process: Any, is_top_level: bool, path: str) -> None:
+        if not isinstance(process, list):
+            self._add(path, f"Process must be a list of elements: {process}")
+            return
 
-    if element["type"] in [
-        BPMNElementType.TASK.value,
-        BPMNElementType.USER_TASK.value,
-        BPMNElementType.SERVICE_TASK.value,
-        BPMNElementType.SEND_TASK.value,
-        BPMNElementType.RECEIVE_TASK.value,
-        BPMNElementType.BUSINESS_RULE_TASK.value,
-        BPMNElementType.MANUAL_TASK.value,
-        BPMNElementType.SCRIPT_TASK.value,
-    ]:
-        _validate_task(element)
-
-    elif element["type"] == BPMNElementType.EXCLUSIVE_GATEWAY.value:
-        _validate_exclusive_gateway(element)
-
-    elif element["type"] == BPMNElementType.INCLUSIVE_GATEWAY.value:
-        _validate_inclusive_gateway(element)
-
-    elif element["type"] == BPMNElementType.PARALLEL_GATEWAY.value:
-        _validate_parallel_gateway(element)
-
-
-def _validate_task(element: dict) -> None:
-    if "label" not in element:
-        raise ValueError(f"Task element is missing a label: {element}")
-
-    try:
-        BPMNTask.model_validate(element)
-    except ValidationError:
-        raise ValueError(f"Invalid task element: {element}")
-
-
-def _validate_exclusive_gateway(element: dict) -> None:
-    if "label" not in element:
-        raise ValueError(f"Exclusive gateway is missing a label: {element}")
-    if "branches" not in element or not isinstance(element["branches"], list):
-        raise ValueError(
-            f"Exclusive gateway is missing or has invalid 'branches': {element}"
-        )
-    for branch in element["branches"]:
-        if "condition" not in branch or "path" not in branch:
-            raise ValueError(f"Invalid branch in exclusive gateway: {branch}")
-
-    try:
-        ExclusiveGateway.model_validate(element)
-    except ValidationError:
-        raise ValueError(f"Invalid exclusive gateway element: {element}")
-
-
-def _validate_inclusive_gateway(element: dict) -> None:
-    if "label" not in element:
-        raise ValueError(f"Inclusive gateway is missing a label: {element}")
-    if "branches" not in element or not isinstance(element["branches"], list):
-        raise ValueError(
-            f"Inclusive gateway is missing or has invalid 'branches': {element}"
-        )
-    for branch in element["branches"]:
-        # Default branches don't require a condition, but all branches need a path
-        if "path" not in branch:
-            raise ValueError(f"Invalid branch in inclusive gateway (missing 'path'): {branch}")
-        # Non-default branches must have a condition
-        if not branch.get("is_default", False) and "condition" not in branch:
-            raise ValueError(f"Invalid branch in inclusive gateway (non-default branch missing 'condition'): {branch}")
-
-    try:
-        InclusiveGateway.model_validate(element)
-    except ValidationError:
-        raise ValueError(f"Invalid inclusive gateway element: {element}")
-
-
-def _validate_parallel_gateway(element: dict) -> None:
-    if "branches" not in element or not isinstance(element["branches"], list):
-        raise ValueError(
-            f"Parallel gateway has missing or invalid 'branches': {element}"
-        )
-
-    try:
-        ParallelGateway.model_validate(element)
-    except ValidationError:
-        raise ValueError(f"Invalid parallel gateway element: {element}")
+        self._validate_sequence(process, path)
+
+        if is_top_level:
+            start_event_count = sum(
+                1
+                for element in process
+                if isinstance(element, dict)
+                and element.get("type") == BPMNElementType.START_EVENT.value
+            )
+            if start_event_count != 1:
+                self._add(
+                    path,
+                    f"Process must contain exactly one start event, found {start_event_count}",
+                )
+
+            for branch_path, gateway_id, condition, next_id in self._next_references:
+                if next_id not in self._seen_ids:
+                    self._add(
+                        f"{branch_path}.next",
+                        f"Branch '{condition}' of gateway '{gateway_id}' refers to a "
+                        f"non-existent next element: {next_id}",
+                    )
+
+    def validate_element(self, element: Any, path: str) -> None:
+        if not isinstance(element, dict):
+            self._add(path, f"Element must be a JSON object: {element}")
+            return
+        if "id" not in element:
+            self._add(path, f"Element is missing an ID: {element}")
+            return
+        if "type" not in element:
+            self._add(path, f"Element is missing a type: {element}")
+            return
+
+        element_id = element["id"]
+        element_type = element["type"]
+
+        if not isinstance(element_id, str):
+            self._add(f"{path}.id", f"Element ID must be a string: {element}")
+        elif element_id in self._seen_ids:
+            self._add(f"{path}.id", f"Duplicate element ID found: {element_id}")
+        else:
+            self._seen_ids.add(element_id)
+
+        # Values such as lists are unhashable, so the type is checked before the lookups
+        if not isinstance(element_type, str):
+            self._add(f"{path}.type", f"Element type must be a string: {element}")
+        elif element_type not in _SUPPORTED_ELEMENT_TYPES:
+            self._add(
+                f"{path}.type",
+                f"Unsupported element type: {element_type}. "
+                f"Supported types: {SUPPORTED_ELEMENT_TYPES}",
+            )
+        elif element_type in _TASK_TYPES:
+            self._validate_task(element, path)
+        elif element_type in _EVENT_TYPES:
+            self._validate_event(element, path)
+        elif element_type == BPMNElementType.EXCLUSIVE_GATEWAY.value:
+            self._validate_exclusive_gateway(element, path)
+        elif element_type == BPMNElementType.INCLUSIVE_GATEWAY.value:
+            self._validate_inclusive_gateway(element, path)
+        elif element_type == BPMNElementType.PARALLEL_GATEWAY.value:
+            self._validate_parallel_gateway(element, path)
+
+    def _add(self, path: str, message: str) -> None:
+        self.issues.append(ValidationIssue(path, message))
+
+    def _validate_sequence(self, elements: list, path: str) -> None:
+        for index, element in enumerate(elements):
+            self.validate_element(element, f"{path}[{index}]")
+
+    def _validate_task(self, element: dict, path: str) -> None:
+        if "label" not in element:
+            self._add(path, f"Task element is missing a label: {element}")
+        elif not isinstance(element["label"], str):
+            self._add(
+                f"{path}.label", f"Invalid task element (label must be a string): {element}"
+            )
+
+    def _validate_event(self, element: dict, path: str) -> None:
+        label = element.get("label")
+        if label is not None and not isinstance(label, str):
+            self._add(
+                f"{path}.label", f"Invalid event element (label must be a string): {element}"
+            )
+
+        event_definition = element.get("eventDefinition")
+        if event_definition is None:
+            return
+        if not isinstance(event_definition, str):
+            self._add(
+                f"{path}.eventDefinition",
+                f"Invalid event element (eventDefinition must be a string): {element}",
+            )
+        elif event_definition not in _EVENT_DEFINITION_SET:
+            self._add(
+                f"{path}.eventDefinition",
+                f"Unsupported event definition: {event_definition}. "
+                f"Supported event definitions: {_EVENT_DEFINITIONS}",
+            )
+
+    def _validate_gateway_header(self, element: dict, path: str, gateway_name: str) -> None:
+        if "label" not in element:
+            self._add(path, f"{gateway_name} is missing a label: {element}")
+        elif not isinstance(element["label"], str):
+            self._add(
+                f"{path}.label",
+                f"{gateway_name} '{element['id']}' has an invalid label (must be a string)",
+            )
+
+        # Strict check: a string such as "false" would be treated as truthy when generating XML
+        if not isinstance(element.get("has_join"), bool):
+            self._add(
+                f"{path}.has_join",
+                f"{gateway_name} '{element['id']}' must have a boolean 'has_join' field",
+            )
+
+    def _validate_exclusive_gateway(self, element: dict, path: str) -> None:
+        self._validate_gateway_header(element, path, "Exclusive gateway")
+
+        branches = element.get("branches")
+        if not isinstance(branches, list):
+            self._add(
+                f"{path}.branches",
+                f"Exclusive gateway is missing or has invalid 'branches': {element}",
+            )
+            return
+
+        for index, branch in enumerate(branches):
+            branch_path = f"{path}.branches[{index}]"
+            if not isinstance(branch, dict) or "condition" not in branch or "path" not in branch:
+                self._add(branch_path, f"Invalid branch in exclusive gateway: {branch}")
+                continue
+            if not isinstance(branch["condition"], str):
+                self._add(
+                    f"{branch_path}.condition",
+                    f"Invalid branch in exclusive gateway (condition must be a string): {branch}",
+                )
+            self._validate_branch(element, branch, branch_path)
+
+    def _validate_inclusive_gateway(self, element: dict, path: str) -> None:
+        self._validate_gateway_header(element, path, "Inclusive gateway")
+
+        branches = element.get("branches")
+        if not isinstance(branches, list):
+            self._add(
+                f"{path}.branches",
+                f"Inclusive gateway is missing or has invalid 'branches': {element}",
+            )
+            return
+
+        default_count = 0
+        for index, branch in enumerate(branches):
+            branch_path = f"{path}.branches[{index}]"
+            # Default branches don't require a condition, but all branches need a path
+            if not isinstance(branch, dict) or "path" not in branch:
+                self._add(
+                    branch_path,
+                    f"Invalid branch in inclusive gateway (missing 'path'): {branch}",
+                )
+                continue
+
+            is_default = branch.get("is_default", False)
+            if not isinstance(is_default, bool):
+                self._add(
+                    f"{branch_path}.is_default",
+                    f"Invalid branch in inclusive gateway ('is_default' must be a boolean): {branch}",
+                )
+            elif is_default:
+                default_count += 1
+
+            condition = branch.get("condition")
+            # Non-default branches must have a condition
+            if not is_default and condition is None:
+                self._add(
+                    branch_path,
+                    f"Invalid branch in inclusive gateway (non-default branch missing 'condition'): {branch}",
+                )
+            elif condition is not None and not isinstance(condition, str):
+                self._add(
+                    f"{branch_path}.condition",
+                    f"Invalid branch in inclusive gateway (condition must be a string): {branch}",
+                )
+
+            self._validate_branch(element, branch, branch_path)
+
+        if default_count > 1:
+            self._add(
+                f"{path}.branches",
+                f"Inclusive gateway '{element['id']}' has {default_count} default branches, "
+                f"at most one is allowed",
+            )
+
+    def _validate_parallel_gateway(self, element: dict, path: str) -> None:
+        branches = element.get("branches")
+        if not isinstance(branches, list):
+            self._add(
+                f"{path}.branches",
+                f"Parallel gateway has missing or invalid 'branches': {element}",
+            )
+            return
+
+        for index, branch in enumerate(branches):
+            branch_path = f"{path}.branches[{index}]"
+            if not isinstance(branch, list):
+                self._add(
+                    branch_path,
+                    f"Parallel gateway '{element['id']}' has an invalid branch "
+                    f"(must be a list of elements): {branch}",
+                )
+            elif not branch:
+                self._add(branch_path, f"Parallel gateway '{element['id']}' has an empty branch")
+            else:
+                self._validate_sequence(branch, branch_path)
+
+    def _validate_branch(self, gateway: dict, branch: dict, branch_path: str) -> None:
+        path = branch["path"]
+        if not isinstance(path, list):
+            self._add(
+                f"{branch_path}.path",
+                f"Branch '{branch.get('condition')}' of gateway '{gateway['id']}' has an "
+                f"invalid 'path' (must be a list of elements)",
+            )
+        else:
+            self._validate_sequence(path, f"{branch_path}.path")
+
+        next_id = branch.get("next")
+        if next_id is None:
+            return
+        if not isinstance(next_id, str):
+            self._add(
+                f"{branch_path}.next",
+                f"Branch '{branch.get('condition')}' of gateway '{gateway['id']}' has an "
+                f"invalid 'next' (must be an element ID): {next_id}",
+            )
+        else:
+            self._next_references.append(
+                (branch_path, gateway["id"], branch.get("condition"), next_id)
+            )
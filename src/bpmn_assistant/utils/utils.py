@@ -6,10 +6,8 @@ from dotenv import load_dotenv
 
 import litellm
 
-for mod in litellm.model_list_set:
-    if mod.startswith('olla'): print(mod)
-
-from bpmn_assistant.core import LLMFacade, MessageItem, MessageImage
+from bpmn_assistant.config import logger
+from bpmn_assistant.core import LLMFacade, LLMRouter, MessageItem, MessageImage
 
 from bpmn_assistant.core.enums import (
     AnthropicModels,
@@ -69,6 +67,55 @@ def get_llm_facade(model: str, output_mode: OutputMode = OutputMode.JSON, api_ke
     )
 
 
+def get_llm_router(
+    model: str,
+    output_mode: OutputMode = OutputMode.JSON,
+    api_keys: dict[str, str] | None = None,
+    fallback_models: list[str] | None = None,
+) -> LLMFacade | LLMRouter:
+    """
+    Get an LLM facade that falls back to other models if the requested model fails.
+    Configured with the environment variables:
+    - BPMN_FALLBACK_MODELS: comma-separated fallback models (if fallback_models is not given)
+    - BPMN_LLM_TIMEOUT: seconds after which a call falls back to the next model
+    - BPMN_HEDGE_REQUESTS: send a hedged request to the next model when a call is slower
+      than the p95 latency of its model
+    Args:
+        model: The preferred model
+        output_mode: The output mode for the LLM response (JSON or text)
+        api_keys: Optional dictionary of API keys from user (takes precedence over env vars)
+        fallback_models: The models to fall back to, in order
+    Returns:
+        The LLM facade of the model if no fallback or timeout is configured, otherwise an
+        LLMRouter over the model and the fallback models whose API keys are available
+    """
+    facades = [get_llm_facade(model, output_mode, api_keys=api_keys)]
+
+    if fallback_models is None:
+        fallback_models = [
+            fallback_model.strip()
+            for fallback_model in os.getenv("BPMN_FALLBACK_MODELS", "").split(",")
+            if fallback_model.strip()
+        ]
+    for fallback_model in fallback_models:
+        if fallback_model == model:
+            continue
+        try:
+            facades.append(get_llm_facade(fallback_model, output_mode, api_keys=api_keys))
+        except Exception as e:
+            logger.warning(f"Skipping fallback model {fallback_model}: {e}")
+
+    timeout = float(os.environ["BPMN_LLM_TIMEOUT"]) if os.getenv("BPMN_LLM_TIMEOUT") else None
+    if len(facades) == 1 and timeout is None:
+        return facades[0]
+
+    return LLMRouter(
+        facades,
+        timeout=timeout,
+        hedge=os.getenv("BPMN_HEDGE_REQUESTS", "false").lower() in ("1", "true", "yes"),
+    )
+
+
 def get_available_providers(api_keys: dict[str, str] | None = None) -> dict:
     """
     Get available providers from user-provided keys or environment variables.
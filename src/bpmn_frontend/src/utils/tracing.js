@@ -0,0 +1,31 @@
+/**
+ * W3C trace context for the requests of a user message, so that the calls to the
+ * assistant API and to the layout server of one message belong to the same trace
+ */
+
+let currentTraceId = null;
+
+const randomHex = (bytes) =>
+  Array.from(crypto.getRandomValues(new Uint8Array(bytes)), (byte) =>
+    byte.toString(16).padStart(2, '0')
+  ).join('');
+
+/**
+ * Start a new trace (e.g. when the user sends a message)
+ * @returns {string} The trace ID
+ */
+export function startTrace() {
+  currentTraceId = randomHex(16);
+  return currentTraceId;
+}
+
+/**
+ * Get the headers that propagate the current trace to a request
+ * @returns {Object} The traceparent header, with a new span ID per request
+ */
+export function traceHeaders() {
+  if (!currentTraceId) {
+    startTrace();
+  }
+  return { traceparent: `00-${currentTraceId}-${randomHex(8)}-01` };
+}
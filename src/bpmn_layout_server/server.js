@@ -1,16 +1,28 @@
 const express = require('express');
 const bodyParser = require('body-parser');
+const zlib = require('zlib');
 const { layoutProcess } = require('bpmn-auto-layout');
 
+// Optional OpenTelemetry: spans are recorded if the SDK is registered, e.g. with
+// node --require @opentelemetry/auto-instrumentations-node/register server.js
+let otel = null;
+try {
+  otel = require('@opentelemetry/api');
+} catch (error) {
+  // Tracing is disabled
+}
+
 const app = express();
 const port = process.env.PORT || 3001;
+const compressionMinSize = Number(process.env.COMPRESSION_MIN_SIZE || 1024);
 
 app.use(bodyParser.json());
+app.use(compression);
 
 app.use((req, res, next) => {
   res.header('Access-Control-Allow-Origin', '*');
   res.header('Access-Control-Allow-Methods', 'GET, POST');
-  res.header('Access-Control-Allow-Headers', 'Content-Type');
+  res.header('Access-Control-Allow-Headers', 'Content-Type, traceparent, tracestate');
   next();
 });
 
@@ -21,16 +33,91 @@ app.get('/', (req, res) => {
 
 app.post('/process-bpmn', async (req, res) => {
   const { bpmnXml } = req.body;
+  const start = process.hrtime.bigint();
 
   try {
-    const layoutedXml = await layoutProcess(bpmnXml);
+    const layoutedXml = await traced('layoutProcess', req.headers, () =>
+      layoutProcess(bpmnXml)
+    );
     res.json({ layoutedXml });
   } catch (error) {
     console.error('Error processing BPMN XML:', error);
     res.status(500).send('Failed to process BPMN XML');
+  } finally {
+    // The trace ID of the caller correlates the layout with the assistant API requests
+    const traceId = (req.headers.traceparent || '').split('-')[1] || '-';
+    const durationMs = Number(process.hrtime.bigint() - start) / 1e6;
+    console.log(`layoutProcess trace=${traceId} duration=${durationMs.toFixed(1)}ms`);
   }
 });
 
+// Compress the responses larger than compressionMinSize with brotli or gzip, depending on
+// the Accept-Encoding header. The responses are sent in one piece (res.send), so they are
+// compressed at once.
+function compression(req, res, next) {
+  const send = res.send;
+  res.send = function (body) {
+    const encoding = selectEncoding(req.headers['accept-encoding'] || '');
+    const isText = typeof body === 'string' || Buffer.isBuffer(body);
+    if (!encoding || !isText || res.getHeader('Content-Encoding')) {
+      return send.call(this, body);
+    }
+    const buffer = Buffer.isBuffer(body) ? body : Buffer.from(body);
+    if (buffer.length < compressionMinSize) {
+      return send.call(this, body);
+    }
+
+    if (!res.getHeader('Content-Type')) {
+      res.type('text/plain');
+    }
+    res.vary('Accept-Encoding');
+    res.setHeader('Content-Encoding', encoding);
+    const compressed =
+      encoding === 'br'
+        ? zlib.brotliCompressSync(buffer, {
+            params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 5 },
+          })
+        : zlib.gzipSync(buffer, { level: 6 });
+    return send.call(this, compressed);
+  };
+  next();
+}
+
+function selectEncoding(acceptEncoding) {
+  const accepted = new Set();
+  for (const item of acceptEncoding.toLowerCase().split(',')) {
+    const [coding, params = ''] = item.split(';').map((part) => part.trim());
+    if (params.startsWith('q=') && !(Number(params.slice(2)) > 0)) {
+      continue;
+    }
+    accepted.add(coding);
+  }
+  if (accepted.has('br') || accepted.has('*')) {
+    return 'br';
+  }
+  return accepted.has('gzip') ? 'gzip' : null;
+}
+
+// Run fn in a span that continues the trace of the caller (if tracing is enabled)
+async function traced(name, headers, fn) {
+  if (!otel) {
+    return fn();
+  }
+  const parent = otel.propagation.extract(otel.context.active(), headers);
+  const tracer = otel.trace.getTracer('bpmn-layout-server');
+  return tracer.startActiveSpan(name, {}, parent, async (span) => {
+    try {
+      return await fn();
+    } catch (error) {
+      span.recordException(error);
+      span.setStatus({ code: otel.SpanStatusCode.ERROR });
+      throw error;
+    } finally {
+      span.end();
+    }
+  });
+}
+
 app.listen(port, '0.0.0.0', () => {
   console.log(`Server running at http://0.0.0.0:${port}`);
 });
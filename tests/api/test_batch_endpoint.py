@@ -0,0 +1,51 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from bpmn_assistant.app import app
+
+AUTHORIZATION = {"Authorization": "Bearer secret"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("BPMN_ADMIN_TOKEN", "secret")
+    monkeypatch.setenv("BPMN_BATCH_MAX_CONCURRENCY", "8")
+    return TestClient(app)
+
+
+class TestBatchCreateEndpoint:
+
+    def test_not_available_without_admin_token(self, client, monkeypatch):
+        monkeypatch.delenv("BPMN_ADMIN_TOKEN")
+
+        response = client.post("/batch/create?models=gpt-4o", content=b"", headers=AUTHORIZATION)
+
+        assert response.status_code == 404
+
+    def test_invalid_token(self, client):
+        response = client.post(
+            "/batch/create?models=gpt-4o",
+            content=b"",
+            headers={"Authorization": "Bearer wrong"},
+        )
+
+        assert response.status_code == 401
+
+    @pytest.mark.parametrize("concurrency", [0, 9, 100000])
+    def test_concurrency_out_of_bounds(self, client, concurrency):
+        response = client.post(
+            f"/batch/create?models=gpt-4o&concurrency={concurrency}",
+            content=b'{"description": "An order process"}\n',
+            headers=AUTHORIZATION,
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "concurrency must be between 1 and 8"
+
+    def test_invalid_jsonl(self, client):
+        response = client.post(
+            "/batch/create?models=gpt-4o", content=b"not json\n", headers=AUTHORIZATION
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Invalid JSONL")
@@ -0,0 +1,46 @@
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi.testclient import TestClient
+
+from bpmn_assistant import app as app_module
+from bpmn_assistant.services import BpmnJsonGenerator
+
+
+class BrokenPool(Executor):
+    """
+    Process pool whose worker has been killed.
+    """
+
+    def __init__(self):
+        self.is_shut_down = False
+
+    def submit(self, fn, /, *args, **kwargs):
+        raise BrokenProcessPool("A child process terminated abruptly")
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.is_shut_down = True
+
+
+class TestCollaborationEndpoint:
+
+    def test_sequential_by_default(self, monkeypatch):
+        monkeypatch.delenv("BPMN_CONVERSION_WORKERS", raising=False)
+
+        assert app_module.get_conversion_executor() is None
+
+    def test_broken_pool_is_replaced(self, monkeypatch, bpmn_xml_collaboration):
+        broken_pool = BrokenPool()
+        monkeypatch.setenv("BPMN_CONVERSION_WORKERS", "2")
+        monkeypatch.setattr(app_module, "_conversion_executor", broken_pool)
+
+        response = TestClient(app_module.app).post(
+            "/collaboration_to_json", json={"bpmn_xml": bpmn_xml_collaboration}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == BpmnJsonGenerator().create_collaboration_json(
+            bpmn_xml_collaboration
+        )
+        assert broken_pool.is_shut_down
+        assert app_module._conversion_executor is None
@@ -0,0 +1,17 @@
+from bpmn_assistant.api.etag import etag_matches, make_etag
+
+
+class TestEtag:
+
+    def test_make_etag(self):
+        assert make_etag("abc") == '"abc"'
+
+    def test_etag_matches(self):
+        etag = make_etag("abc")
+
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('"xyz", W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"xyz"', etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches("", etag)
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from bpmn_assistant.api import fast_json
+from bpmn_assistant.api.fast_json import (
+    FastJSONResponse,
+    document_json_bodies,
+    dumps,
+    json_body,
+    parse_model,
+)
+from bpmn_assistant.api.requests import ConversationalRequest, ModifyBpmnRequest
+
+BODY = {
+    "message_history": [
+        {
+            "role": "user",
+            "content": "Create a process for the café",
+            "images": [{"preview": "data:image/png;base64,iVBORw0KGgo=", "name": "a.png"}],
+        }
+    ],
+    "process": [{"type": "task", "id": "task1", "label": "Prépare l'ordre"}],
+    "model": "gpt-4o",
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    return request.param
+
+
+class TestFastJson:
+
+    def test_dumps(self, codec):
+        encoded = dumps(BODY)
+
+        assert json.loads(encoded) == BODY
+        assert "café".encode() in encoded
+        assert b", " not in encoded
+
+    def test_parse_model(self, codec):
+        request = parse_model(ModifyBpmnRequest, json.dumps(BODY).encode())
+
+        assert request == ModifyBpmnRequest(**BODY)
+
+    def test_parse_model_errors(self, codec):
+        with pytest.raises(ValidationError) as e:
+            parse_model(ModifyBpmnRequest, b"{invalid")
+        assert e.value.errors()[0]["type"] == "json_invalid"
+
+        with pytest.raises(ValidationError):
+            parse_model(
+                ConversationalRequest,
+                b'{"message_history": [], "process": null, "model": "m", '
+                b'"needs_to_be_final_comment": true}',
+            )
+
+    def test_endpoint(self, codec):
+        app = FastAPI()
+
+        @app.post("/modify")
+        async def modify(request: ModifyBpmnRequest = Depends(json_body(ModifyBpmnRequest))):
+            return FastJSONResponse(content={"bpmn_json": request.process})
+
+        client = TestClient(app)
+        response = client.post("/modify", json=BODY)
+        invalid = client.post("/modify", json={"message_history": []})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"bpmn_json": BODY["process"]}
+        assert invalid.status_code == 422
+        assert {tuple(error["loc"]) for error in invalid.json()["detail"]} == {
+            ("body", "process"),
+            ("body", "model"),
+        }
+
+    def test_openapi_request_body(self):
+        parsed_by_fastapi = FastAPI()
+        parsed_with_json_body = FastAPI()
+        document_json_bodies(parsed_with_json_body)
+
+        @parsed_by_fastapi.post("/modify")
+        async def modify(request: ModifyBpmnRequest):
+            return {}
+
+        @parsed_with_json_body.post("/modify")
+        async def fast_modify(
+            request: ModifyBpmnRequest = Depends(json_body(ModifyBpmnRequest)),
+        ):
+            return {}
+
+        expected = parsed_by_fastapi.openapi()
+        schema = parsed_with_json_body.openapi()
+
+        assert (
+            schema["paths"]["/modify"]["post"]["requestBody"]
+            == expected["paths"]["/modify"]["post"]["requestBody"]
+        )
+        for name in ("ModifyBpmnRequest", "MessageItem", "MessageImage"):
+            component = schema["components"]["schemas"][name]
+            expected_component = expected["components"]["schemas"][name]
+            assert component["properties"].keys() == expected_component["properties"].keys()
+            assert component["required"] == expected_component["required"]
+        assert parsed_with_json_body.openapi() is schema
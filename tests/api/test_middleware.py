@@ -0,0 +1,153 @@
+import asyncio
+import gzip
+
+import pytest
+
+from bpmn_assistant.api import middleware as middleware_module
+from bpmn_assistant.api.middleware import CompressionMiddleware, RequestIdMiddleware
+from bpmn_assistant.config import request_id_var
+
+
+def call(middleware, headers=()):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/modify", "headers": list(headers)}
+    asyncio.run(middleware(scope, receive, send))
+    return dict(messages[0]["headers"])
+
+
+class TestRequestIdMiddleware:
+
+    def setup_method(self):
+        self.seen = []
+
+        async def app(scope, receive, send):
+            self.seen.append(request_id_var.get())
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        self.middleware = RequestIdMiddleware(app)
+
+    def test_assigns_request_id(self):
+        headers = call(self.middleware)
+
+        request_id = headers[b"x-request-id"].decode()
+        assert len(request_id) == 32
+        assert self.seen == [request_id]
+        assert request_id_var.get() is None
+
+    def test_reuses_valid_request_id(self):
+        headers = call(self.middleware, [(b"x-request-id", b"client-123")])
+
+        assert headers[b"x-request-id"] == b"client-123"
+        assert self.seen == ["client-123"]
+
+    def test_replaces_invalid_request_id(self):
+        headers = call(self.middleware, [(b"x-request-id", b"bad\nid")])
+
+        assert headers[b"x-request-id"] != b"bad\nid"
+
+
+def respond(middleware, accept_encoding=None):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    scope = {"type": "http", "method": "POST", "path": "/modify", "headers": headers}
+    asyncio.run(middleware(scope, receive, send))
+    return dict(messages[0]["headers"]), messages[1:]
+
+
+class TestCompressionMiddleware:
+
+    def make_middleware(
+        self, chunks, content_type=b"application/json", status=200, extra_headers=()
+    ):
+        async def app(scope, receive, send):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status,
+                    "headers": [
+                        (b"content-type", content_type),
+                        (b"content-length", str(sum(map(len, chunks))).encode()),
+                        *extra_headers,
+                    ],
+                }
+            )
+            for index, chunk in enumerate(chunks):
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": index < len(chunks) - 1,
+                    }
+                )
+
+        return CompressionMiddleware(app, minimum_size=100)
+
+    def test_compresses_large_responses(self, monkeypatch):
+        monkeypatch.setattr(middleware_module, "brotli", None)
+        body = b'{"bpmn_xml": "' + b"<task />" * 100 + b'"}'
+
+        headers, messages = respond(self.make_middleware([body]), "gzip, br")
+
+        assert headers[b"content-encoding"] == b"gzip"
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert int(headers[b"content-length"]) == len(messages[0]["body"]) < len(body)
+        assert gzip.decompress(messages[0]["body"]) == body
+
+    def test_prefers_brotli(self):
+        brotli = pytest.importorskip("brotli")
+        body = b"<task />" * 100
+
+        headers, messages = respond(self.make_middleware([body], b"application/xml"), "gzip, br")
+
+        assert headers[b"content-encoding"] == b"br"
+        assert brotli.decompress(messages[0]["body"]) == body
+
+    def test_weakens_the_etag_of_compressed_responses(self):
+        etag = [(b"etag", b'"abc"')]
+        middleware = self.make_middleware([b"x" * 500], extra_headers=etag)
+
+        compressed, _ = respond(middleware, "gzip")
+        identity, _ = respond(middleware)
+
+        assert compressed[b"etag"] == b'W/"abc"'
+        assert identity[b"etag"] == b'"abc"'
+
+    def test_weakens_the_etag_of_not_modified_responses(self):
+        middleware = self.make_middleware([b""], status=304, extra_headers=[(b"etag", b'"abc"')])
+
+        headers, _ = respond(middleware, "gzip")
+
+        assert headers[b"etag"] == b'W/"abc"'
+
+    @pytest.mark.parametrize(
+        "chunks, content_type, accept_encoding",
+        [
+            ([b"x" * 50], b"application/json", "gzip"),  # too small
+            ([b"x" * 500], b"image/png", "gzip"),  # not compressible
+            ([b"x" * 500], b"application/json", None),
+            ([b"x" * 500], b"application/json", "gzip;q=0"),
+            ([b"data: x\n\n" * 50, b""], b"text/event-stream", "gzip"),  # streaming
+        ],
+    )
+    def test_passes_through(self, chunks, content_type, accept_encoding):
+        headers, messages = respond(
+            self.make_middleware(chunks, content_type), accept_encoding
+        )
+
+        assert b"content-encoding" not in headers
+        assert [message["body"] for message in messages] == chunks
@@ -0,0 +1,195 @@
+import json
+import logging
+
+import pytest
+
+from bpmn_assistant.config import log_payload, request_id_var, setup_logger
+from bpmn_assistant.config.log_config import (
+    CustomFormatter,
+    JsonFormatter,
+    LazyJson,
+    RequestContextFilter,
+    stop_logger,
+)
+
+
+class Unserializable:
+    def __init__(self):
+        self.formatted = False
+
+    def __str__(self):
+        self.formatted = True
+        return "unserializable"
+
+
+@pytest.fixture
+def restore_logger():
+    yield
+    setup_logger()
+
+
+class TestPayloadLogging:
+
+    def test_disabled_by_default(self, restore_logger, monkeypatch):
+        monkeypatch.delenv("BPMN_PAYLOAD_LOG", raising=False)
+        setup_logger(enable_console=False, enable_file=False)
+        payload = Unserializable()
+
+        log_payload("Process", payload)
+
+        assert not payload.formatted
+
+    def test_payload_sink(self, restore_logger, tmp_path):
+        path = tmp_path / "payloads.log"
+        setup_logger(enable_console=False, enable_file=False, payload_log_file=str(path))
+
+        log_payload("Generated BPMN process", [{"type": "task", "id": "task1"}])
+        stop_logger()
+
+        content = path.read_text()
+        assert "Generated BPMN process:" in content
+        assert '"id": "task1"' in content
+
+    def test_sampling(self, restore_logger, tmp_path, monkeypatch):
+        monkeypatch.delenv("BPMN_PAYLOAD_LOG_SAMPLE_RATE", raising=False)
+        path = tmp_path / "payloads.log"
+        setup_logger(
+            enable_console=False,
+            enable_file=False,
+            payload_log_file=str(path),
+            payload_sample_rate=0,
+        )
+
+        log_payload("Process", [])
+        stop_logger()
+
+        assert path.read_text() == ""
+
+    def test_explicit_sample_rate_overrides_env(self, restore_logger, tmp_path, monkeypatch):
+        monkeypatch.setenv("BPMN_PAYLOAD_LOG_SAMPLE_RATE", "1")
+        path = tmp_path / "payloads.log"
+        setup_logger(
+            enable_console=False,
+            enable_file=False,
+            payload_log_file=str(path),
+            payload_sample_rate=0,
+        )
+
+        log_payload("Process", [])
+        stop_logger()
+
+        assert path.read_text() == ""
+
+    def test_sample_rate_from_env(self, restore_logger, tmp_path, monkeypatch):
+        monkeypatch.setenv("BPMN_PAYLOAD_LOG_SAMPLE_RATE", "0")
+        path = tmp_path / "payloads.log"
+        setup_logger(enable_console=False, enable_file=False, payload_log_file=str(path))
+
+        log_payload("Process", [])
+        stop_logger()
+
+        assert path.read_text() == ""
+
+    @pytest.mark.parametrize("value", ["often", "2", "-0.5"])
+    def test_invalid_sample_rate_in_env_is_ignored(
+        self, restore_logger, tmp_path, monkeypatch, caplog, value
+    ):
+        monkeypatch.setenv("BPMN_PAYLOAD_LOG_SAMPLE_RATE", value)
+        path = tmp_path / "payloads.log"
+
+        with caplog.at_level(logging.WARNING, logger="bpmn_assistant"):
+            setup_logger(enable_console=False, enable_file=False, payload_log_file=str(path))
+        log_payload("Process", [])
+        stop_logger()
+
+        assert "BPMN_PAYLOAD_LOG_SAMPLE_RATE" in caplog.text
+        assert "Process:" in path.read_text()
+
+    @pytest.mark.parametrize("rate", [-0.1, 1.5])
+    def test_invalid_sample_rate(self, restore_logger, rate):
+        with pytest.raises(ValueError):
+            setup_logger(enable_console=False, enable_file=False, payload_sample_rate=rate)
+
+    def test_payloads_are_not_in_application_log(self, restore_logger, tmp_path, caplog):
+        setup_logger(
+            enable_console=False, enable_file=False, payload_log_file=str(tmp_path / "p.log")
+        )
+
+        with caplog.at_level(logging.DEBUG, logger="bpmn_assistant"):
+            log_payload("Process", [])
+
+        assert caplog.records == []
+
+    def test_lazy_json(self):
+        assert str(LazyJson({"a": 1})) == '{\n  "a": 1\n}'
+
+
+class TestFileLogging:
+
+    def test_disabled_by_env(self, restore_logger, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("BPMN_LOG_TO_FILE", "false")
+        setup_logger(enable_console=False)
+
+        logging.getLogger("bpmn_assistant").debug("Not written to a file")
+        stop_logger()
+
+        assert not (tmp_path / "logs").exists()
+
+    def test_enabled_by_default(self, restore_logger, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("BPMN_LOG_TO_FILE", raising=False)
+        setup_logger(enable_console=False)
+
+        logging.getLogger("bpmn_assistant").debug("Written to a file")
+        stop_logger()
+
+        assert "Written to a file" in (tmp_path / "logs" / "bpmn_assistant.log").read_text()
+
+
+def make_record(message: str, **extra) -> logging.LogRecord:
+    record = logging.LogRecord(
+        "bpmn_assistant.config", logging.INFO, "llm_facade.py", 12, message, None, None
+    )
+    record.__dict__.update(extra)
+    RequestContextFilter().filter(record)
+    return record
+
+
+class TestStructuredLogging:
+
+    def test_request_id_filter(self):
+        token = request_id_var.set("req-1")
+        try:
+            record = make_record("Calling LLM")
+        finally:
+            request_id_var.reset(token)
+
+        assert record.request_id == "req-1"
+        assert make_record("Calling LLM").request_id is None
+
+    def test_json_formatter(self):
+        token = request_id_var.set("req-1")
+        try:
+            record = make_record(
+                "LLM call finished", duration_seconds=1.5, prompt_tokens=1200, completion_tokens=300
+            )
+        finally:
+            request_id_var.reset(token)
+
+        entry = json.loads(JsonFormatter().format(record))
+
+        assert entry["request_id"] == "req-1"
+        assert entry["message"] == "LLM call finished"
+        assert entry["level"] == "INFO"
+        assert entry["location"] == "llm_facade.py:12"
+        assert entry["duration_seconds"] == 1.5
+        assert entry["prompt_tokens"] == 1200
+        assert entry["completion_tokens"] == 300
+        assert "msg" not in entry
+
+    def test_text_formatter_with_request_id(self):
+        record = make_record("Calling LLM", request_id="req-1")
+
+        assert "[req-1] - Calling LLM" in CustomFormatter().format(record)
+        assert " - Calling LLM" in CustomFormatter().format(make_record("Calling LLM"))
@@ -1,5 +1,8 @@
 import os
 
+# Set before the application configures its loggers on import
+os.environ.setdefault("BPMN_LOG_TO_FILE", "false")
+
 import pytest
 from dotenv import load_dotenv
 
@@ -596,6 +599,11 @@ def bpmn_xml_two_start_events():
     """BPMN XML with two start events."""
     return load_bpmn("two_start_events.bpmn")
 
+@pytest.fixture
+def bpmn_xml_collaboration():
+    """BPMN XML with a collaboration of two pools, a black-box pool and message flows."""
+    return load_bpmn("collaboration.bpmn")
+
 @pytest.fixture
 def bpmn_xml_inclusive_gateway():
     """BPMN XML with inclusive gateway with default branch."""
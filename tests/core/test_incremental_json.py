@@ -0,0 +1,95 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from bpmn_assistant.core import LLMFacade
+from bpmn_assistant.core.enums import OutputMode
+from bpmn_assistant.core.incremental_json import IncrementalJsonParser
+
+
+def chunked(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestIncrementalJsonParser:
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1000])
+    def test_emits_completed_items(self, order_process, chunk_size):
+        response = {"process": order_process, "comment": "Done [1] {2}"}
+        text = "```json\n" + json.dumps(response, indent=2) + "\n```"
+        parser = IncrementalJsonParser("process")
+
+        items = []
+        for chunk in chunked(text, chunk_size):
+            items += parser.feed(chunk)
+
+        assert items == order_process
+        assert parser.is_complete
+        assert parser.result() == response
+
+    def test_item_is_emitted_when_closed(self):
+        parser = IncrementalJsonParser("process")
+
+        assert parser.feed('{"process": [{"id": "a", "label": "}"}, {"id"') == [
+            {"id": "a", "label": "}"}
+        ]
+        assert parser.feed(': "b"}') == [{"id": "b"}]
+        assert not parser.is_complete
+
+    def test_other_arrays_are_ignored(self):
+        parser = IncrementalJsonParser("process")
+
+        assert parser.feed('{"steps": [{"id": "a"}], "process": [{"id": "b"}]}') == [{"id": "b"}]
+
+    def test_result_repairs_truncated_json(self):
+        parser = IncrementalJsonParser("process")
+        parser.feed('{"process": [{"id": "a"}')
+
+        assert parser.result() == {"process": [{"id": "a"}]}
+
+    def test_result_without_object_raises(self):
+        parser = IncrementalJsonParser("process")
+        parser.feed("I cannot help with that.")
+
+        with pytest.raises(ValueError):
+            parser.result()
+
+
+class TestStreamJson:
+
+    def make_facade(self, chunks):
+        facade = LLMFacade.__new__(LLMFacade)
+        facade.provider = Mock()
+        facade.provider.stream.return_value = (chunk for chunk in chunks)
+        facade.model = "model"
+        facade.output_mode = OutputMode.JSON
+        facade.messages = []
+        facade.rate_limiter = None
+        return facade
+
+    def test_stream_json(self, linear_process):
+        text = json.dumps({"process": linear_process})
+        facade = self.make_facade(chunked(text, 7))
+        on_item = Mock()
+
+        response = facade.stream_json("Create a process", on_item=on_item)
+
+        assert response == {"process": linear_process}
+        assert [call.args[0] for call in on_item.call_args_list] == linear_process
+        assert facade.messages[-1] == {"role": "assistant", "content": text}
+
+    def test_stream_json_aborts_when_callback_raises(self, linear_process):
+        text = json.dumps({"process": linear_process})
+        facade = self.make_facade(chunked(text, 7))
+
+        def reject_second_item(item):
+            if item["id"] == "task1":
+                raise ValueError("Invalid element")
+
+        with pytest.raises(ValueError):
+            facade.stream_json("Create a process", on_item=reject_second_item)
+
+        partial = facade.messages[-1]["content"]
+        assert '"task1"' in partial
+        assert '"task3"' not in partial
@@ -0,0 +1,163 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from bpmn_assistant.config import request_id_var
+from bpmn_assistant.core import LLMFacade, LLMRouter
+from bpmn_assistant.core.enums import OutputMode
+from bpmn_assistant.core.llm_provider import LLMResponse
+from bpmn_assistant.core.llm_router import AllModelsFailedError
+from bpmn_assistant.core.metrics import metrics
+
+
+def make_facade(model: str, call=None, usage=None) -> LLMFacade:
+    facade = LLMFacade.__new__(LLMFacade)
+    facade.provider = Mock()
+    facade.provider.get_initial_messages.return_value = [
+        {"role": "system", "content": f"You are {model}"}
+    ]
+    answer = call or (lambda *args: {"model": model})
+    facade.provider.call.side_effect = lambda *args: LLMResponse(answer(*args), usage)
+    facade.model = model
+    facade.output_mode = OutputMode.JSON
+    facade.messages = facade.provider.get_initial_messages()
+    facade.rate_limiter = None
+    return facade
+
+
+def fail(*args):
+    raise RuntimeError("Service unavailable")
+
+
+class TestLLMRouter:
+
+    @pytest.fixture(autouse=True)
+    def reset_metrics(self):
+        metrics.reset()
+        yield
+        metrics.reset()
+
+    def test_first_model_answers(self):
+        router = LLMRouter([make_facade("primary"), make_facade("fallback")])
+
+        assert router.call("Hello") == {"model": "primary"}
+        assert router.model == "primary"
+
+    def test_records_token_usage(self):
+        facade = make_facade(
+            "primary", usage={"prompt_tokens": 1200, "completion_tokens": 300}
+        )
+
+        LLMRouter([facade]).call("Hello")
+
+        tokens = metrics.counter("llm_tokens_total")
+        assert tokens.value(model="primary", kind="prompt_tokens") == 1200
+        assert tokens.value(model="primary", kind="completion_tokens") == 300
+
+    def test_propagates_the_request_id(self):
+        seen = []
+        facade = make_facade("primary", lambda *args: seen.append(request_id_var.get()) or {})
+        token = request_id_var.set("req-1")
+        try:
+            LLMRouter([facade]).call("Hello")
+        finally:
+            request_id_var.reset(token)
+
+        assert seen == ["req-1"]
+
+    def test_falls_back_on_error(self):
+        fallback = make_facade("fallback")
+        router = LLMRouter([make_facade("primary", fail), fallback])
+
+        assert router.call("Hello") == {"model": "fallback"}
+        assert fallback.provider.call.call_args.args[1][0] == {
+            "role": "system",
+            "content": "You are fallback",
+        }
+        assert metrics.counter("llm_router_failures_total").value(
+            model="primary", reason="RuntimeError"
+        ) == 1
+
+    def test_all_models_fail(self):
+        router = LLMRouter([make_facade("primary", fail), make_facade("fallback", fail)])
+
+        with pytest.raises(AllModelsFailedError) as exc_info:
+            router.call("Hello")
+
+        assert [model for model, _ in exc_info.value.errors] == ["primary", "fallback"]
+
+    def test_falls_back_on_timeout(self):
+        release = threading.Event()
+
+        def hang(*args):
+            release.wait(5)
+            return {"model": "primary"}
+
+        router = LLMRouter([make_facade("primary", hang), make_facade("fallback")], timeout=0.05)
+
+        try:
+            assert router.call("Hello") == {"model": "fallback"}
+        finally:
+            release.set()
+
+    def test_hedged_request_wins(self):
+        release = threading.Event()
+
+        def slow(*args):
+            release.wait(5)
+            return {"model": "primary"}
+
+        router = LLMRouter(
+            [make_facade("primary", slow), make_facade("fallback")],
+            hedge=True,
+            default_hedge_delay=0.05,
+        )
+
+        try:
+            assert router.call("Hello") == {"model": "fallback"}
+        finally:
+            release.set()
+        assert metrics.counter("llm_router_hedges_total").value(model="fallback") == 1
+
+    def test_conversation_is_kept_across_models(self):
+        primary = make_facade("primary")
+        fallback = make_facade("fallback")
+        router = LLMRouter([primary, fallback])
+        sent_messages = []
+
+        def answer(model, messages, *args):
+            sent_messages.append(list(messages))
+            return LLMResponse({"model": model})
+
+        fallback.provider.call.side_effect = answer
+
+        router.call("First")
+        primary.provider.call.side_effect = fail
+        router.call("Second")
+
+        messages = sent_messages[-1]
+        assert messages[0]["content"] == "You are fallback"
+        assert [message["content"] for message in messages[1:]] == [
+            "First",
+            '{"model": "primary"}',
+            "Second",
+        ]
+        assert len(router.turns) == 4
+
+    def test_callback_error_is_not_retried(self):
+        primary = make_facade("primary")
+        primary.provider.stream.return_value = (
+            chunk for chunk in ['{"process": [{"id": "a"}]}']
+        )
+        fallback = make_facade("fallback")
+        router = LLMRouter([primary, fallback])
+
+        def reject(item):
+            raise ValueError("Invalid element")
+
+        with pytest.raises(ValueError, match="Invalid element"):
+            router.stream_json("Create a process", on_item=reject)
+
+        fallback.provider.stream.assert_not_called()
+        assert router.turns[-1]["role"] == "assistant"
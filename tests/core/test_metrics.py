@@ -0,0 +1,48 @@
+import pytest
+
+from bpmn_assistant.core.metrics import MetricsRegistry
+
+
+class TestMetrics:
+
+    def test_counter_with_labels(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total")
+
+        counter.inc(operation="create")
+        counter.inc(2, operation="create")
+        counter.inc(operation="edit")
+
+        assert counter.value(operation="create") == 3
+        assert counter.value(operation="edit") == 1
+        assert registry.counter("requests_total") is counter
+
+    def test_histogram_statistics(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("attempts")
+
+        for value in range(1, 101):
+            histogram.observe(value)
+
+        assert histogram.count() == 100
+        assert histogram.mean() == pytest.approx(50.5)
+        assert histogram.percentile(50) in (50, 51)
+        assert histogram.percentile(95) == 95
+        assert registry.snapshot()["attempts"]["values"][0]["max"] == 100
+
+    def test_metric_type_conflict(self):
+        registry = MetricsRegistry()
+        registry.counter("latency")
+
+        with pytest.raises(ValueError):
+            registry.histogram("latency")
+
+    def test_reset_keeps_metrics_registered(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total")
+        counter.inc()
+
+        registry.reset()
+
+        assert counter.value() == 0
+        assert registry.counter("requests_total") is counter
@@ -0,0 +1,85 @@
+import json
+import threading
+
+import pytest
+
+from bpmn_assistant.core import profiler
+from bpmn_assistant.core.profiler import SamplingProfiler, profile_process
+from bpmn_assistant.prompts.example_library import get_process_features
+
+PROCESS = [
+    {"type": "startEvent", "id": "start"},
+    {
+        "type": "exclusiveGateway",
+        "id": "eg1",
+        "branches": [{"condition": "OK", "path": [{"type": "task", "id": "task1"}]}],
+    },
+]
+
+
+@pytest.fixture
+def threads():
+    stop = threading.Event()
+
+    def busy():
+        while not stop.is_set():
+            get_process_features(PROCESS)
+
+    busy_thread = threading.Thread(target=busy, name="busy-worker")
+    idle_thread = threading.Thread(target=stop.wait, name="idle-worker")
+    busy_thread.start()
+    idle_thread.start()
+    yield
+    stop.set()
+    busy_thread.join()
+    idle_thread.join()
+
+
+class TestSamplingProfiler:
+
+    def test_samples_the_busy_threads(self, threads):
+        profile = SamplingProfiler(interval=0.005).run(0.3)
+
+        assert profile.samples > 10
+        thread_names = {stack[0][0] for stack in profile.stacks}
+        assert "busy-worker" in thread_names
+        assert "idle-worker" not in thread_names
+
+    def test_include_idle(self, threads):
+        profile = SamplingProfiler(interval=0.005, include_idle=True).run(0.1)
+
+        assert "idle-worker" in {stack[0][0] for stack in profile.stacks}
+
+    def test_collapsed_highlights_the_app_frames(self, threads):
+        collapsed = SamplingProfiler(interval=0.005).run(0.2).to_collapsed()
+
+        busy_lines = [line for line in collapsed.splitlines() if line.startswith("busy-worker;")]
+        assert busy_lines
+        assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in busy_lines)
+        assert any(
+            "bpmn_assistant.prompts.example_library:get_process_features_[j]" in line
+            for line in busy_lines
+        )
+        assert not any("threading:Thread.run_[j]" in line for line in busy_lines)
+
+    def test_speedscope(self, threads):
+        profile = SamplingProfiler(interval=0.005).run(0.2)
+
+        speedscope = json.loads(json.dumps(profile.to_speedscope()))
+
+        frames = speedscope["shared"]["frames"]
+        sampled = speedscope["profiles"][0]
+        assert sampled["type"] == "sampled"
+        assert len(sampled["samples"]) == len(sampled["weights"]) == len(profile.stacks)
+        assert all(0 <= index < len(frames) for sample in sampled["samples"] for index in sample)
+        assert any(frame["name"].startswith("bpmn_assistant.") for frame in frames)
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            SamplingProfiler(interval=0)
+
+    def test_one_profile_at_a_time(self):
+        with profiler._profile_lock:
+            assert profile_process(0.01) is None
+
+        assert profile_process(0.01) is not None
@@ -0,0 +1,206 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.core.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    backoff_delay,
+    estimate_tokens,
+    get_rate_limiter,
+    get_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str | None = None):
+        super().__init__("Rate limit exceeded")
+        self.response = Mock(headers={"retry-after": retry_after} if retry_after else {})
+
+
+class TestTokenBucket:
+
+    def test_reserve_within_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock)
+
+        assert bucket.reserve(60) == 0
+        assert bucket.reserve(1) == pytest.approx(1)
+
+    def test_refills_over_time(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock)
+        bucket.reserve(60)
+
+        clock.now += 30
+
+        assert bucket.tokens == pytest.approx(30)
+        clock.now += 60
+        assert bucket.tokens == pytest.approx(60)
+
+    def test_debt_is_repaid_in_order(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, capacity=1, clock=clock)
+
+        assert [bucket.reserve(1) for _ in range(3)] == pytest.approx([0, 1, 2])
+
+
+class TestRateLimiter:
+
+    @pytest.fixture(autouse=True)
+    def reset_metrics(self):
+        metrics.reset()
+        yield
+        metrics.reset()
+
+    def make_limiter(self, clock: FakeClock, **kwargs) -> RateLimiter:
+        return RateLimiter("test", clock=clock, sleep=clock.sleep, **kwargs)
+
+    def test_waits_for_request_budget(self):
+        clock = FakeClock()
+        limiter = self.make_limiter(clock, requests_per_minute=2)
+
+        for _ in range(3):
+            limiter.call(lambda: "ok")
+
+        assert clock.sleeps == pytest.approx([30])
+
+    def test_waits_for_token_budget(self):
+        clock = FakeClock()
+        limiter = self.make_limiter(clock, tokens_per_minute=1000)
+
+        limiter.call(lambda: "ok", tokens=1000)
+        limiter.call(lambda: "ok", tokens=500)
+
+        assert clock.sleeps == pytest.approx([30])
+
+    def test_retries_after_retry_after_header(self):
+        clock = FakeClock()
+        limiter = self.make_limiter(clock)
+        fn = Mock(side_effect=[RateLimitError("7"), "ok"])
+
+        assert limiter.call(fn) == "ok"
+        assert clock.sleeps == pytest.approx([7])
+        assert metrics.counter("llm_rate_limited_total").value(provider="test") == 1
+
+    def test_gives_up_after_max_retries(self):
+        clock = FakeClock()
+        limiter = self.make_limiter(clock, max_retries=2)
+        fn = Mock(side_effect=RateLimitError())
+
+        with pytest.raises(RateLimitError):
+            limiter.call(fn)
+
+        assert fn.call_count == 3
+
+    def test_other_errors_are_not_retried(self):
+        clock = FakeClock()
+        limiter = self.make_limiter(clock)
+        fn = Mock(side_effect=ValueError("Invalid response"))
+
+        with pytest.raises(ValueError):
+            limiter.call(fn)
+
+        assert fn.call_count == 1
+
+    def test_bounds_concurrency(self):
+        limiter = RateLimiter("test", max_concurrency=2)
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+
+        def fn():
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        threads = [threading.Thread(target=limiter.call, args=(fn,)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max_running == 2
+        assert metrics.gauge("llm_rate_limiter_queue_depth").value(provider="test") == 0
+
+    def test_stream_is_retried_before_first_chunk(self):
+        clock = FakeClock()
+        limiter = self.make_limiter(clock)
+        streams = iter([RateLimitError("1"), ["a", "b"]])
+
+        def start_stream():
+            stream = next(streams)
+            if isinstance(stream, Exception):
+                raise stream
+            return (chunk for chunk in stream)
+
+        assert list(limiter.stream(start_stream)) == ["a", "b"]
+        assert clock.sleeps == pytest.approx([1])
+
+    def test_stream_releases_slot_when_closed(self):
+        limiter = RateLimiter("test", max_concurrency=1)
+
+        chunks = limiter.stream(lambda: (chunk for chunk in ["a", "b"]))
+        assert next(chunks) == "a"
+        chunks.close()
+
+        assert limiter.call(lambda: "ok") == "ok"
+
+
+class TestRateLimiterHelpers:
+
+    def test_limiter_is_shared_per_provider_and_key(self):
+        limiter = get_rate_limiter("openai", "key-1")
+
+        assert get_rate_limiter("openai", "key-1") is limiter
+        assert get_rate_limiter("openai", "key-2") is not limiter
+        assert get_rate_limiter("anthropic", "key-1") is not limiter
+
+    def test_limits_from_environment(self, monkeypatch):
+        monkeypatch.setenv("BPMN_LLM_RPM", "100")
+        monkeypatch.setenv("BPMN_LLM_MAX_CONCURRENCY_GOOGLE", "3")
+
+        limiter = get_rate_limiter("google", "environment-test-key")
+
+        assert limiter._request_bucket.rate == pytest.approx(100 / 60)
+        assert limiter.max_concurrency == 3
+
+    def test_backoff_delay_is_capped(self):
+        for attempt in range(1, 10):
+            assert 0 <= backoff_delay(attempt, base_delay=1, max_delay=8) <= 8
+
+    def test_retry_after_in_milliseconds(self):
+        error = RateLimitError()
+        error.response.headers = {"retry-after-ms": "1500"}
+
+        assert get_retry_after(error) == pytest.approx(1.5)
+
+    def test_estimate_tokens(self):
+        messages = [
+            {"role": "system", "content": "a" * 40},
+            {"role": "user", "content": [{"type": "text", "text": "b" * 40}]},
+        ]
+
+        assert estimate_tokens(messages, max_tokens=100) == 120
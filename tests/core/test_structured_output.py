@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from anthropic.types import ToolUseBlock
+
+from bpmn_assistant.core.enums import OutputMode
+from bpmn_assistant.core.provider_impl.anthropic_provider import AnthropicProvider
+from bpmn_assistant.core.provider_impl import litellm_provider
+from bpmn_assistant.core.provider_impl.litellm_provider import LiteLLMProvider
+from bpmn_assistant.core.schemas import EditProposal, IntermediateEditProposal, ProcessModel
+from bpmn_assistant.core.structured_output import get_structured_output_schema
+
+
+def iter_objects(schema):
+    if isinstance(schema, dict):
+        if schema.get("type") == "object":
+            yield schema
+        for value in schema.values():
+            yield from iter_objects(value)
+    elif isinstance(schema, list):
+        for item in schema:
+            yield from iter_objects(item)
+
+
+class TestStructuredOutputSchema:
+
+    def test_process_model_strict_schema(self):
+        schema = get_structured_output_schema(ProcessModel)
+
+        assert schema.is_strict
+        assert not schema.is_wrapped
+        for object_schema in iter_objects(schema.strict_json_schema):
+            assert object_schema["additionalProperties"] is False
+            assert set(object_schema["required"]) == set(object_schema["properties"])
+
+        branch = schema.strict_json_schema["$defs"]["ExclusiveGatewayBranch"]["properties"]
+        assert branch["next"]["anyOf"][1] == {"type": "null"}
+        # Optional fields with a default are required, but not nullable
+        assert branch["path"]["type"] == "array"
+
+    def test_free_form_objects_are_not_strict(self):
+        schema = get_structured_output_schema(EditProposal)
+
+        assert not schema.is_strict
+        assert schema.json_schema["properties"]["arguments"]["type"] == "object"
+
+    def test_union_root_is_wrapped(self):
+        schema = get_structured_output_schema(IntermediateEditProposal)
+
+        assert schema.is_wrapped
+        assert schema.json_schema["type"] == "object"
+        assert schema.parse({"response": {"stop": True}}) == {"stop": True}
+
+    def test_parse_strips_null_fields(self):
+        schema = get_structured_output_schema(ProcessModel)
+
+        result = schema.parse(
+            {"process": [{"type": "startEvent", "id": "start", "label": None}]}
+        )
+
+        assert result == {"process": [{"type": "startEvent", "id": "start"}]}
+
+
+class TestProviderStructuredOutput:
+
+    def test_anthropic_uses_forced_tool_call(self, linear_process):
+        provider = AnthropicProvider.__new__(AnthropicProvider)
+        provider.output_mode = OutputMode.JSON
+        provider.client = Mock()
+        provider.client.messages.create.return_value = SimpleNamespace(
+            content=[
+                ToolUseBlock(
+                    id="toolu_1",
+                    type="tool_use",
+                    name="ProcessModel",
+                    input={"process": linear_process},
+                )
+            ],
+            usage=SimpleNamespace(input_tokens=1200, output_tokens=300),
+        )
+
+        result, usage = provider.call("model", [], 4000, 0.3, structured_output=ProcessModel)
+
+        assert result == {"process": linear_process}
+        assert usage == {"prompt_tokens": 1200, "completion_tokens": 300}
+        kwargs = provider.client.messages.create.call_args.kwargs
+        assert kwargs["tool_choice"] == {"type": "tool", "name": "ProcessModel"}
+        assert kwargs["tools"][0]["input_schema"]["$defs"]["BPMNTask"]
+
+    def test_litellm_uses_json_schema_for_openai(self, monkeypatch, linear_process):
+        provider = LiteLLMProvider.__new__(LiteLLMProvider)
+        provider.output_mode = OutputMode.JSON
+        completion = Mock(
+            return_value=SimpleNamespace(
+                choices=[
+                    SimpleNamespace(
+                        message=SimpleNamespace(
+                            content='{"process": [{"type": "startEvent", "id": "s", "label": null}]}'
+                        )
+                    )
+                ]
+            )
+        )
+        monkeypatch.setattr(litellm_provider, "completion", completion)
+        monkeypatch.delenv("BPMN_USE_EXISTING_JSON", raising=False)
+        monkeypatch.delenv("BPMN_LOG_JSON", raising=False)
+
+        result = provider.call("gpt-4.1", [], 4000, 0.3, structured_output=ProcessModel).content
+
+        assert result == {"process": [{"type": "startEvent", "id": "s"}]}
+        response_format = completion.call_args.kwargs["response_format"]
+        assert response_format["type"] == "json_schema"
+        assert response_format["json_schema"]["strict"] is True
@@ -0,0 +1,79 @@
+import pytest
+
+from bpmn_assistant.core import tracing
+from bpmn_assistant.core.tracing import server_span, span, traced
+
+
+@traced("add")
+def add(a, b):
+    return a + b
+
+
+@pytest.fixture(scope="module")
+def exporter():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    return exporter
+
+
+class TestTracing:
+
+    def test_spans_without_exporter(self):
+        with span("stage", model="gpt-4.1", tokens=None) as current:
+            current.set_attribute("done", True)
+
+        assert add(1, 2) == 3
+
+    def test_unsupported_exporter(self):
+        with pytest.raises(ValueError):
+            tracing.setup_tracing("zipkin")
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("BPMN_TRACING_EXPORTER", raising=False)
+
+        assert tracing.setup_tracing() is False
+
+
+class TestTracingWithOpenTelemetry:
+
+    @pytest.fixture
+    def spans(self, exporter):
+        exporter.clear()
+        yield exporter.get_finished_spans
+        exporter.clear()
+
+    def test_nested_spans(self, spans):
+        with span("parent", model="gpt-4.1", tokens=None):
+            add(1, 2)
+
+        child, parent = spans()
+        assert child.name == "add"
+        assert child.parent.span_id == parent.context.span_id
+        assert dict(parent.attributes) == {"model": "gpt-4.1"}
+
+    def test_exceptions_are_recorded(self, spans):
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("Invalid process")
+
+        (failing,) = spans()
+        assert not failing.status.is_ok
+        assert failing.events[0].name == "exception"
+
+    def test_continues_the_trace_of_the_caller(self, spans):
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        headers = {"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"}
+
+        with server_span("POST /modify", headers):
+            pass
+
+        (server,) = spans()
+        assert format(server.context.trace_id, "032x") == trace_id
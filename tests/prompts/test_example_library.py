@@ -0,0 +1,122 @@
+import pytest
+
+from bpmn_assistant.prompts import ExampleLibrary, PromptTemplateProcessor
+from bpmn_assistant.prompts.example_library import (
+    BpmnExample,
+    get_process_features,
+    get_request_features,
+)
+
+
+@pytest.fixture
+def library():
+    return ExampleLibrary.from_file()
+
+
+class TestExampleLibrary:
+
+    def test_from_file(self, library):
+        assert len(library.examples) == 7
+        assert library.header.startswith("# Process examples")
+        assert all(example.text.startswith("Textual description:") for example in library.examples)
+        assert "loop" in library.examples[2].features
+        assert "nested" in library.examples[3].features
+        assert "timerEventDefinition" in library.examples[5].features
+
+    def test_selects_examples_with_the_features_of_the_request(self, library):
+        examples = library.select(
+            "The clerk checks the application. At the same time, the manager reviews the budget."
+        )
+
+        assert "parallelGateway" in examples[0].features
+        assert 2 <= len(examples) <= 3
+
+    def test_covers_several_features(self, library):
+        examples = library.select(
+            "At midnight, the system sends a reminder. If the customer does not answer, "
+            "they are asked again."
+        )
+
+        covered = set().union(*(example.features for example in examples))
+        assert {"timerEventDefinition", "exclusiveGateway", "loop"} <= covered
+
+    def test_features_of_the_current_process(self, library, pg_inside_eg_process):
+        examples = library.select("Rename the first task", process=pg_inside_eg_process)
+
+        assert any("parallelGateway" in example.features for example in examples)
+
+    def test_token_budget(self, library):
+        request = "If the order is valid, in parallel ship it and wait 2 days for the payment."
+        budget = min(example.tokens for example in library.examples) + 1
+        library.token_budget = budget
+
+        examples = library.select(request)
+
+        # The best example is selected even if it exceeds the budget
+        assert len(examples) == 1
+
+    def test_render(self, library):
+        prompt = library.render("The student sends an email. If the professor agrees, he replies.")
+
+        assert prompt.startswith(library.header)
+        assert prompt.count("Textual description:") in (2, 3)
+        assert len(prompt) < len(PromptTemplateProcessor().render_template("bpmn_examples.jinja2"))
+
+    def test_empty_library(self):
+        with pytest.raises(ValueError):
+            ExampleLibrary("# Process examples", [])
+
+    def test_create_prompt_includes_the_selected_examples(self):
+        example = BpmnExample('Textual description: "Example"', "Example", {"task"})
+
+        prompt = PromptTemplateProcessor().render_template(
+            "create_bpmn.jinja2", message_history="user: Create a process", examples=example.text
+        )
+
+        assert 'Textual description: "Example"' in prompt
+        assert "The student sends an email" not in prompt
+
+
+class TestFeatures:
+
+    def test_request_features(self):
+        assert get_request_features("Wait 5 minutes, then repeat the check if it failed") >= {
+            "timerEventDefinition",
+            "loop",
+            "exclusiveGateway",
+        }
+        assert get_request_features("Do A, then B") == set()
+
+    def test_process_features(self):
+        process = [
+            {"type": "startEvent", "id": "start", "eventDefinition": "timerEventDefinition"},
+            {"type": "task", "id": "task1", "label": "Check"},
+            {
+                "type": "exclusiveGateway",
+                "id": "eg1",
+                "branches": [
+                    {
+                        "condition": "OK",
+                        "path": [
+                            {
+                                "type": "parallelGateway",
+                                "id": "pg1",
+                                "branches": [[{"type": "userTask", "id": "task2"}]],
+                            }
+                        ],
+                    },
+                    {"condition": "Not OK", "path": [], "next": "task1"},
+                ],
+            },
+        ]
+
+        assert get_process_features(process) == {
+            "startEvent",
+            "timerEventDefinition",
+            "task",
+            "exclusiveGateway",
+            "parallelGateway",
+            "userTask",
+            "loop",
+            "nested",
+        }
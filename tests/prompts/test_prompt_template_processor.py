@@ -0,0 +1,69 @@
+import pytest
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.prompts import PromptTemplateProcessor
+from bpmn_assistant.prompts.prompt_template_processor import PROMPTS_DIR
+
+VARIABLES = {
+    "message_history": "user: Create an order process",
+    "process": '[{"type": "task", "id": "task1", "label": "Check order"}]',
+    "change_request": "Add a task",
+    "issues": ["Unknown element type", "Duplicate ID"],
+}
+
+
+class TestPromptTemplateProcessor:
+
+    def test_environment_is_shared(self):
+        assert PromptTemplateProcessor().env is PromptTemplateProcessor().env
+
+    def test_environment_per_directory(self, tmp_path):
+        (tmp_path / "hello.jinja2").write_text("Hello {{ name }}")
+
+        processor = PromptTemplateProcessor(str(tmp_path))
+
+        assert processor.env is not PromptTemplateProcessor().env
+        assert processor.render_template("hello.jinja2", name="world") == "Hello world"
+
+    def test_precompile(self):
+        names = PromptTemplateProcessor().precompile()
+
+        assert "create_bpmn.jinja2" in names
+        assert "bpmn_representation.jinja2" in names
+
+    @pytest.mark.parametrize(
+        "template_name", sorted(PromptTemplateProcessor().precompile())
+    )
+    def test_same_result_as_plain_environment(self, template_name):
+        plain = Environment(
+            loader=FileSystemLoader(PROMPTS_DIR),
+            autoescape=select_autoescape(),
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+
+        expected = plain.get_template(template_name).render(**VARIABLES)
+
+        assert PromptTemplateProcessor().render_template(template_name, **VARIABLES) == expected
+
+    def test_static_includes_are_inlined(self, tmp_path):
+        (tmp_path / "static.jinja2").write_text("Static {{ '{{' }}text")
+        (tmp_path / "dynamic.jinja2").write_text("Dynamic {{ name }}")
+        (tmp_path / "main.jinja2").write_text(
+            "{% include 'static.jinja2' %}\n{% include 'dynamic.jinja2' %}\n"
+        )
+        processor = PromptTemplateProcessor(str(tmp_path))
+
+        source = processor.env.loader.get_source(processor.env, "main.jinja2")[0]
+
+        assert source == "{% raw %}Static {{text{% endraw %}\n{% include 'dynamic.jinja2' %}\n"
+        assert processor.render_template("main.jinja2", name="x") == "Static {{textDynamic x"
+
+    def test_render_duration_is_recorded(self):
+        histogram = metrics.histogram("prompt_render_seconds")
+        count = histogram.count(template="determine_intent.jinja2")
+
+        PromptTemplateProcessor().render_template("determine_intent.jinja2", **VARIABLES)
+
+        assert histogram.count(template="determine_intent.jinja2") == count + 1
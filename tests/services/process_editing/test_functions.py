@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 import pytest
 
 from bpmn_assistant.services.process_editing import (
@@ -97,3 +99,31 @@ class TestProcessEditingFunctions:
         with pytest.raises(Exception) as e:
             update_element(order_process, new_element)
         assert str(e.value) == "Cannot update a gateway element"
+
+    def test_edits_do_not_modify_original_process(self, order_process):
+        original = deepcopy(order_process)
+
+        delete_element(order_process, "task4")
+        redirect_branch(order_process, "Payment succeeds", "exclusive1")
+        add_element(order_process, {"type": "task", "id": "task6", "label": "Pack order"}, after_id="task3")
+        move_element(order_process, "task4", before_id="task3")
+        update_element(order_process, {"type": "task", "id": "task5", "label": "Notify"})
+
+        assert order_process == original
+
+    def test_edits_share_untouched_elements(self, order_process):
+        result = delete_element(order_process, "task4")
+        updated_process = result["process"]
+
+        # Elements outside the modified path are shared with the original process
+        assert updated_process[0] is order_process[0]
+        assert updated_process[1] is order_process[1]
+        assert (
+            updated_process[2]["branches"][0] is order_process[2]["branches"][0]
+        )
+        # Containers along the modified path are copied
+        assert updated_process[2] is not order_process[2]
+        assert (
+            updated_process[2]["branches"][1]["path"][0]
+            is not order_process[2]["branches"][1]["path"][0]
+        )
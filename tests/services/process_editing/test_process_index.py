@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from bpmn_assistant.core.exceptions import ProcessException
+from bpmn_assistant.services import SyntheticProcessGenerator
+from bpmn_assistant.services.process_editing import (
+    ProcessIndex,
+    add_element,
+    delete_element,
+    get_all_ids,
+    move_element,
+    update_element,
+)
+
+
+def resolve(process: list[dict], path: list) -> list:
+    current = process
+    for path_element in path:
+        current = current[path_element]
+    return current
+
+
+class TestProcessIndex:
+
+    def test_find_position(self, order_process):
+        index = ProcessIndex(order_process)
+
+        position = index.find_position(after_id="task3")
+
+        assert position.index == 1
+        assert position.path == [2, "branches", 1, "path", 0, "branches", 0, "path"]
+
+    def test_find_position_parallel_gateway(self, procurement_process):
+        index = ProcessIndex(procurement_process)
+
+        position = index.find_position(before_id="task4")
+
+        assert position.index == 1
+        assert position.path == [1, "branches", 1]
+
+    def test_find_position_raises_exception_for_unknown_id(self, order_process):
+        index = ProcessIndex(order_process)
+
+        with pytest.raises(ProcessException) as e:
+            index.find_position(before_id="unknown")
+
+        assert str(e.value) == "Element with id unknown does not exist"
+
+    def test_find_branch_position(self, order_process):
+        index = ProcessIndex(order_process)
+
+        position = index.find_branch_position("Payment fails")
+
+        assert position.index == 1
+        assert position.path == [2, "branches", 1, "path", 0, "branches"]
+
+    def test_gateway_context(self, order_process):
+        index = ProcessIndex(order_process)
+
+        assert index.gateway_context("task1") is None
+        assert index.gateway_context("task5") == ("exclusive2", 1)
+
+    def test_inclusive_gateway_elements_are_indexed(self):
+        generator = SyntheticProcessGenerator(
+            size=200,
+            gateway_ratio=0.4,
+            gateway_mix={"inclusiveGateway": 1.0},
+            seed=11,
+        )
+        process = generator.generate()
+        index = ProcessIndex(process)
+
+        assert set(index.ids()) == set(get_all_ids(process))
+        assert len(index) == 200
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_index_is_maintained_incrementally(self, seed):
+        process = SyntheticProcessGenerator(
+            size=300, gateway_ratio=0.3, seed=seed
+        ).generate()
+        index = ProcessIndex(process)
+        rng = random.Random(seed)
+
+        for step in range(100):
+            ids = [
+                element_id
+                for element_id in index.ids()
+                if not element_id.startswith("startEvent")
+            ]
+            operation = rng.choice(["add", "delete", "move", "update"])
+            target_id = rng.choice(ids)
+            anchor_id = rng.choice(ids)
+
+            try:
+                if operation == "add":
+                    new_element = {"type": "task", "id": f"new{step}", "label": "New"}
+                    result = add_element(process, new_element, after_id=anchor_id, index=index)
+                elif operation == "delete":
+                    result = delete_element(process, target_id, index=index)
+                elif operation == "move":
+                    result = move_element(process, target_id, before_id=anchor_id, index=index)
+                else:
+                    new_element = {"type": "userTask", "id": target_id, "label": "Updated"}
+                    result = update_element(process, new_element, index=index)
+            except ProcessException:
+                # E.g. moving a gateway into its own branch
+                continue
+
+            process = result["process"]
+            fresh_index = ProcessIndex(process)
+
+            assert index.process is process
+            assert sorted(index.ids()) == sorted(fresh_index.ids())
+            for element_id in fresh_index.ids():
+                position = index.find_position(before_id=element_id)
+                assert resolve(process, position.path)[position.index]["id"] == element_id
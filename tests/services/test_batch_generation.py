@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from bpmn_assistant import cli
+from bpmn_assistant.services import BpmnModelingService
+from bpmn_assistant.services.batch_generation import (
+    BatchGenerator,
+    read_checkpoint,
+    read_jsonl,
+)
+
+
+class TestBatchGenerator:
+
+    @pytest.fixture
+    def modeling_service(self, linear_process):
+        service = Mock()
+        service.create_bpmn.return_value = linear_process
+        return service
+
+    def test_creates_processes(self, modeling_service, linear_process):
+        generator = BatchGenerator(["gpt-4.1"], Mock(), modeling_service=modeling_service)
+
+        results = list(generator.run([{"id": "a", "description": "Order handling"}]))
+
+        assert len(results) == 1
+        assert results[0].status == "succeeded"
+        assert results[0].bpmn_json == linear_process
+        assert "<process" in results[0].bpmn_xml
+
+    def test_distributes_items_over_models(self, modeling_service):
+        facade_factory = Mock()
+        generator = BatchGenerator(
+            ["gpt-4.1", "claude-sonnet-4"], facade_factory, modeling_service=modeling_service
+        )
+        items = [
+            {"description": "First"},
+            {"description": "Second", "model": "gpt-4.1-mini"},
+            {"description": "Third"},
+        ]
+
+        results = {result.id: result.model for result in generator.run(items)}
+
+        assert results == {"0": "gpt-4.1", "1": "gpt-4.1-mini", "2": "claude-sonnet-4"}
+
+    def test_failures_are_reported(self, modeling_service):
+        modeling_service.create_bpmn.side_effect = Exception("Max number of retries reached")
+        generator = BatchGenerator(["gpt-4.1"], Mock(), modeling_service=modeling_service)
+
+        results = list(generator.run([{"id": "a", "description": "Order"}, {"id": "b"}]))
+
+        assert {result.id: result.error for result in results} == {
+            "a": "Max number of retries reached",
+            "b": "The item has no description",
+        }
+        assert all(result.status == "failed" for result in results)
+
+    def test_skips_completed_items(self, modeling_service):
+        generator = BatchGenerator(["gpt-4.1"], Mock(), modeling_service=modeling_service)
+        items = [{"id": "a", "description": "First"}, {"id": "b", "description": "Second"}]
+
+        results = list(generator.run(items, skip_ids={"a"}))
+
+        assert [result.id for result in results] == ["b"]
+
+    def test_bounds_concurrency(self, linear_process):
+        lock = threading.Lock()
+        running = 0
+        max_running = 0
+
+        def create_bpmn(llm_facade, message_history):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return linear_process
+
+        modeling_service = Mock()
+        modeling_service.create_bpmn.side_effect = create_bpmn
+        generator = BatchGenerator(
+            ["gpt-4.1"], Mock(), max_concurrency=2, modeling_service=modeling_service
+        )
+
+        results = list(generator.run({"description": str(i)} for i in range(6)))
+
+        assert len(results) == 6
+        assert max_running == 2
+
+
+class TestBatchFiles:
+
+    def test_read_jsonl(self):
+        assert list(read_jsonl(['{"id": "a"}', "", '{"id": "b"}'])) == [
+            {"id": "a"},
+            {"id": "b"},
+        ]
+        with pytest.raises(ValueError):
+            list(read_jsonl(['["a"]']))
+
+    def test_read_checkpoint(self, tmp_path):
+        path = tmp_path / "results.jsonl"
+        path.write_text(
+            '{"id": "a", "status": "succeeded"}\n'
+            '{"id": "b", "status": "failed"}\n'
+            '{"id": "c", "stat'
+        )
+
+        assert read_checkpoint(str(path)) == {"a"}
+        assert read_checkpoint(str(tmp_path / "missing.jsonl")) == set()
+
+    def test_cli_resumes_from_checkpoint(self, tmp_path, monkeypatch, linear_process):
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        create_bpmn = Mock(return_value=linear_process)
+        monkeypatch.setattr(BpmnModelingService, "create_bpmn", create_bpmn)
+
+        input_path = tmp_path / "descriptions.jsonl"
+        input_path.write_text(
+            '{"id": "a", "description": "First"}\n{"id": "b", "description": "Second"}\n'
+        )
+        output_path = tmp_path / "results.jsonl"
+        output_path.write_text('{"id": "a", "status": "succeeded"}\n{"id": "b", "sta')
+
+        exit_code = cli.main(
+            ["batch", str(input_path), "-o", str(output_path), "--model", "gpt-4.1", "--resume"]
+        )
+
+        assert exit_code == 0
+        assert create_bpmn.call_count == 1
+        last_result = json.loads(output_path.read_text().splitlines()[-1])
+        assert last_result["id"] == "b"
+        assert last_result["status"] == "succeeded"
+        assert read_checkpoint(str(output_path)) == {"a", "b"}
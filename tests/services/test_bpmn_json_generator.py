@@ -1,6 +1,25 @@
+import io
+import re
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
 import pytest
 from bpmn_assistant.services import BpmnJsonGenerator
 
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+
+class BrokenExecutorStub(Executor):
+    """
+    Executor whose futures fail as if a worker of a process pool had been killed.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        return future
+
 
 class TestBpmnJsonGenerator:
 
@@ -859,3 +878,166 @@ class TestBpmnJsonGenerator:
         ]
 
         assert result == expected
+
+    def test_create_bpmn_json_unsupported_element(self):
+        bpmn_xml = """
+        <definitions xmlns="http://www.omg.org/spec/BPMN/20100524/MODEL">
+          <process id="Process_1">
+            <startEvent id="start" />
+            <sequenceFlow id="flow1" sourceRef="start" targetRef="sub" />
+            <subProcess id="sub" />
+            <sequenceFlow id="flow2" sourceRef="sub" targetRef="end" />
+            <endEvent id="end" />
+          </process>
+        </definitions>
+        """
+        bpmn_json_generator = BpmnJsonGenerator()
+
+        with pytest.raises(ValueError, match=r"Unsupported element type: subProcess \(sub\)"):
+            bpmn_json_generator.create_bpmn_json(bpmn_xml.strip())
+
+
+class TestBpmnJsonGeneratorCollaboration:
+
+    def test_converts_every_pool(self, bpmn_xml_collaboration):
+        result = BpmnJsonGenerator().create_collaboration_json(bpmn_xml_collaboration)
+
+        participants = result["participants"]
+        assert list(participants) == [
+            "Participant_Customer",
+            "Participant_Supplier",
+            "Participant_Bank",
+        ]
+        assert participants["Participant_Customer"]["name"] == "Customer"
+        assert participants["Participant_Customer"]["process_id"] == "Process_Customer"
+        assert [element["id"] for element in participants["Participant_Customer"]["process"]] == [
+            "StartEvent_Customer",
+            "Task_PlaceOrder",
+            "Task_ReceiveGoods",
+            "EndEvent_Customer",
+        ]
+        # The lanes are ignored
+        assert [element["id"] for element in participants["Participant_Supplier"]["process"]] == [
+            "StartEvent_Supplier",
+            "Task_Deliver",
+            "EndEvent_Supplier",
+        ]
+        assert participants["Participant_Bank"] == {
+            "name": "Bank",
+            "process_id": None,
+            "process": None,
+        }
+
+    def test_message_flows(self, bpmn_xml_collaboration):
+        result = BpmnJsonGenerator().create_collaboration_json(bpmn_xml_collaboration)
+
+        assert result["message_flows"] == [
+            {
+                "id": "MessageFlow_Order",
+                "source": "Task_PlaceOrder",
+                "target": "StartEvent_Supplier",
+                "source_participant": "Participant_Customer",
+                "target_participant": "Participant_Supplier",
+                "label": "Order",
+            },
+            {
+                "id": "MessageFlow_Delivery",
+                "source": "Task_Deliver",
+                "target": "Task_ReceiveGoods",
+                "source_participant": "Participant_Supplier",
+                "target_participant": "Participant_Customer",
+            },
+            {
+                "id": "MessageFlow_Payment",
+                "source": "Task_ReceiveGoods",
+                "target": "Participant_Bank",
+                "source_participant": "Participant_Customer",
+                "target_participant": "Participant_Bank",
+                "label": "Payment",
+            },
+        ]
+
+    def test_same_result_in_process_pool(self, bpmn_xml_collaboration):
+        expected = BpmnJsonGenerator().create_collaboration_json(bpmn_xml_collaboration)
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = BpmnJsonGenerator().create_collaboration_json(
+                bpmn_xml_collaboration, executor=executor
+            )
+
+        assert result == expected
+
+    def test_broken_process_pool_is_raised(self, bpmn_xml_collaboration):
+        # A broken pool is a failure of the executor, not of the converted process
+        with pytest.raises(BrokenProcessPool):
+            BpmnJsonGenerator().create_collaboration_json(
+                bpmn_xml_collaboration, executor=BrokenExecutorStub()
+            )
+
+    def test_invalid_process_does_not_fail_the_others(self, bpmn_xml_collaboration):
+        bpmn_xml = bpmn_xml_collaboration.replace(
+            '<bpmn:endEvent id="EndEvent_Supplier" />',
+            '<bpmn:endEvent id="EndEvent_Supplier" /><bpmn:startEvent id="StartEvent_2" />',
+        )
+
+        result = BpmnJsonGenerator().create_collaboration_json(bpmn_xml)
+
+        supplier = result["participants"]["Participant_Supplier"]
+        assert supplier["process"] is None
+        assert supplier["error"] == "Process must contain exactly one start event"
+        assert result["participants"]["Participant_Customer"]["process"] is not None
+
+    def test_processes_without_collaboration(self, bpmn_xml_linear_process):
+        result = BpmnJsonGenerator().create_collaboration_json(bpmn_xml_linear_process)
+
+        assert list(result["participants"]) == ["Process_00a4hfq"]
+        assert len(result["participants"]["Process_00a4hfq"]["process"]) == 4
+        assert result["message_flows"] == []
+
+
+class TestBpmnJsonGeneratorFromFile:
+
+    @pytest.mark.parametrize(
+        "fixture", sorted(path.name for path in FIXTURES.glob("*.bpmn"))
+    )
+    def test_same_result_as_create_bpmn_json(self, fixture):
+        path = FIXTURES / fixture
+
+        try:
+            expected = BpmnJsonGenerator().create_bpmn_json(path.read_text())
+        except ValueError as e:
+            with pytest.raises(ValueError, match=re.escape(str(e))):
+                BpmnJsonGenerator().create_bpmn_json_from_file(path)
+            return
+
+        assert BpmnJsonGenerator().create_bpmn_json_from_file(path) == expected
+        assert BpmnJsonGenerator().create_bpmn_json_from_file(str(path)) == expected
+
+    def test_byte_stream(self, bpmn_xml_linear_process):
+        stream = io.BytesIO(bpmn_xml_linear_process.encode("utf-8"))
+
+        process = BpmnJsonGenerator().create_bpmn_json_from_file(stream)
+
+        assert [element["id"] for element in process] == [
+            "StartEvent_1",
+            "Activity_0o5d60h",
+            "Activity_01dwvnb",
+            "Event_0htbpx6",
+        ]
+
+    def test_stops_at_end_of_process(self, bpmn_xml_linear_process):
+        # The diagram section after the process is not parsed, so it may even be truncated
+        truncated = bpmn_xml_linear_process[: bpmn_xml_linear_process.index("<bpmndi:BPMNShape")]
+
+        process = BpmnJsonGenerator().create_bpmn_json_from_file(
+            io.BytesIO(truncated.encode("utf-8"))
+        )
+
+        assert len(process) == 4
+
+    def test_no_process(self):
+        stream = io.BytesIO(b'<definitions xmlns="http://www.omg.org/spec/BPMN/20100524/MODEL" />')
+
+        with pytest.raises(ValueError, match="No process element found"):
+            BpmnJsonGenerator().create_bpmn_json_from_file(stream)
+
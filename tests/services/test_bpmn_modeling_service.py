@@ -3,6 +3,7 @@ from unittest.mock import Mock
 import pytest
 
 from bpmn_assistant.core import LLMFacade
+from bpmn_assistant.core.metrics import metrics
 from bpmn_assistant.services import BpmnModelingService
 
 
@@ -31,3 +32,88 @@ class TestCreateBpmn:
 
         assert "Max number of retries reached" in str(e.value)
         assert mock_llm_facade.call.call_count == 3
+        # The failure path registers the metric with its description as well
+        assert metrics.histogram("bpmn_create_attempts").description
+
+    def test_create_bpmn_reports_all_errors_in_one_retry(self, linear_process):
+        bpmn_service = BpmnModelingService()
+        mock_llm_facade = Mock(LLMFacade)
+
+        invalid_process = {
+            "process": [
+                {"type": "startEvent", "id": "start"},
+                {"type": "task", "label": "Task without an ID"},
+                {"type": "subProcess", "id": "sub1"},
+                {"type": "endEvent", "id": "end", "eventDefinition": "errorEventDefinition"},
+            ]
+        }
+        mock_llm_facade.call.side_effect = [invalid_process, {"process": linear_process}]
+
+        process = bpmn_service.create_bpmn(mock_llm_facade, [])
+
+        assert process == linear_process
+        assert mock_llm_facade.call.call_count == 2
+        correction_prompt = mock_llm_facade.call.call_args_list[1].args[0]
+        assert "process[1]: Element is missing an ID" in correction_prompt
+        assert "process[2].type: Unsupported element type: subProcess" in correction_prompt
+        assert "process[3].eventDefinition: Unsupported event definition" in correction_prompt
+
+    def test_create_bpmn_repairs_process_without_retry(self):
+        bpmn_service = BpmnModelingService()
+        mock_llm_facade = Mock(LLMFacade)
+
+        mock_llm_facade.call.return_value = {
+            "process": [
+                {"type": "startEvent", "id": "start"},
+                {"type": "task", "id": "reviewOrder"},
+                {
+                    "type": "exclusiveGateway",
+                    "id": "exclusive1",
+                    "label": "Approved?",
+                    "has_join": "false",
+                    "branches": [
+                        {
+                            "condition": "Yes",
+                            "path": [{"type": "task", "id": "reviewOrder", "label": "Ship"}],
+                        },
+                        {"condition": "No"},
+                    ],
+                },
+                {"type": "endEvent", "id": "end"},
+            ]
+        }
+
+        process = bpmn_service.create_bpmn(mock_llm_facade, [])
+
+        assert mock_llm_facade.call.call_count == 1
+        assert process[1]["label"] == "Review order"
+        assert process[2]["has_join"] is False
+        assert process[2]["branches"][0]["path"][0]["id"] == "reviewOrder_2"
+        assert process[2]["branches"][1]["path"] == []
+
+    def test_create_bpmn_streaming_aborts_at_invalid_element(self, linear_process):
+        bpmn_service = BpmnModelingService(stream_json=True)
+        mock_llm_facade = Mock(LLMFacade)
+        generated_items = []
+
+        def stream_json(prompt, array_key, on_item, **kwargs):
+            process = (
+                [{"type": "startEvent", "id": "start"}, {"type": "task"}, *linear_process]
+                if mock_llm_facade.stream_json.call_count == 1
+                else linear_process
+            )
+            for item in process:
+                generated_items.append(item)
+                on_item(item)
+            return {"process": process}
+
+        mock_llm_facade.stream_json.side_effect = stream_json
+
+        process = bpmn_service.create_bpmn(mock_llm_facade, [])
+
+        assert process == linear_process
+        assert mock_llm_facade.stream_json.call_count == 2
+        # The first generation is aborted at its second element
+        assert len(generated_items) == 2 + len(linear_process)
+        correction_prompt = mock_llm_facade.stream_json.call_args_list[1].args[0]
+        assert "process[1]: Element is missing an ID" in correction_prompt
@@ -1,6 +1,14 @@
 from xml.etree import ElementTree as ET
 
-from bpmn_assistant.services import BpmnXmlGenerator
+import pytest
+
+from bpmn_assistant.services import BpmnXmlGenerator, ConversionCache
+from bpmn_assistant.services import bpmn_xml_generator as xml_generator_module
+from bpmn_assistant.services.process_editing import (
+    add_element,
+    delete_element,
+    update_element,
+)
 
 
 def elements_equal(e1: ET.Element, e2: ET.Element) -> bool:
@@ -87,3 +95,73 @@ class TestBpmnXmlGenerator:
         result_tree = ET.ElementTree(ET.fromstring(result))
         expected_tree = ET.ElementTree(ET.fromstring(expected_xml))
         assert elements_equal(result_tree.getroot(), expected_tree.getroot())
+
+
+class TestBpmnXmlGeneratorUpdate:
+
+    @pytest.fixture
+    def generator(self):
+        return BpmnXmlGenerator(cache=ConversionCache("test_xml"))
+
+    def test_same_xml_as_full_generation(self, generator, pg_inside_eg_process):
+        edited = add_element(
+            pg_inside_eg_process,
+            {"type": "task", "id": "new_task", "label": "New task"},
+            after_id=pg_inside_eg_process[0]["id"],
+        )["process"]
+
+        xml, _ = generator.update_bpmn_xml(edited, pg_inside_eg_process)
+
+        assert xml == BpmnXmlGenerator().create_bpmn_xml(edited)
+
+    def test_patch_of_a_deleted_element(self, generator, linear_process):
+        edited = delete_element(linear_process, "task3")["process"]
+
+        _, patch = generator.update_bpmn_xml(edited, linear_process)
+
+        assert patch["elements"]["added"] == []
+        assert patch["elements"]["removed"] == ["task3"]
+        assert sorted(element["id"] for element in patch["elements"]["changed"]) == [
+            "task2",
+            "task4",
+        ]
+        assert [flow["id"] for flow in patch["flows"]["added"]] == ["task2-task4"]
+        assert sorted(patch["flows"]["removed"]) == ["task2-task3", "task3-task4"]
+        assert patch["flows"]["changed"] == []
+
+    def test_only_changed_elements_are_serialized(
+        self, generator, linear_process, monkeypatch
+    ):
+        generator.create_bpmn_xml(linear_process)
+        serialized = []
+        element_xml = xml_generator_module._element_xml
+        monkeypatch.setattr(
+            xml_generator_module,
+            "_element_xml",
+            lambda element: serialized.append(element["id"]) or element_xml(element),
+        )
+        edited = update_element(
+            linear_process, {"type": "task", "id": "task3", "label": "Prepare the quote"}
+        )["process"]
+
+        xml, patch = generator.update_bpmn_xml(edited, linear_process)
+
+        assert serialized == ["task3"]
+        assert [element["label"] for element in patch["elements"]["changed"]] == [
+            "Prepare the quote"
+        ]
+        assert 'name="Prepare the quote"' in xml
+
+    def test_without_cache(self, linear_process):
+        edited = delete_element(linear_process, "task5")["process"]
+
+        xml, patch = BpmnXmlGenerator().update_bpmn_xml(edited, linear_process)
+
+        assert xml == BpmnXmlGenerator().create_bpmn_xml(edited)
+        assert patch["elements"]["removed"] == ["task5"]
+
+    def test_invalid_previous_process(self, generator, linear_process):
+        xml, patch = generator.update_bpmn_xml(linear_process, [{"id": "invalid"}])
+
+        assert xml == BpmnXmlGenerator().create_bpmn_xml(linear_process)
+        assert patch is None
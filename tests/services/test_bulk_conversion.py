@@ -0,0 +1,121 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from bpmn_assistant import cli
+from bpmn_assistant.services.bulk_conversion import (
+    BulkConversionStats,
+    convert_file,
+    convert_files,
+    iter_bpmn_files,
+)
+
+FIXTURES = Path(__file__).parent.parent / "fixtures"
+
+
+@pytest.fixture
+def bpmn_directory(tmp_path):
+    shutil.copy(FIXTURES / "linear_process.bpmn", tmp_path / "linear_process.bpmn")
+    (tmp_path / "nested").mkdir()
+    shutil.copy(FIXTURES / "parallel_gateway.bpmn", tmp_path / "nested" / "parallel.bpmn")
+    shutil.copy(FIXTURES / "two_start_events.bpmn", tmp_path / "nested" / "two_starts.bpmn")
+    (tmp_path / "nested" / "broken.bpmn").write_text("<definitions>")
+    (tmp_path / "notes.txt").write_text("not a process")
+    (tmp_path / "pom.xml").write_text("<project/>")
+    return tmp_path
+
+
+class TestBulkConversion:
+
+    def test_iter_bpmn_files(self, bpmn_directory):
+        paths = [
+            Path(path).relative_to(bpmn_directory)
+            for path in iter_bpmn_files(str(bpmn_directory))
+        ]
+
+        assert paths == [
+            Path("linear_process.bpmn"),
+            Path("nested/broken.bpmn"),
+            Path("nested/parallel.bpmn"),
+            Path("nested/two_starts.bpmn"),
+        ]
+
+    def test_convert_file(self, bpmn_directory):
+        result = convert_file(str(bpmn_directory / "linear_process.bpmn"))
+
+        assert result["status"] == "succeeded"
+        assert [element["type"] for element in result["process"]] == [
+            "startEvent",
+            "task",
+            "task",
+            "endEvent",
+        ]
+        assert result["bytes"] > 0
+
+    def test_convert_file_reports_errors(self, bpmn_directory):
+        result = convert_file(str(bpmn_directory / "nested" / "two_starts.bpmn"))
+
+        assert result["status"] == "failed"
+        assert result["error_type"] == "ValueError"
+        assert result["error"] == "Process must contain exactly one start event"
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_convert_files(self, bpmn_directory, workers):
+        results = list(
+            convert_files(iter_bpmn_files(str(bpmn_directory)), workers=workers, chunk_size=1)
+        )
+
+        statuses = {Path(result["path"]).name: result["status"] for result in results}
+        assert statuses == {
+            "linear_process.bpmn": "succeeded",
+            "broken.bpmn": "failed",
+            "parallel.bpmn": "succeeded",
+            "two_starts.bpmn": "failed",
+        }
+
+    def test_stats(self):
+        stats = BulkConversionStats()
+        stats.add({"status": "succeeded", "bytes": 100})
+        stats.add({"status": "failed", "bytes": 50, "error": "No process element found"})
+        stats.add({"status": "failed", "bytes": 50, "error": "No process element found"})
+
+        summary = stats.to_dict()
+
+        assert summary["files"] == 3
+        assert summary["succeeded"] == 1
+        assert summary["top_errors"] == [{"error": "No process element found", "files": 2}]
+
+    def test_cli(self, bpmn_directory, tmp_path):
+        output_path = tmp_path / "results.jsonl"
+
+        exit_code = cli.main(
+            ["convert", str(bpmn_directory), "-o", str(output_path), "--workers", "1"]
+        )
+
+        results = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert exit_code == 1
+        assert len(results) == 4
+        assert sum(result["status"] == "succeeded" for result in results) == 2
+
+    def test_cli_extra_extensions(self, bpmn_directory, tmp_path):
+        shutil.copy(FIXTURES / "linear_process.bpmn", bpmn_directory / "nested" / "export.xml")
+        output_path = tmp_path / "results.jsonl"
+
+        cli.main(
+            [
+                "convert",
+                str(bpmn_directory / "nested"),
+                "-o",
+                str(output_path),
+                "--workers",
+                "1",
+                "--extension",
+                "XML",
+            ]
+        )
+
+        results = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert len(results) == 4
+        assert any(result["path"].endswith("export.xml") for result in results)
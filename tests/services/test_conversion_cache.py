@@ -0,0 +1,85 @@
+import pytest
+
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.services import BpmnJsonGenerator, BpmnXmlGenerator, ConversionCache
+
+
+@pytest.fixture
+def cache():
+    return ConversionCache("test", max_entries=2, max_bytes=100)
+
+
+class TestConversionCache:
+
+    def test_get_and_put(self, cache):
+        hits = metrics.counter("conversion_cache_hits_total").value(cache="test")
+        misses = metrics.counter("conversion_cache_misses_total").value(cache="test")
+
+        assert cache.get("a") is None
+        cache.put("a", "value", 10)
+
+        assert cache.get("a") == "value"
+        assert metrics.counter("conversion_cache_hits_total").value(cache="test") == hits + 1
+        assert metrics.counter("conversion_cache_misses_total").value(cache="test") == misses + 1
+
+    def test_evicts_least_recently_used_entries(self, cache):
+        cache.put("a", 1, 10)
+        cache.put("b", 2, 10)
+        cache.get("a")
+        cache.put("c", 3, 10)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_size_bound(self, cache):
+        cache.put("a", 1, 60)
+        cache.put("b", 2, 60)
+        cache.put("huge", 3, 101)
+
+        assert cache.to_dict()["bytes"] == 60
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("huge") is None
+
+    def test_replace_entry(self, cache):
+        cache.put("a", 1, 60)
+        cache.put("a", 2, 30)
+
+        assert len(cache) == 1
+        assert cache.to_dict()["bytes"] == 30
+        assert cache.get("a") == 2
+
+
+class TestCachedConversions:
+
+    def test_create_bpmn_xml(self, pg_inside_eg_process):
+        cache = ConversionCache("xml")
+        generator = BpmnXmlGenerator(cache=cache)
+
+        first = generator.create_bpmn_xml(pg_inside_eg_process)
+        reordered = [dict(reversed(element.items())) for element in pg_inside_eg_process]
+        second = generator.create_bpmn_xml(reordered)
+
+        assert first == second == BpmnXmlGenerator().create_bpmn_xml(pg_inside_eg_process)
+        assert len(cache) == 1
+
+    def test_create_bpmn_json(self, bpmn_xml_pg_inside_eg):
+        cache = ConversionCache("json")
+        expected = BpmnJsonGenerator().create_bpmn_json(bpmn_xml_pg_inside_eg)
+
+        first = BpmnJsonGenerator(cache=cache).create_bpmn_json(bpmn_xml_pg_inside_eg)
+        first[0]["label"] = "Modified by the caller"
+        second = BpmnJsonGenerator(cache=cache).create_bpmn_json(
+            bpmn_xml_pg_inside_eg.replace("\n", "\n  ")
+        )
+
+        assert second == expected
+        assert len(cache) == 1
+
+    def test_failed_conversions_are_not_cached(self):
+        cache = ConversionCache("json")
+
+        with pytest.raises(ValueError):
+            BpmnJsonGenerator(cache=cache).create_bpmn_json("<definitions />")
+        assert len(cache) == 0
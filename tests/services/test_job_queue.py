@@ -0,0 +1,132 @@
+import time
+
+import pytest
+
+from bpmn_assistant.core.enums import JobStatus
+from bpmn_assistant.services.job_queue import JobQueue, JobStore
+
+
+def wait_until_finished(store: JobStore, job_id: str, timeout: float = 5):
+    for _ in range(int(timeout / 0.01)):
+        job = store.get(job_id)
+        if job.is_finished:
+            return job
+        time.sleep(0.01)
+    raise TimeoutError(f"Job {job_id} did not finish")
+
+
+class TestJobStore:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.sqlite3"))
+        yield store
+        store.close()
+
+    def test_create_and_get(self, store):
+        job = store.create("modify", {"model": "gpt-4.1"})
+
+        stored = store.get(job.id)
+        assert stored.status == JobStatus.QUEUED
+        assert stored.request == {"model": "gpt-4.1"}
+        assert store.get("unknown") is None
+
+    def test_update(self, store):
+        job = store.create("modify", {})
+
+        store.update(job.id, JobStatus.SUCCEEDED, result={"bpmn_xml": "<xml/>"})
+
+        stored = store.get(job.id)
+        assert stored.is_finished
+        assert stored.result == {"bpmn_xml": "<xml/>"}
+
+    def test_events(self, store):
+        job = store.create("modify", {})
+
+        assert store.add_event(job.id, {"stage": "creating"}) == 1
+        assert store.add_event(job.id, {"stage": "generating_xml"}) == 2
+
+        assert store.get_events(job.id) == [
+            (1, {"stage": "creating"}),
+            (2, {"stage": "generating_xml"}),
+        ]
+        assert store.get_events(job.id, after=1) == [(2, {"stage": "generating_xml"})]
+
+    def test_jobs_survive_reopening(self, tmp_path):
+        path = str(tmp_path / "jobs.sqlite3")
+        store = JobStore(path)
+        job = store.create("modify", {"model": "gpt-4.1"})
+        store.close()
+
+        reopened = JobStore(path)
+        assert [unfinished.id for unfinished in reopened.get_unfinished()] == [job.id]
+        reopened.close()
+
+
+class TestJobQueue:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = JobStore(str(tmp_path / "jobs.sqlite3"))
+        yield store
+        store.close()
+
+    def test_job_succeeds(self, store):
+        def handler(request, secrets, report):
+            report("creating")
+            return {"model": request["model"], "key": secrets["api_key"]}
+
+        queue = JobQueue(store, {"modify": handler})
+        job = queue.submit("modify", {"model": "gpt-4.1"}, secrets={"api_key": "secret"})
+        finished = wait_until_finished(store, job.id)
+        queue.shutdown()
+
+        assert finished.status == JobStatus.SUCCEEDED
+        assert finished.result == {"model": "gpt-4.1", "key": "secret"}
+        assert [event for _, event in store.get_events(job.id)] == [
+            {"type": "status", "status": "queued"},
+            {"type": "status", "status": "running"},
+            {"type": "progress", "stage": "creating"},
+            {"type": "status", "status": "succeeded"},
+        ]
+
+    def test_secrets_are_not_stored(self, store, tmp_path):
+        queue = JobQueue(store, {"modify": lambda request, secrets, report: {}})
+        job = queue.submit("modify", {"model": "gpt-4.1"}, secrets={"api_key": "sk-user-key"})
+        wait_until_finished(store, job.id)
+        queue.shutdown()
+
+        # Including the write-ahead log
+        for database_file in tmp_path.iterdir():
+            assert b"sk-user-key" not in database_file.read_bytes()
+
+    def test_job_fails(self, store):
+        def handler(request, secrets, report):
+            raise ValueError("Invalid model")
+
+        queue = JobQueue(store, {"modify": handler})
+        job = queue.submit("modify", {})
+        finished = wait_until_finished(store, job.id)
+        queue.shutdown()
+
+        assert finished.status == JobStatus.FAILED
+        assert finished.error == "Invalid model"
+
+    def test_unsupported_kind(self, store):
+        queue = JobQueue(store, {})
+
+        with pytest.raises(ValueError):
+            queue.submit("modify", {})
+
+    def test_recover(self, store):
+        without_secrets = store.create("modify", {"model": "gpt-4.1"})
+        with_secrets = store.create("modify", {"model": "gpt-4.1"}, has_secrets=True)
+        store.update(with_secrets.id, JobStatus.RUNNING)
+
+        queue = JobQueue(store, {"modify": lambda request, secrets, report: {"done": True}})
+        queue.recover()
+        resumed = wait_until_finished(store, without_secrets.id)
+        queue.shutdown()
+
+        assert resumed.status == JobStatus.SUCCEEDED
+        assert store.get(with_secrets.id).status == JobStatus.FAILED
@@ -0,0 +1,47 @@
+from bpmn_assistant.services import bpmn_xml_hash, canonical_process_json, process_hash
+from bpmn_assistant.services.process_hash import normalize_bpmn_xml
+
+
+class TestProcessHash:
+
+    def test_key_order_does_not_matter(self):
+        first = [{"type": "task", "id": "task1", "label": "Café"}]
+        second = [{"label": "Café", "id": "task1", "type": "task"}]
+
+        assert canonical_process_json(first) == canonical_process_json(second)
+        assert process_hash(first) == process_hash(second)
+        assert len(process_hash(first)) == 64
+
+    def test_content_matters(self, pg_inside_eg_process):
+        renamed = [{**pg_inside_eg_process[0], "label": "Renamed"}, *pg_inside_eg_process[1:]]
+
+        assert process_hash(renamed) != process_hash(pg_inside_eg_process)
+        assert process_hash(list(reversed(pg_inside_eg_process))) != process_hash(
+            pg_inside_eg_process
+        )
+
+
+class TestBpmnXmlHash:
+
+    def test_ignores_the_diagram_and_whitespace(self, bpmn_xml_pg_inside_eg):
+        diagram_start = bpmn_xml_pg_inside_eg.index("<bpmndi:BPMNDiagram")
+        moved = (
+            bpmn_xml_pg_inside_eg[:diagram_start]
+            + bpmn_xml_pg_inside_eg[diagram_start:].replace('x="', 'x="1')
+        )
+
+        assert bpmn_xml_hash(moved) == bpmn_xml_hash(bpmn_xml_pg_inside_eg)
+        assert bpmn_xml_hash(bpmn_xml_pg_inside_eg.replace("\n", "\n    ")) == bpmn_xml_hash(
+            bpmn_xml_pg_inside_eg
+        )
+
+    def test_process_changes(self, bpmn_xml_pg_inside_eg):
+        assert bpmn_xml_hash(bpmn_xml_pg_inside_eg.replace('name="', 'name="New ', 1)) != (
+            bpmn_xml_hash(bpmn_xml_pg_inside_eg)
+        )
+
+    def test_normalize(self):
+        xml = b'<a:definitions><a:process id="p">\n  <a:task id="t" />\n</a:process></a:definitions>'
+
+        assert normalize_bpmn_xml(xml) == b'<a:process id="p"><a:task id="t" />'
+        assert normalize_bpmn_xml(xml.decode()) == normalize_bpmn_xml(xml)
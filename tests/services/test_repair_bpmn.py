@@ -0,0 +1,73 @@
+from copy import deepcopy
+
+from bpmn_assistant.core.metrics import metrics
+from bpmn_assistant.services.repair_bpmn import repair_bpmn
+from bpmn_assistant.services.validate_bpmn import get_validation_errors
+
+
+class TestRepairBpmn:
+
+    def test_valid_process_is_unchanged(self, order_process):
+        original = deepcopy(order_process)
+
+        process, repairs = repair_bpmn(order_process)
+
+        assert repairs == []
+        assert process == original
+
+    def test_does_not_modify_input(self, duplicate_id_process):
+        original = deepcopy(duplicate_id_process)
+
+        process, repairs = repair_bpmn(duplicate_id_process)
+
+        assert duplicate_id_process == original
+        assert process[2]["id"] == "task1_2"
+        assert [repair.kind for repair in repairs] == ["duplicate_id"]
+        assert get_validation_errors(process) == []
+
+    def test_duplicate_id_does_not_collide_with_existing_ids(self):
+        process = [
+            {"type": "startEvent", "id": "start"},
+            {"type": "task", "id": "task1", "label": "A"},
+            {"type": "task", "id": "task1_2", "label": "B"},
+            {"type": "task", "id": "task1", "label": "C"},
+        ]
+
+        repaired, _ = repair_bpmn(process)
+
+        assert [element["id"] for element in repaired] == ["start", "task1", "task1_2", "task1_3"]
+
+    def test_start_events(self, linear_process):
+        without_start = linear_process[1:]
+        repaired, repairs = repair_bpmn(without_start)
+        assert repaired[0]["type"] == "startEvent"
+        assert [repair.kind for repair in repairs] == ["missing_start_event"]
+
+        with_two_starts = linear_process + [{"type": "startEvent", "id": "start2"}]
+        repaired, repairs = repair_bpmn(with_two_starts)
+        assert repaired == linear_process
+        assert [repair.kind for repair in repairs] == ["extra_start_event"]
+
+    def test_empty_parallel_branch(self, procurement_process):
+        procurement_process[1]["branches"].append([])
+
+        repaired, repairs = repair_bpmn(procurement_process)
+
+        assert [] not in repaired[1]["branches"]
+        assert [repair.path for repair in repairs] == ["process[1].branches"]
+
+    def test_missing_id_is_not_repaired(self):
+        process = [{"type": "startEvent"}, {"type": "task", "label": "Task"}]
+
+        repaired, repairs = repair_bpmn(process)
+
+        assert repairs == []
+        assert repaired == process
+
+    def test_repairs_are_counted(self, duplicate_id_process):
+        counter = metrics.counter("bpmn_repairs_total")
+        before = counter.value(kind="duplicate_id")
+
+        repair_bpmn(duplicate_id_process)
+
+        assert counter.value(kind="duplicate_id") == before + 1
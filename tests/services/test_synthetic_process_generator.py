@@ -0,0 +1,97 @@
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from bpmn_assistant.services import BpmnJsonGenerator, SyntheticProcessGenerator
+from bpmn_assistant.services.validate_bpmn import validate_bpmn
+
+
+def count_elements(process: list[dict]) -> int:
+    count = 0
+    for element in process:
+        count += 1
+        if element["type"] in ["exclusiveGateway", "inclusiveGateway"]:
+            for branch in element["branches"]:
+                count += count_elements(branch["path"])
+        elif element["type"] == "parallelGateway":
+            for branch in element["branches"]:
+                count += count_elements(branch)
+    return count
+
+
+def max_depth(process: list[dict]) -> int:
+    depth = 0
+    for element in process:
+        if element["type"] in ["exclusiveGateway", "inclusiveGateway"]:
+            paths = [branch["path"] for branch in element["branches"]]
+        elif element["type"] == "parallelGateway":
+            paths = element["branches"]
+        else:
+            continue
+        depth = max(depth, 1 + max(max_depth(path) for path in paths))
+    return depth
+
+
+class TestSyntheticProcessGenerator:
+
+    @pytest.mark.parametrize("size", [2, 10, 100, 1000])
+    def test_generate_has_requested_size(self, size):
+        generator = SyntheticProcessGenerator(size=size, gateway_ratio=0.3, seed=1)
+        process = generator.generate()
+        assert count_elements(process) == size
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_generate_produces_valid_process(self, seed):
+        generator = SyntheticProcessGenerator(
+            size=200, gateway_ratio=0.3, loop_ratio=0.3, seed=seed
+        )
+        process = generator.generate()
+        validate_bpmn(process)
+
+    def test_generate_is_reproducible(self):
+        first = SyntheticProcessGenerator(size=300, seed=42).generate()
+        second = SyntheticProcessGenerator(size=300, seed=42).generate()
+        third = SyntheticProcessGenerator(size=300, seed=43).generate()
+        assert first == second
+        assert first != third
+
+    def test_generate_respects_max_depth(self):
+        generator = SyntheticProcessGenerator(
+            size=500, max_depth=2, gateway_ratio=0.5, seed=7
+        )
+        process = generator.generate()
+        assert max_depth(process) <= 2
+
+    def test_generate_respects_gateway_mix(self):
+        generator = SyntheticProcessGenerator(
+            size=300,
+            gateway_ratio=0.5,
+            gateway_mix={"parallelGateway": 1.0},
+            seed=3,
+        )
+        process = generator.generate()
+        gateway_types = {
+            element["type"] for element in process if "branches" in element
+        }
+        assert gateway_types == {"parallelGateway"}
+
+    def test_generate_xml(self):
+        generator = SyntheticProcessGenerator(size=100, gateway_ratio=0.3, seed=5)
+        process = generator.generate()
+        root = ET.fromstring(generator.generate_xml(process))
+        process_element = next(
+            elem for elem in root.iter() if elem.tag.endswith("process")
+        )
+        element_ids = {child.get("id") for child in process_element}
+        assert {element["id"] for element in process} <= element_ids
+
+    @pytest.mark.parametrize("seed", range(50))
+    def test_generate_xml_can_be_imported(self, seed):
+        generator = SyntheticProcessGenerator(
+            size=40, gateway_ratio=0.3, loop_ratio=0.3, end_event_ratio=0.3, seed=seed
+        )
+        process = generator.generate()
+
+        result = BpmnJsonGenerator().create_bpmn_json(generator.generate_xml(process))
+
+        assert count_elements(result) == count_elements(process)
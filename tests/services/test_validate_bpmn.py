@@ -1,6 +1,12 @@
 import pytest
 
-from bpmn_assistant.services.validate_bpmn import validate_bpmn
+from bpmn_assistant.services.validate_bpmn import (
+    BpmnValidationError,
+    get_validation_errors,
+    get_validation_report,
+    validate_bpmn,
+    validate_element,
+)
 
 
 class TestValidateBpmn:
@@ -10,3 +16,122 @@ class TestValidateBpmn:
             validate_bpmn(duplicate_id_process)
 
         assert str(exc_info.value) == "Duplicate element ID found: task1"
+
+    @pytest.mark.parametrize(
+        "fixture",
+        [
+            "order_process",
+            "procurement_process",
+            "linear_process",
+            "pg_inside_eg_process",
+            "empty_gateway_path_process",
+            "eg_end_event_in_path_process",
+            "labeled_events_process",
+        ],
+    )
+    def test_validate_bpmn_valid_processes(self, fixture, request):
+        process = request.getfixturevalue(fixture)
+
+        validate_bpmn(process)
+
+        assert get_validation_errors(process) == []
+
+    def test_duplicate_id_in_nested_branch(self, order_process):
+        order_process[2]["branches"][0]["path"].append(
+            {"type": "task", "id": "task1", "label": "Duplicate of a top-level task"}
+        )
+
+        with pytest.raises(ValueError) as exc_info:
+            validate_bpmn(order_process)
+
+        assert str(exc_info.value) == "Duplicate element ID found: task1"
+
+    def test_non_existent_next_reference(self, order_process):
+        order_process[2]["branches"][0]["next"] = "unknown"
+
+        errors = get_validation_errors(order_process)
+
+        assert len(errors) == 1
+        assert "non-existent next element: unknown" in errors[0]
+
+    def test_collects_all_errors(self):
+        process = [
+            {"type": "startEvent", "id": "start"},
+            {"type": "task", "id": "task1"},
+            {
+                "type": "exclusiveGateway",
+                "id": "exclusive1",
+                "label": "Decision",
+                "has_join": "false",
+                "branches": [
+                    {"condition": "A", "path": [{"type": "unknownTask", "id": "task2"}]},
+                    {"condition": "B", "path": [{"type": "task", "id": "task1", "label": "B"}]},
+                ],
+            },
+            {"type": "parallelGateway", "id": "parallel1", "branches": [[]]},
+        ]
+
+        errors = get_validation_errors(process)
+
+        assert len(errors) == 5
+        assert errors[0].startswith("Task element is missing a label")
+        assert "'has_join'" in errors[1]
+        assert errors[2].startswith("Unsupported element type: unknownTask")
+        assert errors[3] == "Duplicate element ID found: task1"
+        assert errors[4] == "Parallel gateway 'parallel1' has an empty branch"
+
+    def test_validate_element_checks_nested_elements(self):
+        gateway = {
+            "type": "parallelGateway",
+            "id": "parallel1",
+            "branches": [
+                [{"type": "task", "id": "task1", "label": "A"}],
+                [{"type": "task", "id": "task1", "label": "B"}],
+            ],
+        }
+
+        with pytest.raises(ValueError) as exc_info:
+            validate_element(gateway)
+
+        assert str(exc_info.value) == "Duplicate element ID found: task1"
+
+    def test_non_string_type_and_event_definition(self):
+        # Unhashable values used to crash the lookups with a TypeError
+        process = [
+            {"type": "startEvent", "id": "start", "eventDefinition": {"type": "timer"}},
+            {"type": ["task"], "id": "task1", "label": "A"},
+            {"type": "endEvent", "id": "end", "eventDefinition": ["message"]},
+        ]
+
+        report = get_validation_report(process)
+
+        assert [issue.path for issue in report.issues] == [
+            "process[0].eventDefinition",
+            "process[1].type",
+            "process[2].eventDefinition",
+        ]
+        with pytest.raises(BpmnValidationError):
+            validate_bpmn(process)
+
+    def test_validation_report_paths(self, order_process):
+        order_process[2]["branches"][1]["path"][0]["has_join"] = "false"
+        order_process[2]["branches"][1]["path"][0]["branches"][0]["next"] = "unknown"
+
+        report = get_validation_report(order_process)
+
+        assert [issue.path for issue in report.issues] == [
+            "process[2].branches[1].path[0].has_join",
+            "process[2].branches[1].path[0].branches[0].next",
+        ]
+
+    def test_validation_error_contains_report(self, duplicate_id_process):
+        duplicate_id_process.append({"type": "startEvent", "id": "start2"})
+
+        with pytest.raises(BpmnValidationError) as exc_info:
+            validate_bpmn(duplicate_id_process)
+
+        assert str(exc_info.value) == "Duplicate element ID found: task1"
+        assert exc_info.value.report.messages == [
+            "Duplicate element ID found: task1",
+            "Process must contain exactly one start event, found 2",
+        ]